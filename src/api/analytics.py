@@ -0,0 +1,328 @@
+# src/api/analytics.py
+"""
+Season analytics for the commentary screen: a finisher's percentile within
+distance + gender, median time per grupa class and gender, and field-size
+trends across posmi.
+
+Each (posms, distance) stage is held as column arrays (race seconds, gender
+code, grupa code) that live ticks update in place; aggregates are recomputed
+in one vectorized pass only for stages whose columns changed. NumPy is used
+when installed, otherwise the same columns are aggregated with sorting and
+bisection in pure Python.
+"""
+
+import json
+import math
+import os
+import statistics
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Dict, Any, List, Optional, Tuple
+
+from .teams import parse_race_time, format_race_time
+
+try:
+    import numpy as np
+except ImportError:  # optional fast path
+    np = None
+
+GENDER_CODES = ('S', 'V')
+GENDERS = {'S': 'Sievietes', 'V': 'Vīrieši'}
+NO_GENDER = len(GENDER_CODES)
+NOT_FINISHED = float('nan')
+
+
+class _StageColumns:
+    """One stage of one distance as columns; a slot per dal_id, kept for the whole stage"""
+
+    def __init__(self):
+        self.slots: Dict[str, int] = {}
+        self.names: List[str] = []
+        self.raw: List[Tuple[Any, Any, Any]] = []  # (RaceTime, dzimums, grupa) as last received
+        self.seconds = array('d')
+        self.genders = array('b')
+        self.groups = array('H')
+        self.version = 0
+
+    def update(self, rows: List[Dict[str, Any]], group_code, drop_missing: bool = True) -> bool:
+        """Apply a result list; returns True if any column value changed.
+
+        With drop_missing the list is taken as complete and absent athletes stop counting as finishers;
+        without it, absent athletes keep their last values (partial lists such as top-100 summaries)."""
+        changed = False
+        seen = set()
+        for row in rows:
+            if not isinstance(row, dict) or row.get('dal_id') in (None, ''):
+                continue
+            dal_id = str(row['dal_id'])
+            seen.add(dal_id)
+            raw = (row.get('RaceTime'), row.get('dzimums', ''), row.get('grupa', ''))
+            slot = self.slots.get(dal_id)
+            if slot is not None and self.raw[slot] == raw and not math.isnan(self.seconds[slot]):
+                continue  # unchanged since the last tick: skip parsing
+
+            seconds = parse_race_time(raw[0])
+            seconds = NOT_FINISHED if seconds is None else seconds
+            gender = GENDER_CODES.index(raw[1]) if raw[1] in GENDER_CODES else NO_GENDER
+            group = group_code(str(raw[2] or ''))
+            if slot is None:
+                self.slots[dal_id] = len(self.names)
+                self.names.append(row.get('Name') or row.get('full_name') or '')
+                self.raw.append(raw)
+                self.seconds.append(seconds)
+                self.genders.append(gender)
+                self.groups.append(group)
+                changed = True
+            elif (not _same_time(self.seconds[slot], seconds) or self.genders[slot] != gender
+                    or self.groups[slot] != group):
+                self.raw[slot] = raw
+                self.seconds[slot] = seconds
+                self.genders[slot] = gender
+                self.groups[slot] = group
+                changed = True
+
+        # Athletes missing from a complete list no longer count as finishers
+        for dal_id, slot in (self.slots.items() if drop_missing else ()):
+            if dal_id not in seen and not math.isnan(self.seconds[slot]):
+                self.seconds[slot] = NOT_FINISHED
+                changed = True
+        if changed:
+            self.version += 1
+        return changed
+
+
+def _same_time(a: float, b: float) -> bool:
+    return a == b or (math.isnan(a) and math.isnan(b))
+
+
+class _StageStats:
+    """Aggregates of one stage; percentiles are per slot, NaN for non-finishers"""
+
+    def __init__(self, version: int, finishers: Dict[int, int], medians: Dict[Tuple[int, int], Tuple[int, float]],
+                 percentiles: List[float]):
+        self.version = version
+        self.finishers = finishers   # gender code -> finishers
+        self.medians = medians       # (group code, gender code) -> (finishers, median seconds)
+        self.percentiles = percentiles
+
+
+def _aggregate_numpy(stage: _StageColumns) -> _StageStats:
+    seconds = np.frombuffer(stage.seconds, dtype=np.float64)
+    genders = np.frombuffer(stage.genders, dtype=np.int8).astype(np.int64)
+    groups = np.frombuffer(stage.groups, dtype=np.uint16).astype(np.int64)
+    finished = ~np.isnan(seconds)
+
+    # Percentile = share of the gender's finishers at or behind this athlete (winner 100)
+    percentiles = np.full(len(seconds), np.nan)
+    finishers = {}
+    for code in range(NO_GENDER):
+        mask = finished & (genders == code)
+        count = int(mask.sum())
+        if not count:
+            continue
+        finishers[code] = count
+        ordered = np.sort(seconds[mask])
+        faster = np.searchsorted(ordered, seconds[mask], side='left')
+        percentiles[mask] = 100.0 * (count - faster) / count
+
+    # Medians for every (group, gender) at once: sort by key then time, split into runs
+    medians = {}
+    keys = groups[finished] * (NO_GENDER + 1) + genders[finished]
+    if len(keys):
+        order = np.lexsort((seconds[finished], keys))
+        keys, times = keys[order], seconds[finished][order]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        counts = np.diff(np.r_[starts, len(keys)])
+        values = (times[starts + (counts - 1) // 2] + times[starts + counts // 2]) / 2
+        for key, count, value in zip(keys[starts].tolist(), counts.tolist(), values.tolist()):
+            medians[divmod(key, NO_GENDER + 1)] = (count, value)
+    return _StageStats(stage.version, finishers, medians, percentiles.tolist())
+
+
+def _aggregate_python(stage: _StageColumns) -> _StageStats:
+    by_gender: Dict[int, List[float]] = {}
+    by_group: Dict[Tuple[int, int], List[float]] = {}
+    for seconds, gender, group in zip(stage.seconds, stage.genders, stage.groups):
+        if math.isnan(seconds):
+            continue
+        by_group.setdefault((group, gender), []).append(seconds)
+        if gender != NO_GENDER:
+            by_gender.setdefault(gender, []).append(seconds)
+
+    ordered = {gender: sorted(times) for gender, times in by_gender.items()}
+    percentiles = []
+    for seconds, gender in zip(stage.seconds, stage.genders):
+        times = ordered.get(gender)
+        if math.isnan(seconds) or not times:
+            percentiles.append(NOT_FINISHED)
+        else:
+            percentiles.append(100.0 * (len(times) - bisect_left(times, seconds)) / len(times))
+    medians = {key: (len(times), statistics.median(times)) for key, times in by_group.items()}
+    return _StageStats(stage.version, {g: len(t) for g, t in ordered.items()}, medians, percentiles)
+
+
+_aggregate = _aggregate_numpy if np is not None else _aggregate_python
+
+
+class SeasonAnalytics:
+    """Column store of every stage seen (cached finished posmi plus live ticks) and their aggregates"""
+
+    def __init__(self, cache_dir: str = None, season_order: List[str] = None):
+        self.cache_dir = cache_dir
+        self.season_order = list(season_order or [])  # posmi in season order, for the trends
+        self._lock = threading.Lock()
+        self._stages: Dict[Tuple[str, str], _StageColumns] = {}
+        self._stats: Dict[Tuple[str, str], _StageStats] = {}
+        self._group_names: List[str] = []
+        self._group_codes: Dict[str, int] = {}
+        self._loaded: Dict[str, float] = {}  # cache file -> mtime
+        self._current: Dict[str, str] = {}   # distance -> posms fed by live ticks
+        self._loaded_since = 0  # stages (re)loaded since the last take_loaded()
+
+    def _group_code(self, grupa: str) -> int:
+        code = self._group_codes.get(grupa)
+        if code is None:
+            code = self._group_codes[grupa] = len(self._group_names)
+            self._group_names.append(grupa)
+        return code
+
+    def _stage(self, posms: str, distance: str) -> _StageColumns:
+        stage = self._stages.get((posms, distance))
+        if stage is None:
+            stage = self._stages[(posms, distance)] = _StageColumns()
+        return stage
+
+    def load_cache(self) -> int:
+        """Load season-cache files (<posms>_<distance>.json) that are new or changed; returns stages loaded"""
+        if not self.cache_dir or not os.path.isdir(self.cache_dir):
+            return 0
+        loaded = 0
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith('.json') or '_' not in entry.name:
+                continue
+            mtime = entry.stat().st_mtime
+            if self._loaded.get(entry.path) == mtime:
+                continue
+            try:
+                with open(entry.path, 'r', encoding='utf-8') as f:
+                    rows = json.load(f)
+            except (OSError, ValueError):
+                continue
+            self._loaded[entry.path] = mtime
+            posms, distance = entry.name[:-len('.json')].split('_', 1)
+            if isinstance(rows, list) and self.load_stage(posms, distance, rows):
+                loaded += 1
+        return loaded
+
+    def load_stage(self, posms: str, distance: str, rows: List[Dict[str, Any]]) -> bool:
+        """Load (or reload) one stage's results; returns True if it changed"""
+        with self._lock:
+            changed = self._stage(posms, distance).update(rows, self._group_code)
+            self._loaded_since += changed
+            return changed
+
+    def take_loaded(self) -> int:
+        """Stages loaded since the last call, so the next tick knows the trends changed"""
+        with self._lock:
+            loaded, self._loaded_since = self._loaded_since, 0
+            return loaded
+
+    def update(self, posms: str, distance: str, rows: List[Dict[str, Any]]) -> bool:
+        """Merge a tick for the current posms; returns True if an aggregate will change.
+
+        Summary ticks (top 100) and live ticks (full list) feed the same stage, so athletes
+        missing from one tick keep their last result instead of flapping to not finished."""
+        with self._lock:
+            self._current[distance] = posms
+            return self._stage(posms, distance).update(rows, self._group_code, drop_missing=False)
+
+    def _stats_for(self, key: Tuple[str, str]) -> _StageStats:
+        """Aggregates of a stage, recomputed only if its columns changed since the last call"""
+        stage = self._stages[key]
+        stats = self._stats.get(key)
+        if stats is None or stats.version != stage.version:
+            stats = self._stats[key] = _aggregate(stage)
+        return stats
+
+    def _season_key(self, posms: str) -> Tuple[int, str]:
+        order = self.season_order.index(posms) if posms in self.season_order else len(self.season_order)
+        return order, posms
+
+    def _current_posms(self, distance: str) -> Optional[str]:
+        if distance in self._current:
+            return self._current[distance]
+        stages = [posms for posms, d in self._stages if d == distance]
+        return max(stages, key=self._season_key) if stages else None
+
+    def percentile(self, distance: str, dal_id: str) -> Optional[float]:
+        """Percentile of an athlete in the current stage of a distance (100 = winner), None if not finished"""
+        with self._lock:
+            posms = self._current_posms(distance)
+            if posms is None:
+                return None
+            slot = self._stages[(posms, distance)].slots.get(str(dal_id))
+            if slot is None:
+                return None
+            value = self._stats_for((posms, distance)).percentiles[slot]
+            return None if math.isnan(value) else value
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Commentary output: per-finisher percentiles and grupa medians of the current stage, field trends"""
+        with self._lock:
+            distances = sorted({distance for _, distance in self._stages})
+            finishers, groups, trends = [], [], []
+            for distance in distances:
+                for posms in sorted((p for p, d in self._stages if d == distance), key=self._season_key):
+                    stats = self._stats_for((posms, distance))
+                    trends.append({
+                        'distance': distance,
+                        'posms': posms,
+                        'Sievietes': stats.finishers.get(0, 0),
+                        'Vīrieši': stats.finishers.get(1, 0),
+                        'total': sum(stats.finishers.values()),
+                    })
+
+                posms = self._current_posms(distance)
+                stage = self._stages[(posms, distance)]
+                stats = self._stats_for((posms, distance))
+                for (group, gender), (count, median) in sorted(stats.medians.items()):
+                    if gender == NO_GENDER:
+                        continue
+                    groups.append({
+                        'distance': distance,
+                        'grupa': self._group_names[group],
+                        'gender': GENDERS[GENDER_CODES[gender]],
+                        'finishers': count,
+                        'median': format_race_time(median),
+                    })
+                rows = []
+                for dal_id, slot in stage.slots.items():
+                    value = stats.percentiles[slot]
+                    if math.isnan(value):
+                        continue
+                    rows.append({
+                        'distance': distance,
+                        'Number': dal_id,
+                        'Name': stage.names[slot],
+                        'Gender': GENDERS[GENDER_CODES[stage.genders[slot]]],
+                        'Time': format_race_time(stage.seconds[slot]),
+                        'Percentile': round(value, 1),
+                    })
+                rows.sort(key=lambda row: (row['Gender'], -row['Percentile']))
+                finishers.extend(rows)
+            return {'finishers': finishers, 'groups': groups, 'field_trend': trends}
+
+
+_default_analytics: Dict[str, SeasonAnalytics] = {}
+_default_lock = threading.Lock()
+
+
+def get_analytics(cache_dir: str) -> SeasonAnalytics:
+    """Process-wide analytics per season cache directory (current season vs 2024 test data)"""
+    with _default_lock:
+        if cache_dir not in _default_analytics:
+            analytics = _default_analytics[cache_dir] = SeasonAnalytics(cache_dir)
+            # Stages cached by earlier runs; SeasonAPI hands over the ones it caches later
+            analytics.load_cache()
+        return _default_analytics[cache_dir]
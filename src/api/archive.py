@@ -0,0 +1,279 @@
+# src/api/archive.py
+"""
+Append-only snapshot archive of handler outputs, for timeline scrubbing and
+replay after the race.
+
+Each tick appends one record holding only what changed since the previous
+tick: outputs whose data is an object are diffed per top-level key (e.g. per
+distance), anything else is stored whole. Every `keyframe_every` ticks a
+keyframe holds the full state, so reconstructing any moment replays at most
+that many deltas. Record payloads are zlib-compressed JSON.
+
+    <session>.sbar   b"SBAR" + version, then records: <length, crc32, kind, timestamp> + payload
+    <session>.idx    fixed 24-byte entries: <timestamp, record offset, entry number of its keyframe>
+
+Both files are only ever appended to. Readers memory-map them and
+binary-search the index by time; a torn tail from a crash is ignored.
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+from .serializers import render_outputs
+from .output_queue import get_output_queue
+from .shared_state import get_shared_state
+
+MAGIC = b"SBAR"
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sH")
+RECORD_HEADER = struct.Struct("<IIBd")   # payload length, crc32, kind, timestamp
+INDEX_ENTRY = struct.Struct("<dQQ")
+DELTA, KEYFRAME = 0, 1
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def _object(encoded: Dict[str, str]) -> str:
+    return "{" + ",".join(f"{_encode(key)}:{value}" for key, value in encoded.items()) + "}"
+
+
+class SnapshotArchive:
+    """Writer for one recording session; append() takes {output name: data} for one tick"""
+
+    def __init__(self, directory: str, session: str = None, keyframe_every: int = 50):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.directory = directory
+        self.session = session or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.keyframe_every = keyframe_every
+        self.data_path = os.path.join(directory, f"{self.session}.sbar")
+        self.index_path = os.path.join(directory, f"{self.session}.idx")
+        self._lock = threading.Lock()
+        self._data = None
+        self._index = None
+        self._entries = 0
+        self._keyframe_entry = 0
+        self._since_keyframe = 0
+        # Last archived state, JSON-encoded: name -> {key: value} for objects, name -> value otherwise
+        self._encoded: Dict[str, Any] = {}
+
+    def _open(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self._data = open(self.data_path, 'ab')
+        self._index = open(self.index_path, 'ab')
+        if self._data.tell() == 0:
+            self._data.write(FILE_HEADER.pack(MAGIC, VERSION))
+        self._entries = self._index.tell() // INDEX_ENTRY.size
+        self._since_keyframe = self.keyframe_every  # a reopened session starts with a keyframe
+
+    def append(self, outputs: Dict[str, Any], timestamp: float = None) -> bool:
+        """Archive one tick; returns False if nothing changed since the last one (no record written)"""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            if self._data is None:
+                self._open()
+
+            changes = {}
+            for name, data in outputs.items():
+                old = self._encoded.get(name)
+                if isinstance(data, dict):
+                    new = {str(key): _encode(value) for key, value in data.items()}
+                    if not isinstance(old, dict):
+                        changes[name] = f'{{"object":{_object(new)}}}'
+                    else:
+                        changed = {key: value for key, value in new.items() if old.get(key) != value}
+                        removed = [key for key in old if key not in new]
+                        if changed or removed:
+                            changes[name] = f'{{"keys":{_object(changed)},"removed":{_encode(removed)}}}'
+                else:
+                    new = _encode(data)
+                    if new != old:
+                        changes[name] = f'{{"value":{new}}}'
+                self._encoded[name] = new
+
+            keyframe = self._since_keyframe >= self.keyframe_every
+            if keyframe:
+                changes = {
+                    name: f'{{"object":{_object(value)}}}' if isinstance(value, dict) else f'{{"value":{value}}}'
+                    for name, value in self._encoded.items()
+                }
+            elif not changes:
+                return False
+
+            payload = zlib.compress(_object(changes).encode('utf-8'))
+            offset = self._data.tell()
+            self._data.write(RECORD_HEADER.pack(len(payload), zlib.crc32(payload), KEYFRAME if keyframe else DELTA, timestamp))
+            self._data.write(payload)
+            self._data.flush()
+            # The index entry goes last, so a reader never finds an entry without its record
+            if keyframe:
+                self._keyframe_entry = self._entries
+                self._since_keyframe = 0
+            self._index.write(INDEX_ENTRY.pack(timestamp, offset, self._keyframe_entry))
+            self._index.flush()
+            self._entries += 1
+            self._since_keyframe += 1
+            return True
+
+    def close(self) -> None:
+        with self._lock:
+            for f in (self._data, self._index):
+                if f is not None:
+                    f.close()
+            self._data = self._index = None
+
+
+class ArchiveReader:
+    """Memory-mapped, seekable view of an archive session (also while it is still being written)"""
+
+    def __init__(self, data_path: str):
+        self.data_path = data_path
+        self.index_path = os.path.splitext(data_path)[0] + ".idx"
+        self._data: Optional[mmap.mmap] = None
+        self._index: Optional[mmap.mmap] = None
+        self._count = 0
+        # Last reconstructed state, so scrubbing forward only applies the deltas in between
+        self._position = -1
+        self._state: Dict[str, Any] = {}
+
+    def _map(self, path: str, current: Optional[mmap.mmap]) -> Optional[mmap.mmap]:
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if current is not None and len(current) == size:
+            return current
+        if current is not None:
+            current.close()
+        if not size:
+            return None
+        with open(path, 'rb') as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def refresh(self) -> int:
+        """Pick up ticks appended since the last call; returns the number of usable entries"""
+        self._data = self._map(self.data_path, self._data)
+        self._index = self._map(self.index_path, self._index)
+        if self._data is None or self._index is None:
+            self._count = 0
+            return 0
+        if FILE_HEADER.unpack_from(self._data, 0)[0] != MAGIC:
+            raise ValueError(f"{self.data_path} is not a snapshot archive")
+        count = len(self._index) // INDEX_ENTRY.size
+        # Drop index entries whose record didn't make it to disk completely
+        while count and self._record_end(count - 1) > len(self._data):
+            count -= 1
+        self._count = count
+        return count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _entry(self, i: int) -> Tuple[float, int, int]:
+        return INDEX_ENTRY.unpack_from(self._index, i * INDEX_ENTRY.size)
+
+    def _record_end(self, i: int) -> int:
+        offset = self._entry(i)[1]
+        if offset + RECORD_HEADER.size > len(self._data):
+            return offset + RECORD_HEADER.size
+        return offset + RECORD_HEADER.size + RECORD_HEADER.unpack_from(self._data, offset)[0]
+
+    def timestamp(self, i: int) -> float:
+        return self._entry(i)[0]
+
+    def time_range(self) -> Optional[Tuple[float, float]]:
+        if not self._count:
+            return None
+        return self.timestamp(0), self.timestamp(self._count - 1)
+
+    def entry_at(self, timestamp: float) -> int:
+        """Index of the last tick at or before timestamp, -1 if it is before the first one"""
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.timestamp(mid) <= timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo - 1
+
+    def _payload(self, i: int) -> Dict[str, Any]:
+        offset = self._entry(i)[1]
+        length, crc, _, _ = RECORD_HEADER.unpack_from(self._data, offset)
+        start = offset + RECORD_HEADER.size
+        payload = self._data[start:start + length]
+        if zlib.crc32(payload) != crc:
+            raise ValueError(f"Corrupt archive record {i} in {self.data_path}")
+        return json.loads(zlib.decompress(payload))
+
+    def state_at(self, timestamp: float) -> Dict[str, Any]:
+        """{output name: data} as of timestamp, replayed from the nearest keyframe (or the last position)"""
+        target = self.entry_at(timestamp)
+        if target < 0:
+            return {}
+        keyframe = self._entry(target)[2]
+        if keyframe <= self._position <= target:
+            start, state = self._position + 1, dict(self._state)
+        else:
+            start, state = keyframe, {}
+        for i in range(start, target + 1):
+            for name, change in self._payload(i).items():
+                if "value" in change:
+                    state[name] = change["value"]
+                elif "object" in change:
+                    state[name] = change["object"]
+                else:
+                    # Copy on write: states handed out earlier must not change
+                    merged = dict(state[name]) if isinstance(state.get(name), dict) else {}
+                    merged.update(change["keys"])
+                    for key in change["removed"]:
+                        merged.pop(key, None)
+                    state[name] = merged
+        self._position, self._state = target, state
+        return dict(state)
+
+    def close(self) -> None:
+        for m in (self._data, self._index):
+            if m is not None:
+                m.close()
+        self._data = self._index = None
+        self._count = 0
+
+
+def list_archives(directory: str) -> List[str]:
+    """Archive sessions in directory, oldest first"""
+    if not os.path.isdir(directory):
+        return []
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".sbar"))
+
+
+def replay(state: Dict[str, Any], output_dir: str, output_formats: Dict[str, List[str]] = None) -> List[str]:
+    """Re-emit archived outputs through shared memory and the output queue, as one batch"""
+    output_formats = output_formats or {}
+    queue = get_output_queue(output_dir)
+    shared_state = get_shared_state()
+    with queue.batch():
+        for name, data in state.items():
+            shared_state.publish(name, data)
+            for filename, payload in render_outputs(name, data, output_formats.get(name)):
+                queue.submit(filename, payload)
+    return sorted(state)
+
+
+_default_archive: Optional[SnapshotArchive] = None
+_default_lock = threading.Lock()
+
+
+def get_archive(output_dir: str) -> SnapshotArchive:
+    """Process-wide recording session in <output_dir>/archive, shared by the summary and live handlers"""
+    global _default_archive
+    with _default_lock:
+        if _default_archive is None:
+            _default_archive = SnapshotArchive(os.path.join(output_dir, 'archive'))
+        return _default_archive
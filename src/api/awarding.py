@@ -8,10 +8,20 @@ from __future__ import annotations
 import os
 import re
 import json
+import hashlib
+import logging
+import threading
 import requests
-from typing import List, Dict
+from html import unescape
+from typing import Callable, List, Dict, Tuple
 from bs4 import BeautifulSoup, Tag
 
+from .resilience import get_client
+from .singleflight import get_single_flight
+from .serializers import render_outputs
+from .output_queue import get_output_queue
+from .shared_state import get_shared_state
+
 # --------------------------------------------------------------------------- #
 # 1.  group title mapping  (raw ⟶ full marketing title)
 # --------------------------------------------------------------------------- #
@@ -61,15 +71,127 @@ def top_three(entries: List[Dict[str, str]]) -> List[Dict[str, str]]:
     return full
 
 
+def fetch_podium_html(prefetch: bool = False) -> str:
+    """Podium page HTML, shared with concurrent callers (a prefetched copy serves the first real fetch)."""
+    return get_single_flight().do(
+        ("podium",),
+        lambda: get_client().get(
+            "https://www.stirnubuks.lv/api/", params={"module": "podium"}, key="podium"
+        ).text,
+        prefetch=prefetch,
+    )
+
+
 # --------------------------------------------------------------------------- #
-# 3.  main routine
+# 3.  table parsing (shared by the one-shot fetch and the poller)
 # --------------------------------------------------------------------------- #
+def parse_podium_table(group_raw: str, table: Tag) -> List[Dict[str, str]]:
+    """Records (one per gender with names) for one group/subgroup podium table."""
+    # rows & (optional) subgroup header
+    rows = table.find_all("tr")
+    if not rows:
+        return []
+
+    subgroup_code = ""
+    first_cells = rows[0].find_all("td")
+    if first_cells and first_cells[0].has_attr("colspan"):
+        raw = first_cells[0].get_text(strip=True)
+        if "KOPVĒRTĒJUMS" in raw.upper():
+            subgroup_code = "KOPVĒRTĒJUMS"
+        else:
+            subgroup_code = raw.split()[0].rstrip(".")
+        rows = rows[1:]  # discard header row
+
+    # collect women / men podium lists
+    women, men = [], []
+    for row in rows:
+        td = row.find_all("td")
+        if len(td) < 2:
+            continue
+        left = parse_cell(td[0].get_text(strip=True))
+        right = parse_cell(td[1].get_text(strip=True))
+        if left:
+            women.append(left)
+        if right:
+            men.append(right)
+
+    women = top_three(women)
+    men   = top_three(men)
+
+    # ---------- two JSON records ----------
+    full_title = DISPLAY_TITLE.get(group_raw, group_raw)
+    records: List[Dict[str, str]] = []
+
+    for gender, podium in (("Sievietes", women), ("Vīrieši", men)):
+        if not any(p["Name"] for p in podium):
+            continue          # skip gender with no names at all
+
+        rec: Dict[str, str] = {
+            "Group1": full_title,
+            "Subgroup1": (f"{subgroup_code} {gender}").strip(),
+        }
+        for idx, p in enumerate(podium, 1):
+            rec[f"Name{idx}"]  = p["Name"]
+            rec[f"Laiks{idx}"] = p["Laiks"]
+        records.append(rec)
+    return records
+
+
+CHUNK_RE = re.compile(r"<p\b[^>]*>(.*?)</p>|(<table\b.*?</table>)", re.S | re.I)
+TAG_RE = re.compile(r"<[^>]+>")
+
+
+def split_podium_page(html: str) -> List[Tuple[str, str]] | None:
+    """[(group_raw, table_html)] in page order without building a soup of the whole page.
+
+    Returns None when the page doesn't look like a flat <p>/<table> sequence."""
+    lower = html.lower()
+    start, end = lower.find("<page"), lower.rfind("</page>")
+    if start < 0 or end < 0:
+        return None
+    body = html[start:end]
+    if body.lower().count("<table") != body.lower().count("</table>"):
+        return None
+
+    tables: List[Tuple[str, str]] = []
+    current_group_raw: str | None = None
+    for m in CHUNK_RE.finditer(body):
+        heading, table_html = m.groups()
+        if table_html is None:
+            grp = unescape(TAG_RE.sub("", heading)).strip()
+            current_group_raw = None if grp.upper() in SKIP_GROUPS else grp
+        elif current_group_raw is not None:
+            if table_html.lower().count("<table") > 1:
+                return None      # nested tables: let the full parser handle it
+            tables.append((current_group_raw, table_html))
+    return tables
+
+
+# --------------------------------------------------------------------------- #
+# 4.  main routine
+# --------------------------------------------------------------------------- #
+def _queue_outputs(output_dir: str, outputs: List[Tuple[str, object]], formats: List[str] | None) -> List[str]:
+    """Queue (stem, data) outputs as one batch on the shared output queue.
+
+    Returns the paths the files will have in the queue's local directory, which is output_dir only
+    if this call created the queue; the files exist once the queue has written them."""
+    queue = get_output_queue(os.path.abspath(output_dir))
+    paths = []
+    with queue.batch():
+        for stem, data in outputs:
+            for filename, payload in render_outputs(stem, data, formats):
+                queue.submit(filename, payload)
+                paths.append(os.path.join(queue.local_dir, filename))
+    return paths
+
+
 def fetch_and_save_awards(
     output_dir: str = "output",
     filename: str = "awarding_results.json",
+    formats: List[str] | None = None,
 ) -> str:
-    # --- 3A. fetch & soup ---------------------------------------------------
-    html = requests.get("https://www.stirnubuks.lv/api/?module=podium").text
+    # --- 4A. fetch & soup ---------------------------------------------------
+    html = fetch_podium_html()
     soup = BeautifulSoup(html, "html.parser")
     page = soup.find("page")
 
@@ -81,7 +203,7 @@ def fetch_and_save_awards(
     current_group_raw: str | None = None
     results: List[Dict[str, str]] = []
 
-    # --- 3B. iterate through <p>/<table> sequence ---------------------------
+    # --- 4B. iterate through <p>/<table> sequence ---------------------------
     for el in elements:
         # ---------- group heading <p> ----------
         if el.name == "p":
@@ -92,65 +214,126 @@ def fetch_and_save_awards(
         # ---------- podium table ----------
         if current_group_raw is None:
             continue
+        results.extend(parse_podium_table(current_group_raw, el))
+
+    # --- 4C. save -----------------------------------------------------------
+    stem = os.path.splitext(filename)[0]
+    get_shared_state().publish(stem, results)
+    paths = _queue_outputs(output_dir, [(stem, results)], formats)
+    # Callers open the returned file, so wait for its local write (not the other destinations)
+    queue = get_output_queue(os.path.abspath(output_dir))
+    if not queue.wait_written(os.path.basename(paths[0]), queue.local_dir, timeout=10):
+        raise OSError(f"{paths[0]} was not written, see the log")
+
+    return paths[0]
 
-        # rows & (optional) subgroup header
-        rows = el.find_all("tr")
-        if not rows:
-            continue
 
-        subgroup_code = ""
-        first_cells = rows[0].find_all("td")
-        if first_cells and first_cells[0].has_attr("colspan"):
-            raw = first_cells[0].get_text(strip=True)
-            if "KOPVĒRTĒJUMS" in raw.upper():
-                subgroup_code = "KOPVĒRTĒJUMS"
+# --------------------------------------------------------------------------- #
+# 5.  polling mode
+# --------------------------------------------------------------------------- #
+class AwardingPoller:
+    """Polls the podium page and re-parses only group/subgroup tables whose HTML changed.
+
+    Writes the full list to awarding_results and the records of the tables
+    that just changed to awarding_latest, only when something changed."""
+
+    def __init__(
+        self,
+        output_dir: str = "output",
+        filename: str = "awarding_results.json",
+        formats: List[str] | None = None,
+        interval: float = 5.0,
+        on_change: Callable[[List[Dict[str, str]]], None] | None = None,
+    ):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.output_dir = output_dir
+        self.stem = os.path.splitext(filename)[0]
+        self.formats = formats
+        self.interval = interval
+        self.on_change = on_change
+        self.records: List[Dict[str, str]] = []
+        self._page_hash: str | None = None
+        # (group, n-th table in the group) -> (sha1 of the table HTML, parsed records)
+        self._tables: Dict[Tuple[str, int], Tuple[str, List[Dict[str, str]]]] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def poll(self) -> List[Dict[str, str]]:
+        """One poll; returns the records of tables that changed (empty if none did)."""
+        html = fetch_podium_html()
+        page_hash = hashlib.sha1(html.encode("utf-8")).hexdigest()
+        if page_hash == self._page_hash:
+            return []
+
+        tables = split_podium_page(html)
+        if tables is None:
+            # Unusual markup: fall back to the whole-page soup and key tables the same way
+            soup = BeautifulSoup(html, "html.parser")
+            tables, group = [], None
+            for el in soup.find("page").contents:
+                if isinstance(el, Tag) and el.name == "p":
+                    grp = el.get_text(strip=True)
+                    group = None if grp.upper() in SKIP_GROUPS else grp
+                elif isinstance(el, Tag) and el.name == "table" and group is not None:
+                    tables.append((group, str(el)))
+
+        parsed: Dict[Tuple[str, int], Tuple[str, List[Dict[str, str]]]] = {}
+        records: List[Dict[str, str]] = []
+        changed: List[Dict[str, str]] = []
+        seen: Dict[str, int] = {}
+        for group, table_html in tables:
+            key = (group, seen.get(group, 0))
+            seen[group] = key[1] + 1
+            fingerprint = hashlib.sha1(table_html.encode("utf-8")).hexdigest()
+            cached = self._tables.get(key)
+            if cached is not None and cached[0] == fingerprint:
+                table_records = cached[1]
             else:
-                subgroup_code = raw.split()[0].rstrip(".")
-            rows = rows[1:]  # discard header row
-
-        # collect women / men podium lists
-        women, men = [], []
-        for row in rows:
-            td = row.find_all("td")
-            if len(td) < 2:
-                continue
-            left = parse_cell(td[0].get_text(strip=True))
-            right = parse_cell(td[1].get_text(strip=True))
-            if left:
-                women.append(left)
-            if right:
-                men.append(right)
-
-        women = top_three(women)
-        men   = top_three(men)
-
-        # ---------- write two JSON records ----------
-        full_title = DISPLAY_TITLE.get(current_group_raw, current_group_raw)
-
-        for gender, podium in (("Sievietes", women), ("Vīrieši", men)):
-            if not any(p["Name"] for p in podium):
-                continue          # skip gender with no names at all
-
-            rec: Dict[str, str] = {
-                "Group1": full_title,
-                "Subgroup1": (f"{subgroup_code} {gender}").strip(),
-            }
-            for idx, p in enumerate(podium, 1):
-                rec[f"Name{idx}"]  = p["Name"]
-                rec[f"Laiks{idx}"] = p["Laiks"]
-            results.append(rec)
-
-    # --- 3C. save -----------------------------------------------------------
-    os.makedirs(output_dir, exist_ok=True)
-    path = os.path.join(output_dir, filename)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
-
-    return path
+                table = BeautifulSoup(table_html, "html.parser").find("table")
+                table_records = parse_podium_table(group, table)
+                if cached is None or cached[1] != table_records:
+                    changed.extend(table_records)
+            parsed[key] = (fingerprint, table_records)
+            records.extend(table_records)
+
+        removed = self._tables.keys() - parsed.keys()
+        self._tables = parsed
+        self._page_hash = page_hash
+        if not changed and not removed:
+            return []
+
+        self.records = records
+        get_shared_state().publish(self.stem, records)
+        _queue_outputs(self.output_dir, [(self.stem, records), ("awarding_latest", changed)], self.formats)
+        self.logger.info(f"{len(changed)} podium record(s) changed")
+        if self.on_change is not None:
+            self.on_change(changed)
+        return changed
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="awarding-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                self.logger.error(f"Error polling podium: {str(e)}")
+            self._stop.wait(self.interval)
 
 
 # --------------------------------------------------------------------------- #
-# 4.  run standalone
+# 6.  run standalone
 # --------------------------------------------------------------------------- #
 if __name__ == "__main__":
     out = fetch_and_save_awards()
@@ -3,7 +3,20 @@ from abc import ABC, abstractmethod
 import requests
 import json
 import logging
-from typing import Dict, Any
+from datetime import date
+from typing import Dict, Any, List
+from .resilience import get_client
+from .serializers import render_outputs
+from .output_queue import get_output_queue
+from .participant_index import get_index
+from .join import get_join
+from .teams import get_team_engine
+from .positions import get_position_history
+from .singleflight import get_single_flight
+from .shared_state import get_shared_state
+from .schema import SCHEMAS, get_quarantine
+from .layouts import LayoutSnapshot, get_layout_renderer
+from .analytics import get_analytics
 
 class BaseAPIHandler(ABC):
     def __init__(self):
@@ -11,6 +24,79 @@ class BaseAPIHandler(ABC):
         # Ensure output directory exists
         self.output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'output')
         os.makedirs(self.output_dir, exist_ok=True)
+        # Shared hedging/circuit-breaker client for all API calls
+        self.client = get_client()
+        # Coalesces identical concurrent requests from GUI actions and pollers
+        self.flight = get_single_flight()
+        # How long a fetched result may be reused; None uses the single-flight micro-cache window
+        self.cache_ttl = None
+        # Warm-up handlers set this: their cached results are never served to interactive fetches
+        self.prefetch = False
+        # Shared dal_id/name lookup index, fed by every fetch
+        self.index = get_index()
+        # Shared start-list cache for joining grupa/full_name onto result rows
+        self.join = get_join()
+        # Live team/school standings of this handler's result ticks
+        self.teams = get_team_engine(self.__class__.__name__)
+        # Shared per-athlete place history for "places gained" overlays
+        self.positions = get_position_history()
+        # Output name (file stem) -> serializer formats, e.g. {"summary_results": ["json_compact", "vmix_xml"]}
+        self.output_formats: Dict[str, List[str]] = {}
+        # Async writer so slow disks or network shares never stall polling
+        self.output_queue = get_output_queue(self.output_dir)
+        # Optional memory-mapped latest state for graphics running on this machine
+        self.shared_state = get_shared_state()
+        # Rows rejected by the schema decoder are logged here instead of dropping the distance
+        self.quarantine = get_quarantine(self.output_dir)
+        # Extra overlay layouts rendered from each tick's results in worker processes
+        self.layouts: List[str] = []
+        self.layout_renderer = get_layout_renderer()
+        # Snapshot archive for post-race scrubbing/replay; set by the GUI while recording
+        self.archive = None
+        self._archive_pending: Dict[str, Any] = {}
+
+    def _get(self, params: Dict[str, Any], key: str) -> requests.Response:
+        """GET BASE_URL through the resilience layer; key selects the circuit breaker"""
+        return self.client.get(self.BASE_URL, params=params, key=key)
+
+    def _fetch_json(self, params: Dict[str, Any], key: str) -> Any:
+        """Decoded JSON for params, sharing one fetch between identical concurrent requests.
+
+        Modules with a row schema come back validated and coerced, with bad rows quarantined."""
+        flight_key = tuple(sorted((name, str(value)) for name, value in params.items()))
+        schema = SCHEMAS.get(params.get('module'))
+
+        def fetch():
+            data = self._get(params, key=key).json()
+            return data if schema is None else schema.decode(data, context=key, quarantine=self.quarantine)
+
+        return self.flight.do(flight_key, fetch, ttl=self.cache_ttl, prefetch=self.prefetch)
+
+    def _join_key(self, distance: str):
+        """Start-list cache key for a distance of this handler's posms/season"""
+        return (self.posms, distance, "2024" if self.test_mode else "")
+
+    def _fetch_startlist_rows(self, distance: str) -> List[Dict[str, Any]]:
+        """Fetch raw results_startlist rows for the start-list join"""
+        params = {
+            "module": "results_startlist",
+            "auth_token": self.AUTH_TOKEN,
+            "distance": distance,
+            "limit": 100
+        }
+        if self.posms:
+            params["posms"] = self.posms
+        if self.test_mode:
+            params["gads"] = "2024"
+        try:
+            return self._fetch_json(params, key=f"results_startlist:{distance}")
+        except Exception as e:
+            self.logger.error(f"Error fetching start list for join, distance {distance}: {str(e)}")
+            return []
+
+    def _join_startlist(self, distance: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Hash join result rows with the cached start list on dal_id"""
+        return self.join.enrich(self._join_key(distance), rows, lambda: self._fetch_startlist_rows(distance))
         
     @abstractmethod
     def fetch_data(self) -> Dict[str, Any]:
@@ -18,10 +104,90 @@ class BaseAPIHandler(ABC):
         pass
     
     @abstractmethod
-    def process_data(self, data: Dict[str, Any]) -> None:
-        """Process the fetched data"""
+    def process_data(self, data: Dict[str, Any]) -> Any:
+        """Process the fetched data and return the processed result"""
         pass
     
+    def _update_team_standings(self, all_data: Dict[str, List[Dict[str, Any]]]) -> None:
+        """Feed result rows to the team engine and rewrite team_standings only if a total changed"""
+        changed = 0
+        for distance, participants in all_data.items():
+            changed += self.teams.update(distance, participants)
+        if changed:
+            self.write_output(self.teams.snapshot(), "team_standings")
+
+    def _update_positions(self, all_data: Dict[str, List[Dict[str, Any]]]) -> None:
+        """Record this tick's places and rewrite position_movers only if a climb changed"""
+        changed = 0
+        for distance, participants in all_data.items():
+            changed += self.positions.update(
+                distance, participants, lambda row: self._translate_gender(row.get('dzimums', ''))
+            )
+        if changed:
+            self.write_output(self.positions.snapshot(), "position_movers")
+
+    def _season_cache_dir(self) -> str:
+        """Where finished posmi results are cached, per season year, so a new season never reads last year's stages"""
+        return os.path.join(self.output_dir, 'season_cache', "2024" if self.test_mode else str(date.today().year))
+
+    def _update_analytics(self, all_data: Dict[str, List[Dict[str, Any]]]) -> None:
+        """Feed this tick into the season analytics; rewrite race_analytics on change"""
+        try:
+            analytics = get_analytics(self._season_cache_dir())
+            changed = analytics.take_loaded()
+            for distance, participants in all_data.items():
+                changed += analytics.update(self.posms or "current", distance, participants)
+            if changed:
+                self.write_output(analytics.snapshot(), "race_analytics")
+        except Exception as e:
+            self.logger.error(f"Error updating analytics: {str(e)}")
+
+    def _archive_tick(self) -> None:
+        """Append the outputs written this tick to the snapshot archive while recording"""
+        pending, self._archive_pending = self._archive_pending, {}
+        if self.archive is None or not pending:
+            return
+        try:
+            self.archive.append(pending)
+        except Exception as e:
+            self.logger.error(f"Error archiving tick: {str(e)}")
+
+    def _render_layouts(self, all_data: Dict[str, List[Dict[str, Any]]]) -> None:
+        """Render the enabled layouts in parallel from an immutable snapshot and queue them as layout_<name>"""
+        if not self.layouts:
+            return
+        try:
+            snapshot = LayoutSnapshot.from_data(all_data)
+            recording = self.archive is not None
+            outputs, data = self.layout_renderer.render_with_data(
+                snapshot, self.layouts, self.output_formats, keep_data=recording
+            )
+            for filename, payload in outputs:
+                self.output_queue.submit(filename, payload)
+            if recording:
+                # Archived like any other output, so replay re-emits layout_<name> files too
+                self._archive_pending.update(data)
+        except Exception as e:
+            self.logger.error(f"Error rendering layouts: {str(e)}")
+
+    def write_output(self, data: Any, name: str, formats_key: str = None) -> List[str]:
+        """Render an output in its configured formats and queue it for writing; returns the local paths"""
+        # formats_key picks the format config when it differs from the file name (timestamped live results)
+        try:
+            # Shared memory first: it is the lowest-latency path to co-located graphics
+            self.shared_state.publish(name, data)
+            if self.archive is not None and formats_key is None:
+                # Timestamped history copies aren't archived; the archive is the history
+                self._archive_pending[name] = data
+            paths = []
+            for filename, payload in render_outputs(name, data, self.output_formats.get(formats_key or name)):
+                self.output_queue.submit(filename, payload)
+                paths.append(os.path.join(self.output_dir, filename))
+            return paths
+        except Exception as e:
+            self.logger.error(f"Error writing output {name}: {str(e)}")
+            return []
+
     def save_json(self, data: Dict[str, Any], filename: str) -> None:
         """Save data to a JSON file in the output directory"""
         try:
@@ -0,0 +1,130 @@
+# src/api/config_store.py
+"""
+Versioned group/distance config store. Handlers read one immutable snapshot
+per tick, so updates from the GUI or a watched preset file take effect
+atomically at the next tick without rebuilding the handlers.
+"""
+
+import json
+import logging
+import os
+import threading
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, NamedTuple, Optional, Set
+
+
+class ConfigSnapshot(NamedTuple):
+    version: int
+    group_configs: Mapping[str, Mapping[str, Any]]
+    distance_configs: Mapping[str, Mapping[str, Any]]
+    # group key or "distance:<name>" -> version it last changed in
+    changed_at: Mapping[str, int]
+
+    def group_version(self, group_key: str, distance: str) -> tuple:
+        """Changes whenever this group's config or its distance config changes"""
+        return (self.changed_at.get(group_key, 0), self.changed_at.get(f"distance:{distance}", 0))
+
+
+# Fields a group preset entry and a distance config entry may hold
+GROUP_FIELDS = {'name', 'image'}
+DISTANCE_FIELDS = {'group_by', 'top_count'}
+
+
+def _is_config_map(data: Any, fields: Set[str]) -> bool:
+    """True for {key: {field: value}} where every field is one of `fields`"""
+    return isinstance(data, dict) and all(
+        isinstance(value, dict) and set(value) <= fields for value in data.values()
+    )
+
+
+def _freeze(configs: Dict[str, Dict[str, Any]]) -> Mapping[str, Mapping[str, Any]]:
+    return MappingProxyType({key: MappingProxyType(dict(value)) for key, value in configs.items()})
+
+
+class ConfigStore:
+    """Holds the current ConfigSnapshot and swaps it atomically on update"""
+
+    def __init__(self, group_configs: Dict[str, Dict[str, Any]] = None, distance_configs: Dict[str, Dict[str, Any]] = None):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._lock = threading.Lock()
+        self._snapshot = ConfigSnapshot(0, _freeze(group_configs or {}), _freeze(distance_configs or {}), MappingProxyType({}))
+        self._watch_thread: Optional[threading.Thread] = None
+        self._watch_stop = threading.Event()
+
+    def snapshot(self) -> ConfigSnapshot:
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    def update(self, group_configs: Dict[str, Dict[str, Any]] = None,
+               distance_configs: Dict[str, Dict[str, Any]] = None) -> Set[str]:
+        """Replace group and/or distance configs; returns the keys that actually changed"""
+        with self._lock:
+            current = self._snapshot
+            changed: Set[str] = set()
+            groups, distances = current.group_configs, current.distance_configs
+
+            if group_configs is not None:
+                for key in set(group_configs) | set(groups):
+                    if dict(groups.get(key, {})) != dict(group_configs.get(key, {})):
+                        changed.add(key)
+                groups = _freeze(group_configs)
+            if distance_configs is not None:
+                for key in set(distance_configs) | set(distances):
+                    if dict(distances.get(key, {})) != dict(distance_configs.get(key, {})):
+                        changed.add(f"distance:{key}")
+                distances = _freeze(distance_configs)
+
+            if not changed:
+                return changed
+            version = current.version + 1
+            changed_at = dict(current.changed_at)
+            changed_at.update({key: version for key in changed})
+            self._snapshot = ConfigSnapshot(version, groups, distances, MappingProxyType(changed_at))
+        self.logger.info(f"Config version {version}: {len(changed)} key(s) changed")
+        return changed
+
+    def load_file(self, path: str) -> Set[str]:
+        """Apply an all-settings preset, or a group preset of {group_key: {name, image}}"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict) and ('group_configs' in data or 'distance_configs' in data):
+            group_configs = data.get('group_configs')
+            distance_configs = data.get('distance_configs')
+            if group_configs is not None and not _is_config_map(group_configs, GROUP_FIELDS):
+                raise ValueError(f"{path}: group_configs is not a map of group key -> {{name, image}}")
+            if distance_configs is not None and not _is_config_map(distance_configs, DISTANCE_FIELDS):
+                raise ValueError(f"{path}: distance_configs is not a map of distance -> {{group_by, top_count}}")
+            return self.update(group_configs, distance_configs)
+        if not _is_config_map(data, GROUP_FIELDS):
+            raise ValueError(f"{path} is neither an all-settings preset nor a group preset")
+        return self.update(group_configs=data)
+
+    def watch(self, path: str, interval: float = 1.0) -> None:
+        """Reload `path` whenever its modification time changes"""
+        self.stop_watching()
+        self._watch_stop = threading.Event()
+        stop = self._watch_stop
+
+        def loop():
+            last_mtime = None
+            while not stop.is_set():
+                try:
+                    mtime = os.path.getmtime(path)
+                    if last_mtime is not None and mtime != last_mtime:
+                        self.load_file(path)
+                    last_mtime = mtime
+                except Exception as e:
+                    self.logger.error(f"Error reloading config from {path}: {str(e)}")
+                stop.wait(interval)
+
+        self._watch_thread = threading.Thread(target=loop, name="config-watch", daemon=True)
+        self._watch_thread.start()
+
+    def stop_watching(self) -> None:
+        self._watch_stop.set()
+        if self._watch_thread is not None:
+            self._watch_thread.join(timeout=2)
+            self._watch_thread = None
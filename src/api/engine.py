@@ -0,0 +1,397 @@
+# src/api/engine.py
+"""
+Engine-process mode: all fetching, processing and writing runs in a separate
+process (`python main.py --engine`), so CPU-heavy ticks never share a GIL
+with the Tk mainloop. The GUI talks to it over a local authenticated
+multiprocessing connection carrying only commands, status and compact
+result-preview deltas (groups whose content changed since the last send).
+
+The engine outlives the GUI: closing the window only drops the connection,
+and a reopened GUI re-attaches through ~/.stirnubuks/engine.json (owner-only,
+kept out of output/ since it holds the connection authkey).
+"""
+
+import hashlib
+import itertools
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Listener, Client, Connection
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+from .startlist import StartListAPI
+from .summary import SummaryAPI
+from .liveresults import LiveResultsAPI
+from .season import SeasonAPI
+from .awarding import fetch_and_save_awards, AwardingPoller
+from .config_store import ConfigStore
+from .output_queue import get_output_queue
+from .shared_state import get_shared_state
+from .archive import get_archive
+from .resilience import get_client
+from .warmup import selected_distances
+
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'output')
+# Holds the authkey, so it lives in a private per-user directory rather than the shared output dir
+STATE_FILE = os.path.join(os.path.expanduser('~'), '.stirnubuks', 'engine.json')
+
+# Commands the GUI may send; anything else is rejected
+COMMANDS = {
+    "configure", "get_settings", "fetch_startlist", "fetch_summary", "fetch_season", "fetch_awards",
+    "start_live", "stop_live", "start_awards", "stop_awards", "set_priority", "status", "shutdown",
+}
+
+
+class Engine:
+    """Owns the handlers inside the engine process; commands run one at a time on the command thread"""
+
+    def __init__(self, output_dir: str = OUTPUT_DIR):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.output_dir = output_dir
+        self.settings: Dict[str, Any] = {}
+        self.config_store = ConfigStore()
+        self.summary_api: Optional[SummaryAPI] = None
+        self.live_api: Optional[LiveResultsAPI] = None
+        self.season_api: Optional[SeasonAPI] = None
+        self.awarding_poller: Optional[AwardingPoller] = None
+        self.stopped = threading.Event()
+        # Preview deltas: fingerprint of every group the attached GUI already has
+        self._preview_view = None
+        self._preview_sent: Dict[str, str] = {}
+
+    def configure(self, settings: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply the GUI's current settings (same shape as an all-settings preset).
+
+        "archive" is the engine's recording session file, or None when not recording."""
+        self.settings = settings
+        group_configs = settings.get('group_configs', {})
+        distance_configs = settings.get('distance_configs', {})
+        self.config_store.update(
+            group_configs=group_configs if isinstance(group_configs, dict) else {},
+            distance_configs=distance_configs if isinstance(distance_configs, dict) else {}
+        )
+        get_output_queue(self.output_dir).set_destinations([self.output_dir] + settings.get('output_destinations', []))
+        get_shared_state().set_outputs(settings.get('shared_state_outputs', []))
+        for api in (self.summary_api, self.live_api):
+            if api is not None:
+                self._apply_outputs(api)
+        archive = get_archive(self.output_dir) if settings.get('record_archive') else None
+        return {"ok": True, "archive": archive.data_path if archive is not None else None}
+
+    def get_settings(self) -> Dict[str, Any]:
+        """The settings the engine runs with, for a GUI that re-attaches ({} until first configured)"""
+        return {"ok": True, "settings": self.settings}
+
+    def _apply_outputs(self, api) -> None:
+        api.output_formats = self.settings.get('output_formats', {})
+        api.layouts = self.settings.get('layouts', [])
+        api.archive = get_archive(self.output_dir) if self.settings.get('record_archive') else None
+
+    def _params(self) -> Dict[str, Any]:
+        return {
+            'posms': self.settings.get('posms', ''),
+            'distances': selected_distances(self.settings),
+            'auth_token': self.settings.get('auth_key', ''),
+            'test_mode': bool(self.settings.get('test_mode', False)),
+        }
+
+    def reset_preview(self) -> None:
+        """A new GUI connected: its next preview must be complete"""
+        self._preview_view = None
+        self._preview_sent = {}
+
+    def _preview(self, view: str, groups: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """{"order": keys, "changed": {key: group}} relative to what the GUI already has"""
+        if view != self._preview_view:
+            self._preview_view, self._preview_sent = view, {}
+        order, changed, sent = [], {}, {}
+        for group in groups:
+            key = f"{group.get('group', '')}|{group.get('gender', '')}"
+            while key in sent:
+                key += "+"
+            fingerprint = hashlib.sha1(json.dumps(group, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+            if self._preview_sent.get(key) != fingerprint:
+                changed[key] = group
+            sent[key] = fingerprint
+            order.append(key)
+        self._preview_sent = sent
+        return {"view": view, "order": order, "changed": changed}
+
+    def fetch_startlist(self) -> Dict[str, Any]:
+        params = self._params()
+        api = StartListAPI(params['posms'], params['distances'], params['auth_token'], params['test_mode'],
+                           self.settings.get('group_configs', {}), self.settings.get('output_formats', {}),
+                           config_store=self.config_store)
+        all_data = api.fetch_data()
+        if not all_data:
+            return {"ok": False, "message": "No data could be fetched for the selected distances"}
+        result = api.process_data(all_data)
+        return {
+            "ok": True,
+            "message": f"Data saved successfully in: {os.path.join(api.output_dir, 'all_participants.json')}",
+            "preview": self._preview("startlist", result),
+        }
+
+    def fetch_summary(self) -> Dict[str, Any]:
+        params = self._params()
+        api = self.summary_api
+        if (api is None or api.posms != params['posms'] or api.distances != params['distances']
+                or api.AUTH_TOKEN != params['auth_token'] or api.test_mode != params['test_mode']):
+            api = self.summary_api = SummaryAPI(config_store=self.config_store, **params)
+        self._apply_outputs(api)
+        if not api.fetch_and_process():
+            return {"ok": False, "message": "Failed to fetch summary data"}
+        stats = api.client.stats()
+        return {
+            "ok": True,
+            "message": f"Summary data updated successfully (hedges won {stats['hedges_won']}/{stats['hedges_fired']})",
+            "preview": self._preview("summary", api.last_result),
+        }
+
+    def fetch_season(self, posmi: List[str]) -> Dict[str, Any]:
+        """Season standings over posmi (season order, from the GUI's list)"""
+        params = self._params()
+        api = self.season_api
+        if (api is None or api.posmi != [p for p in posmi if p] or api.posms != params['posms']
+                or api.distances != params['distances'] or api.AUTH_TOKEN != params['auth_token']
+                or api.test_mode != params['test_mode']):
+            api = self.season_api = SeasonAPI(posmi=posmi, current_posms=params['posms'], distances=params['distances'],
+                                              auth_token=params['auth_token'], test_mode=params['test_mode'])
+        api.output_formats = self.settings.get('output_formats', {})
+        if not api.fetch_and_process():
+            return {"ok": False, "message": "Failed to fetch season standings"}
+        return {
+            "ok": True,
+            "message": f"Season standings updated ({len(api.finished_posmi())} cached posmi + current posms)",
+            "preview": self._preview("season", api.preview_groups()),
+        }
+
+    def fetch_awards(self) -> Dict[str, Any]:
+        filename = fetch_and_save_awards(output_dir=self.output_dir,
+                                         formats=self.settings.get('output_formats', {}).get('awarding_results'))
+        return {"ok": True, "message": f"Awards V2 data saved to {filename}"}
+
+    def start_awards(self) -> Dict[str, Any]:
+        self.stop_awards()
+        self.awarding_poller = AwardingPoller(output_dir=self.output_dir,
+                                              formats=self.settings.get('output_formats', {}).get('awarding_results'))
+        self.awarding_poller.start()
+        return {"ok": True, "message": "Polling awards in the engine; changed podiums are written as they appear"}
+
+    def stop_awards(self) -> Dict[str, Any]:
+        if self.awarding_poller is not None:
+            self.awarding_poller.stop()
+            self.awarding_poller = None
+        return {"ok": True, "message": "Awards polling stopped"}
+
+    def start_live(self) -> Dict[str, Any]:
+        self.stop_live()
+        params = self._params()
+        self.live_api = LiveResultsAPI(
+            update_interval=int(self.settings.get('update_interval', 30)),
+            priorities={d: p for d, p in self.settings.get('priorities', {}).items() if d in params['distances']},
+            request_budget=float(self.settings.get('request_budget', 60)),
+            bandwidth_budget=float(self.settings.get('bandwidth_budget') or 0) * 1024 or None,
+            **params
+        )
+        self._apply_outputs(self.live_api)
+        self.live_api.start_live_updates()
+        return {"ok": True, "message": "Live results running in the engine"}
+
+    def stop_live(self) -> Dict[str, Any]:
+        if self.live_api is not None:
+            self.live_api.stop_live_updates()
+            self.live_api = None
+        return {"ok": True, "message": "Live results stopped"}
+
+    def set_priority(self, distance: str, priority: str) -> Dict[str, Any]:
+        if self.live_api is not None and distance in self.live_api.distances:
+            self.live_api.set_priority(distance, priority)
+        return {"ok": True}
+
+    def status(self) -> Dict[str, Any]:
+        """Small periodic status for the GUI: live freshness and API transfer"""
+        stats = get_client().stats()
+        live = self.live_api
+        return {
+            "pid": os.getpid(),
+            "live": live is not None,
+            "awards": self.awarding_poller is not None,
+            "freshness": live.scheduler.status(live.distances) if live is not None else {},
+            "transfer": {key: stats[key] for key in ("wire_bytes", "decoded_bytes", "wire_rate")},
+        }
+
+    def shutdown(self) -> Dict[str, Any]:
+        self.stop_live()
+        self.stop_awards()
+        get_output_queue(self.output_dir).flush(timeout=10)
+        self.stopped.set()
+        return {"ok": True, "message": "Engine stopped"}
+
+
+class EngineServer:
+    """Accepts one GUI connection at a time on localhost; a new connection replaces the old one"""
+
+    def __init__(self, engine: Engine, state_file: str = STATE_FILE):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.engine = engine
+        self.state_file = state_file
+        # One command thread keeps handler use sequential; status is answered from the reader thread
+        self._commands = ThreadPoolExecutor(max_workers=1, thread_name_prefix="engine-command")
+        self._send_lock = threading.Lock()
+        self._listener: Optional[Listener] = None
+        self._connection: Optional[Tuple[Connection, threading.Thread]] = None  # the attached GUI
+
+    def serve_forever(self) -> None:
+        authkey = os.urandom(16)
+        self._listener = Listener(('127.0.0.1', 0), authkey=authkey)
+        host, port = self._listener.address
+        os.makedirs(os.path.dirname(self.state_file), mode=0o700, exist_ok=True)
+        tmp_path = self.state_file + ".tmp"
+        try:
+            os.remove(tmp_path)  # a leftover may have other permissions
+        except OSError:
+            pass
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with open(fd, 'w', encoding='utf-8') as f:
+            json.dump({"pid": os.getpid(), "host": host, "port": port, "authkey": authkey.hex()}, f)
+        os.replace(tmp_path, self.state_file)
+        self.logger.info(f"Engine listening on {host}:{port} (pid {os.getpid()})")
+
+        threading.Thread(target=self._accept_loop, name="engine-accept", daemon=True).start()
+        self.engine.stopped.wait()
+        self._listener.close()
+        self._commands.shutdown(wait=True)  # lets the shutdown command send its reply first
+        self._drop_connection()
+        try:
+            os.remove(self.state_file)
+        except OSError:
+            pass
+
+    def _accept_loop(self) -> None:
+        while not self.engine.stopped.is_set():
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                if self.engine.stopped.is_set():
+                    return
+                self.logger.warning("Rejected an engine connection (bad authkey or handshake)")
+                continue
+            self._drop_connection()
+            self.engine.reset_preview()
+            thread = threading.Thread(target=self._serve, args=(conn,), name="engine-connection", daemon=True)
+            self._connection = (conn, thread)
+            thread.start()
+
+    def _drop_connection(self) -> None:
+        """Close the previous GUI's connection and join its reader, so re-attaching never leaks either"""
+        if self._connection is None:
+            return
+        conn, thread = self._connection
+        self._connection = None
+        try:
+            # Shutting the socket down wakes the reader's blocking recv with EOF
+            with socket.fromfd(conn.fileno(), socket.AF_INET, socket.SOCK_STREAM) as sock:
+                sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass  # already closed by the reader
+        thread.join(timeout=5)
+        conn.close()
+
+    def _serve(self, conn: Connection) -> None:
+        self.logger.info("GUI attached")
+        while not self.engine.stopped.is_set():
+            try:
+                request_id, command, args = conn.recv()
+            except (EOFError, OSError):
+                break  # the GUI closed; the engine keeps running
+            if command not in COMMANDS:
+                self._reply(conn, request_id, False, f"Unknown command '{command}'")
+            elif command == "status":
+                self._run(conn, request_id, command, args)
+            else:
+                self._commands.submit(self._run, conn, request_id, command, args)
+        conn.close()
+        self.logger.info("GUI detached")
+
+    def _run(self, conn: Connection, request_id: int, command: str, args: List[Any]) -> None:
+        try:
+            self._reply(conn, request_id, True, getattr(self.engine, command)(*args))
+        except Exception as e:
+            self.logger.error(f"Error running engine command {command}: {str(e)}")
+            self._reply(conn, request_id, False, str(e))
+
+    def _reply(self, conn: Connection, request_id: int, ok: bool, result: Any) -> None:
+        try:
+            with self._send_lock:
+                conn.send((request_id, ok, result))
+        except (OSError, ValueError):
+            pass  # GUI went away mid-command
+
+
+class EngineClient:
+    """GUI side of the connection; never blocks the Tk thread, replies are dispatched from pump()"""
+
+    def __init__(self, conn: Connection, pid: int):
+        self.conn = conn
+        self.pid = pid
+        self._ids = itertools.count(1)
+        self._callbacks: Dict[int, Optional[Callable[[bool, Any], None]]] = {}
+
+    @classmethod
+    def connect(cls, state_file: str = STATE_FILE) -> Optional["EngineClient"]:
+        """Attach to a running engine, or None if there isn't one"""
+        try:
+            with open(state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            conn = Client((state['host'], state['port']), authkey=bytes.fromhex(state['authkey']))
+        except (OSError, ValueError, KeyError, EOFError):
+            return None
+        return cls(conn, state['pid'])
+
+    def call(self, command: str, *args: Any, callback: Callable[[bool, Any], None] = None) -> None:
+        request_id = next(self._ids)
+        self._callbacks[request_id] = callback
+        self.conn.send((request_id, command, args))
+
+    def pump(self) -> bool:
+        """Dispatch every reply that has arrived; False once the engine is gone"""
+        try:
+            while self.conn.poll():
+                request_id, ok, result = self.conn.recv()
+                callback = self._callbacks.pop(request_id, None)
+                if callback is not None:
+                    callback(ok, result)
+        except (EOFError, OSError):
+            return False
+        return True
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def launch_engine(main_path: str) -> subprocess.Popen:
+    """Start `main.py --engine` detached from the GUI, logging to output/engine.log"""
+    command = [sys.executable] + ([] if getattr(sys, 'frozen', False) else [main_path]) + ['--engine']
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    log = open(os.path.join(OUTPUT_DIR, 'engine.log'), 'ab')
+    kwargs: Dict[str, Any] = {"stdin": subprocess.DEVNULL, "stdout": log, "stderr": log}
+    if os.name == 'nt':
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+    try:
+        return subprocess.Popen(command, **kwargs)
+    finally:
+        log.close()
+
+
+def run_engine() -> None:
+    """Entry point of the engine process"""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    EngineServer(Engine()).serve_forever()
@@ -0,0 +1,137 @@
+# src/api/generations.py
+"""
+Generation-based output store. Every batch of files a tick queues becomes a
+new generation directory holding the complete latest set of outputs
+(unchanged files are hard-linked forward from the previous generation), and
+one atomic pointer publishes it: a `current.json` manifest swapped with
+os.replace, plus a `current` symlink where the platform allows one.
+
+Readers resolve the pointer once and read every file from that directory, so
+they never combine summary_results from one tick with awarding_results from
+another. Superseded generations are garbage-collected after a grace period.
+
+    <path>/generations/g00000042/summary_results.json
+    <path>/current.json  ->  {"generation": 42, "directory": "generations/g00000042", ...}
+    <path>/current       ->  generations/g00000042
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+
+from .serializers import write_file
+
+GENERATION_RE = re.compile(r"^g(\d{8})$")
+# Timestamped history files (live_results_20240501_120000.json) belong to their own tick only
+HISTORY_RE = re.compile(r"_\d{8}_\d{6}\.[^.]+$")
+
+
+class GenerationDestination:
+    """Output queue destination that publishes each batch as one consistent generation"""
+
+    def __init__(self, path: str, keep: int = 3, grace_seconds: float = 10.0):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.path = path
+        self.name = f"generations:{path}"
+        self.keep = keep                    # newest generations always kept
+        self.grace_seconds = grace_seconds  # older ones survive this long after being superseded
+        self.generations_dir = os.path.join(path, 'generations')
+        os.makedirs(self.generations_dir, exist_ok=True)
+        self._use_symlink = hasattr(os, 'symlink')
+        self._superseded: deque = deque()  # (generation, superseded at)
+        existing = self._existing_generations()
+        self.generation = existing[-1] if existing else 0
+        # Leftovers from an earlier run are already older than any reader of this one
+        self._superseded.extend((g, 0.0) for g in existing[:-1])
+
+    def _existing_generations(self) -> List[int]:
+        found = []
+        for entry in os.listdir(self.generations_dir):
+            m = GENERATION_RE.match(entry)
+            if m:
+                found.append(int(m.group(1)))
+        return sorted(found)
+
+    def _directory(self, generation: int) -> str:
+        return os.path.join(self.generations_dir, f"g{generation:08d}")
+
+    def write(self, filename: str, payload: bytes) -> None:
+        self.write_batch({filename: payload})
+
+    def write_batch(self, files: Dict[str, bytes]) -> None:
+        """Build the next generation from the previous one plus files, then switch the pointer to it"""
+        generation = self.generation + 1
+        directory = self._directory(generation)
+        staging = directory + ".tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+
+        previous = self._directory(self.generation)
+        if self.generation and os.path.isdir(previous):
+            for filename in os.listdir(previous):
+                if filename not in files and not HISTORY_RE.search(filename):
+                    _link_or_copy(os.path.join(previous, filename), os.path.join(staging, filename))
+        for filename, payload in files.items():
+            with open(os.path.join(staging, filename), 'wb') as f:
+                f.write(payload)
+
+        # Complete on disk before anything points at it
+        os.rename(staging, directory)
+        self._publish(generation, directory)
+        if self.generation:
+            self._superseded.append((self.generation, time.monotonic()))
+        self.generation = generation
+        self._collect()
+
+    def _publish(self, generation: int, directory: str) -> None:
+        relative = os.path.relpath(directory, self.path)
+        manifest = {
+            "generation": generation,
+            "directory": relative.replace(os.sep, '/'),
+            "published_at": time.time(),
+            "files": sorted(os.listdir(directory)),
+        }
+        write_file(os.path.join(self.path, 'current.json'), json.dumps(manifest, ensure_ascii=False).encode('utf-8'))
+        if self._use_symlink:
+            link = os.path.join(self.path, 'current')
+            try:
+                tmp_link = link + ".tmp"
+                if os.path.lexists(tmp_link):
+                    os.remove(tmp_link)
+                os.symlink(relative, tmp_link, target_is_directory=True)
+                os.replace(tmp_link, link)
+            except OSError as e:
+                # e.g. Windows without symlink rights: the manifest alone is the pointer
+                self.logger.warning(f"Symlink pointer unavailable, using current.json only: {str(e)}")
+                self._use_symlink = False
+
+    def _collect(self) -> None:
+        """Remove superseded generations beyond the newest `keep` once their grace period is over"""
+        now = time.monotonic()
+        while len(self._superseded) >= self.keep and now - self._superseded[0][1] >= self.grace_seconds:
+            generation, _ = self._superseded.popleft()
+            shutil.rmtree(self._directory(generation), ignore_errors=True)
+
+
+def _link_or_copy(source: str, target: str) -> None:
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def read_current(path: str) -> Tuple[int, Optional[str]]:
+    """(generation, absolute directory) currently published under path; (0, None) before the first one.
+
+    Read every file of one update from the returned directory rather than via <path>/current."""
+    try:
+        with open(os.path.join(path, 'current.json'), 'r', encoding='utf-8') as f:
+            manifest: Dict[str, Any] = json.load(f)
+    except (OSError, ValueError):
+        return 0, None
+    return manifest["generation"], os.path.join(path, *manifest["directory"].split('/'))
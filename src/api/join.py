@@ -0,0 +1,97 @@
+# src/api/join.py
+"""
+Hash join of results_posms rows with the results_startlist rows on dal_id,
+using a cached start-list index per (posms, distance, gads).
+"""
+
+import hashlib
+import json
+import threading
+import time
+import logging
+from typing import Dict, Any, List, Callable, Optional, Tuple
+
+JoinKey = Tuple[str, str, str]  # (posms, distance, gads)
+
+# Start-list fields copied onto result rows that don't already carry them
+JOIN_FIELDS = ('grupa', 'full_name', 'komanda', 'skola')
+
+
+class StartListJoin:
+    """Keeps one dal_id -> start-list row map per key and joins result rows against it"""
+
+    def __init__(self, refresh_interval: float = 300.0):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        # key -> (content hash, loaded at, dal_id -> row)
+        self._tables: Dict[JoinKey, Tuple[str, float, Dict[str, Dict[str, Any]]]] = {}
+
+    def store(self, key: JoinKey, rows: List[Dict[str, Any]]) -> bool:
+        """Cache a start list; the index is only rebuilt if its content changed. Returns True if rebuilt"""
+        digest = hashlib.sha1(json.dumps(rows, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+        with self._lock:
+            cached = self._tables.get(key)
+            if cached and cached[0] == digest:
+                self._tables[key] = (digest, time.monotonic(), cached[2])
+                return False
+
+        table = {
+            str(row['dal_id']): row
+            for row in rows
+            if isinstance(row, dict) and row.get('dal_id') not in (None, '')
+        }
+        with self._lock:
+            self._tables[key] = (digest, time.monotonic(), table)
+        return True
+
+    def table(self, key: JoinKey, fetch: Optional[Callable[[], List[Dict[str, Any]]]] = None) -> Dict[str, Dict[str, Any]]:
+        """Start-list index for key, refetching through `fetch` once refresh_interval has passed"""
+        with self._lock:
+            cached = self._tables.get(key)
+        stale = cached is None or time.monotonic() - cached[1] >= self.refresh_interval
+        if stale and fetch is not None:
+            rows = fetch()
+            if rows:
+                self.store(key, rows)
+                with self._lock:
+                    cached = self._tables.get(key)
+        return cached[2] if cached else {}
+
+    def enrich(self, key: JoinKey, rows: List[Dict[str, Any]],
+               fetch: Optional[Callable[[], List[Dict[str, Any]]]] = None) -> List[Dict[str, Any]]:
+        """Return result rows with start-list fields joined in by dal_id"""
+        if not isinstance(rows, list):
+            return rows
+        table = self.table(key, fetch)
+        if not table:
+            return rows
+
+        enriched = []
+        for row in rows:
+            if not isinstance(row, dict):
+                enriched.append(row)
+                continue
+            match = table.get(str(row.get('dal_id', '')))
+            if match is None:
+                enriched.append(row)
+                continue
+            joined = dict(row)
+            for field in JOIN_FIELDS:
+                if not joined.get(field):
+                    joined[field] = match.get(field, '')
+            enriched.append(joined)
+        return enriched
+
+
+_default_join: Optional[StartListJoin] = None
+_default_lock = threading.Lock()
+
+
+def get_join() -> StartListJoin:
+    """Process-wide start-list join cache shared by the handlers"""
+    global _default_join
+    with _default_lock:
+        if _default_join is None:
+            _default_join = StartListJoin()
+        return _default_join
@@ -0,0 +1,218 @@
+# src/api/layouts.py
+"""
+Layout rendering stage: registered layouts (flat 60-slot groups, top-N lower
+thirds, team tables, tickers) are rendered from one immutable snapshot of a
+tick's results, in parallel worker processes, and come back already
+serialized for the output queue.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Callable, List, NamedTuple, Optional, Tuple
+
+from .schema import as_text
+from .serializers import render_outputs
+from .teams import TeamStandingsEngine, parse_race_time
+
+GENDERS = {'S': 'Sievietes', 'V': 'Vīrieši'}
+
+_LAYOUTS: Dict[str, Callable[["LayoutSnapshot"], Any]] = {}
+
+
+def _race_time_key(row: Dict[str, Any]) -> Tuple[bool, float]:
+    seconds = parse_race_time(row.get('RaceTime'))
+    return seconds is None, seconds or 0.0
+
+
+class LayoutSnapshot(NamedTuple):
+    """Read-only view of one tick: distance -> tuple of decoded result rows, fastest first"""
+    taken_at: float
+    results: Tuple[Tuple[str, Tuple[Dict[str, Any], ...]], ...]
+
+    @classmethod
+    def from_data(cls, all_data: Dict[str, List[Dict[str, Any]]]) -> "LayoutSnapshot":
+        """Snapshot with each distance's rows sorted by race time; rows without a time keep API order at the end"""
+        return cls(time.time(), tuple((distance, tuple(sorted(rows, key=_race_time_key)))
+                                      for distance, rows in sorted(all_data.items())))
+
+    def by_gender(self):
+        """Yield (distance, gender, rows) with genders in display order (women first)"""
+        for distance, rows in self.results:
+            for code, gender in GENDERS.items():
+                selected = [row for row in rows if row.get('dzimums') == code]
+                if selected:
+                    yield distance, gender, selected
+
+
+def register_layout(name: str, func: Callable[[LayoutSnapshot], Any]) -> None:
+    """Register a layout; func must be a module-level function so worker processes can import it"""
+    _LAYOUTS[name] = func
+
+
+def available_layouts() -> List[str]:
+    return sorted(_LAYOUTS)
+
+
+# --------------------------------------------------------------------------- #
+# built-in layouts
+# --------------------------------------------------------------------------- #
+def flat_groups(snapshot: LayoutSnapshot) -> Dict[str, Any]:
+    """60-slot Name{i}/Time{i}/Number{i} objects per distance and gender"""
+    teams = []
+    for distance, gender, rows in snapshot.by_gender():
+        group = {'group': distance, 'gender': gender}
+        for i in range(1, 61):
+            row = rows[i - 1] if i <= len(rows) else {}
+            group[f'Name{i}'] = as_text(row.get('Name'))
+            group[f'Time{i}'] = as_text(row.get('RaceTime'))
+            group[f'Number{i}'] = as_text(row.get('dal_id'))
+            group[f'StartaNr{i}'] = str(i) if row else ''
+        teams.append(group)
+    return {"teams": teams}
+
+
+def lower_thirds(snapshot: LayoutSnapshot, top: int = 5) -> List[Dict[str, str]]:
+    """One row per top-N finisher per distance and gender, for lower-third graphics"""
+    rows = []
+    for distance, gender, selected in snapshot.by_gender():
+        for position, row in enumerate(selected[:top], 1):
+            rows.append({
+                'distance': distance,
+                'gender': gender,
+                'Position': str(position),
+                'Name': as_text(row.get('Name')),
+                'Number': as_text(row.get('dal_id')),
+                'Time': as_text(row.get('RaceTime')),
+                'Subgroup': as_text(row.get('grupa')),
+            })
+    return rows
+
+
+def team_table(snapshot: LayoutSnapshot) -> Dict[str, List[Dict[str, Any]]]:
+    """Team and school standings computed from the snapshot alone"""
+    engine = TeamStandingsEngine()
+    for distance, rows in snapshot.results:
+        engine.update(distance, list(rows))
+    return engine.snapshot()
+
+
+def ticker(snapshot: LayoutSnapshot, top: int = 10) -> List[Dict[str, str]]:
+    """One scrolling line per distance and gender: '1. Name 1:02:03 · 2. ...'"""
+    lines = []
+    for distance, gender, selected in snapshot.by_gender():
+        text = " · ".join(
+            f"{position}. {as_text(row.get('Name'))} {as_text(row.get('RaceTime'))}".strip()
+            for position, row in enumerate(selected[:top], 1)
+        )
+        lines.append({'distance': distance, 'gender': gender, 'Text': text})
+    return lines
+
+
+register_layout("flat_groups", flat_groups)
+register_layout("lower_thirds", lower_thirds)
+register_layout("team_table", team_table)
+register_layout("ticker", ticker)
+
+
+# --------------------------------------------------------------------------- #
+# rendering
+# --------------------------------------------------------------------------- #
+def _render_chunk(snapshot: LayoutSnapshot, tasks: List[Tuple[str, Callable, List[str]]],
+                  keep_data: bool = False) -> List[Tuple[str, Any, Any]]:
+    """Worker side: render and serialize a batch of layouts; errors come back as strings.
+
+    With keep_data the layout data comes back too (for the snapshot archive), otherwise None."""
+    rendered = []
+    for name, func, formats in tasks:
+        try:
+            data = func(snapshot)
+            rendered.append((name, render_outputs(f"layout_{name}", data, formats), data if keep_data else None))
+        except Exception as e:
+            rendered.append((name, f"{type(e).__name__}: {e}", None))
+    return rendered
+
+
+class LayoutRenderer:
+    """Renders registered layouts from a snapshot in a process pool (inline if one can't start)"""
+
+    def __init__(self, workers: int = None):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        # Leave a core for the GUI/poller; with a single worker the pool would only add pickling
+        self.workers = workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_failed = False
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        with self._lock:
+            if self._pool is None and not self._pool_failed:
+                try:
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                except Exception as e:
+                    self.logger.error(f"Process pool unavailable, rendering layouts inline: {str(e)}")
+                    self._pool_failed = True
+            return self._pool
+
+    def render(self, snapshot: LayoutSnapshot, names: List[str],
+               formats: Dict[str, List[str]] = None) -> List[Tuple[str, bytes]]:
+        """(filename, payload) pairs for every requested layout; the snapshot is pickled once per worker"""
+        return self.render_with_data(snapshot, names, formats, keep_data=False)[0]
+
+    def render_with_data(self, snapshot: LayoutSnapshot, names: List[str], formats: Dict[str, List[str]] = None,
+                         keep_data: bool = True) -> Tuple[List[Tuple[str, bytes]], Dict[str, Any]]:
+        """Like render, plus {"layout_<name>": data} of every rendered layout when keep_data is set"""
+        formats = formats or {}
+        tasks = [(name, _LAYOUTS[name], formats.get(f"layout_{name}")) for name in names if name in _LAYOUTS]
+        for name in names:
+            if name not in _LAYOUTS:
+                self.logger.error(f"Unknown layout '{name}', available: {', '.join(available_layouts())}")
+        if not tasks:
+            return [], {}
+
+        pool = self._get_pool() if len(tasks) > 1 and self.workers > 1 else None
+        if pool is None:
+            results = _render_chunk(snapshot, tasks, keep_data)
+        else:
+            chunks = [tasks[i::self.workers] for i in range(min(self.workers, len(tasks)))]
+            try:
+                futures = [pool.submit(_render_chunk, snapshot, chunk, keep_data) for chunk in chunks]
+                results = [item for future in futures for item in future.result()]
+            except Exception as e:
+                # A broken pool (worker killed, unpicklable layout) falls back to inline for this tick
+                self.logger.error(f"Layout pool failed, rendering inline: {str(e)}")
+                with self._lock:
+                    self._pool = None
+                results = _render_chunk(snapshot, tasks, keep_data)
+
+        outputs = []
+        data = {}
+        for name, rendered, layout_data in results:
+            if isinstance(rendered, str):
+                self.logger.error(f"Error rendering layout {name}: {rendered}")
+            else:
+                outputs.extend(rendered)
+                if keep_data:
+                    data[f"layout_{name}"] = layout_data
+        return outputs, data
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+
+
+_default_renderer: Optional[LayoutRenderer] = None
+_default_lock = threading.Lock()
+
+
+def get_layout_renderer() -> LayoutRenderer:
+    """Process-wide renderer so all handlers share one worker pool"""
+    global _default_renderer
+    with _default_lock:
+        if _default_renderer is None:
+            _default_renderer = LayoutRenderer()
+        return _default_renderer
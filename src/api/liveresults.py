@@ -1,23 +1,46 @@
 from .base import BaseAPIHandler
+from .profiling import profiled
+from .output_queue import output_batch
+from .resilience import jittered_backoff
+from .scheduler import DeadlineScheduler
 from typing import Dict, Any, List, Tuple
 import requests
 import logging
 from datetime import datetime
 import time
+import math
 import threading
 
 class LiveResultsAPI(BaseAPIHandler):
     BASE_URL = "https://www.stirnubuks.lv/api/"
     
-    def __init__(self, posms: str, distances: List[str], auth_token: str, update_interval: int = 30, test_mode: bool = False):
+    def __init__(self, posms: str, distances: List[str], auth_token: str, update_interval: int = 30, test_mode: bool = False,
+                 output_formats: Dict[str, List[str]] = None, bandwidth_budget: float = None,
+                 low_priority: List[str] = None, max_stretch: int = 8,
+                 priorities: Dict[str, str] = None, request_budget: float = 60.0):
         super().__init__()
         self.posms = posms
         self.distances = distances
         self.AUTH_TOKEN = auth_token
-        self.update_interval = update_interval  # in seconds
+        self.update_interval = update_interval  # in seconds, the freshness target of standby distances
         self.test_mode = test_mode
+        self.output_formats = output_formats or {}
         self.is_running = False
         self.thread = None
+        self._wake = threading.Event()
+        # Bandwidth budget mode: when the uplink receives more than bandwidth_budget bytes/s,
+        # standby and background distances are polled up to max_stretch times less often
+        self.bandwidth_budget = bandwidth_budget
+        self.max_stretch = max_stretch
+        # Per-distance deadlines: on_air / standby / background, within request_budget requests per minute
+        self.scheduler = DeadlineScheduler(targets={"standby": float(update_interval)}, request_budget=request_budget)
+        for distance in low_priority or []:
+            self.scheduler.set_priority(distance, "background")
+        for distance, priority in (priorities or {}).items():
+            self.scheduler.set_priority(distance, priority)
+        self.last_attempted: List[str] = []
+        self.last_fetched: List[str] = []
+        self._last_data: Dict[str, List[Dict[str, Any]]] = {}
 
     def _translate_gender(self, dzimums: str) -> str:
         """Translate gender code to full Latvian words"""
@@ -27,6 +50,38 @@ class LiveResultsAPI(BaseAPIHandler):
         }
         return gender_map.get(dzimums, dzimums)
 
+    def interval_stretch(self) -> int:
+        """Factor applied to standby/background freshness targets while over the bandwidth budget"""
+        if not self.bandwidth_budget:
+            return 1
+        rate = self.client.wire_rate()
+        if rate <= self.bandwidth_budget:
+            return 1
+        return min(self.max_stretch, math.ceil(rate / self.bandwidth_budget))
+
+    def set_priority(self, distance: str, priority: str) -> None:
+        """Mark a distance on_air, standby or background; takes effect on the next tick"""
+        self.scheduler.set_priority(distance, priority)
+        self._wake.set()
+
+    @profiled("fetch_data")
+    def fetch_data(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Fetch the distances whose deadline has passed; others keep their last results"""
+        stretch = self.interval_stretch()
+        if stretch > 1:
+            self.logger.info(f"Uplink over budget, standby/background targets stretched {stretch}x")
+        self.last_fetched = []
+        self.last_attempted = self.scheduler.due(self.distances, stretch)
+        for distance in self.last_attempted:
+            distance_name, data = self._fetch_single_distance(distance)
+            # Failed fetches also wait for their next deadline so they can't eat the whole budget
+            self.scheduler.mark_fetched(distance)
+            if data:
+                self._last_data[distance_name] = data
+                self.last_fetched.append(distance_name)
+                self.index.update('results', distance_name, data)
+        return {distance: self._last_data[distance] for distance in self.distances if distance in self._last_data}
+
     def _fetch_single_distance(self, distance: str) -> Tuple[str, List[Dict[str, Any]]]:
         """Fetch data for a single distance"""
         params = {
@@ -40,13 +95,14 @@ class LiveResultsAPI(BaseAPIHandler):
             params["gads"] = "2024"
             
         try:
-            response = requests.get(self.BASE_URL, params=params)
-            response.raise_for_status()
-            return distance, response.json()
+            rows = self._fetch_json(params, key=f"results_posms:{distance}")
+            return distance, self._join_startlist(distance, rows)
         except Exception as e:
             self.logger.error(f"Error fetching live results for distance {distance}: {str(e)}")
             return distance, []
 
+    @profiled("process_data", tick=True)
+    @output_batch
     def process_data(self, all_data: Dict[str, List[Dict[str, Any]]]) -> None:
         """Process all fetched data into the required format"""
         if not all_data:
@@ -64,22 +120,28 @@ class LiveResultsAPI(BaseAPIHandler):
                     'Gender1': self._translate_gender(participant.get('dzimums', '')),
                     'Number1': participant.get('dal_id', ''),
                     'Name1': participant.get('Name', ''),
-                    'Time1': participant.get('RaceTime', '')
+                    'Time1': participant.get('RaceTime', ''),
+                    'Subgroup1': participant.get('grupa', '')
                 }
                 processed_data[distance].append(processed_participant)
 
-        # Save to JSON file with timestamp
+        # Save with timestamp, using the formats configured for "live_results"
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"live_results_{timestamp}.json"
-        self.save_json(processed_data, filename)
+        self.write_output(processed_data, f"live_results_{timestamp}", formats_key="live_results")
         
         # Also save to a fixed filename for latest results
-        self.save_json(processed_data, "latest_live_results.json")
+        self.write_output(processed_data, "latest_live_results")
+        self._update_team_standings(all_data)
+        self._update_positions(all_data)
+        self._update_analytics(all_data)
+        self._render_layouts(all_data)
+        self._archive_tick()
 
     def start_live_updates(self):
         """Start the live update thread"""
         if not self.is_running:
             self.is_running = True
+            self._wake.clear()
             self.thread = threading.Thread(target=self._update_loop)
             self.thread.daemon = True
             self.thread.start()
@@ -87,25 +149,39 @@ class LiveResultsAPI(BaseAPIHandler):
     def stop_live_updates(self):
         """Stop the live update thread"""
         self.is_running = False
+        self._wake.set()
         if self.thread:
             self.thread.join()
 
     def _update_loop(self):
         """Main loop for fetching live updates"""
+        consecutive_errors = 0
         while self.is_running:
             try:
-                all_data = {}
-                for distance in self.distances:
-                    distance_name, data = self._fetch_single_distance(distance)
-                    if data:
-                        all_data[distance_name] = data
+                all_data = self.fetch_data()
                 
-                if all_data:
+                if self.last_fetched:
                     self.process_data(all_data)
-                    self.logger.info("Live results updated successfully")
+                    self.logger.info(f"Live results updated successfully ({', '.join(self.last_fetched)})")
+                    consecutive_errors = 0
+                elif self.last_attempted:
+                    # Something was due but nothing came back
+                    consecutive_errors += 1
+
+                stats = self.client.stats()
+                self.logger.debug(
+                    f"Hedges won {stats['hedges_won']}/{stats['hedges_fired']}, breakers: {stats['breakers']}, "
+                    f"wire {stats['wire_bytes']} B / decoded {stats['decoded_bytes']} B, {stats['wire_rate']:.0f} B/s"
+                )
                 
-                # Wait for the specified interval
-                time.sleep(self.update_interval)
+                # Sleep until the next deadline, backing off while nothing comes back
+                wait = min(max(self.scheduler.next_wakeup(self.distances, self.interval_stretch()), 0.2),
+                           self.update_interval)
+                if consecutive_errors:
+                    wait += jittered_backoff(consecutive_errors - 1, cap=self.update_interval)
+                self._wake.wait(wait)
+                self._wake.clear()
             except Exception as e:
                 self.logger.error(f"Error in update loop: {str(e)}")
-                time.sleep(5)  # Wait a bit before retrying on error 
\ No newline at end of file
+                consecutive_errors += 1
+                time.sleep(jittered_backoff(consecutive_errors, base=2.0))  # Jittered wait before retrying on error
@@ -0,0 +1,313 @@
+# src/api/output_queue.py
+"""
+Asynchronous output fan-out: handlers enqueue rendered files and return, one
+writer thread per destination (local dir, network share, HTTP POST,
+generation store) drains them. Pending writes are coalesced per file, latest
+wins. Files queued inside batch() enter every destination together, so a
+generation store always publishes whole ticks.
+"""
+
+import atexit
+import functools
+import logging
+import mimetypes
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Tuple
+
+import requests
+
+from .serializers import write_file
+from .generations import GenerationDestination, HISTORY_RE
+from .profiling import get_profiler
+
+
+# Timestamped history files (live_results_<timestamp>) kept per output and format in a directory
+HISTORY_KEEP = 120
+
+
+class DirectoryDestination:
+    """Writes files into a directory (local output dir or a mounted network path)"""
+
+    def __init__(self, path: str, history_keep: int = HISTORY_KEEP):
+        self.path = path
+        self.name = f"dir:{path}"
+        self.history_keep = history_keep
+
+    def write(self, filename: str, payload: bytes) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        write_file(os.path.join(self.path, filename), payload)
+        match = HISTORY_RE.search(filename)
+        if match:
+            self._prune_history(filename[:match.start()], os.path.splitext(filename)[1])
+
+    def _prune_history(self, stem: str, extension: str) -> None:
+        """Delete all but the newest history_keep timestamped files of one output and format"""
+        history = sorted(
+            name for name in os.listdir(self.path)
+            if name.startswith(stem + '_') and name.endswith(extension) and HISTORY_RE.search(name)
+            and len(name) == len(stem) + len('_YYYYMMDD_HHMMSS') + len(extension)
+        )
+        for name in history[:-self.history_keep]:
+            try:
+                os.remove(os.path.join(self.path, name))
+            except OSError:
+                pass
+
+
+class HttpPostDestination:
+    """POSTs each file to <url>/<filename>, e.g. a local graphics machine's ingest endpoint"""
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+        self.name = f"http:{self.url}"
+
+    def write(self, filename: str, payload: bytes) -> None:
+        content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        response = requests.post(
+            f"{self.url}/{filename}",
+            data=payload,
+            headers={'Content-Type': content_type},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+
+
+def destination_from_config(config: Any):
+    """'http://...' or {'type': 'http', 'url': ...} -> HttpPostDestination,
+    'generations:<path>' or {'type': 'generations', 'path': ...} -> GenerationDestination,
+    anything else -> DirectoryDestination"""
+    if isinstance(config, dict):
+        if config.get('type') == 'http':
+            return HttpPostDestination(config['url'])
+        if config.get('type') == 'generations':
+            return GenerationDestination(config['path'], keep=config.get('keep', 3))
+        return DirectoryDestination(config['path'], history_keep=config.get('history_keep', HISTORY_KEEP))
+    if str(config).startswith(('http://', 'https://')):
+        return HttpPostDestination(str(config))
+    if str(config).startswith('generations:'):
+        return GenerationDestination(str(config)[len('generations:'):])
+    return DirectoryDestination(str(config))
+
+
+class _DestinationWorker:
+    """Latest-wins pending map and writer thread for one destination"""
+
+    def __init__(self, destination, max_pending: int, logger: logging.Logger):
+        self.destination = destination
+        self.max_pending = max_pending
+        self.logger = logger
+        self.pending: "OrderedDict[str, bytes]" = OrderedDict()
+        # Destinations with write_batch get everything pending in one call (one generation per drain)
+        self.batched = hasattr(destination, 'write_batch')
+        self.condition = threading.Condition()
+        self.busy = False
+        self.stopped = False
+        # Files being written right now, and files whose last write failed or was dropped
+        self.writing: set = set()
+        self.failed: set = set()
+        self.latencies = deque(maxlen=200)
+        self.stats = {"written": 0, "coalesced": 0, "dropped": 0, "errors": 0}
+        self.thread = threading.Thread(target=self._run, name=f"output-{destination.name}", daemon=True)
+        self.thread.start()
+
+    def submit(self, files: List[Tuple[str, bytes]], block_timeout: float) -> None:
+        """Add files to the pending map in one step, so the writer never sees part of them"""
+        with self.condition:
+            # Backpressure: optionally wait for room, then drop the oldest pending files.
+            # A batch destination drains everything at once and is never dropped from.
+            if not self.batched:
+                new = sum(1 for filename, _ in files if filename not in self.pending)
+                deadline = time.monotonic() + block_timeout
+                while self.pending and len(self.pending) + new > self.max_pending:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        while self.pending and len(self.pending) + new > self.max_pending:
+                            dropped, _ = self.pending.popitem(last=False)
+                            self.failed.add(dropped)
+                            self.stats["dropped"] += 1
+                        break
+                    self.condition.wait(remaining)
+            for filename, payload in files:
+                if filename in self.pending:
+                    # A newer version replaces the unwritten one
+                    self.stats["coalesced"] += 1
+                self.pending[filename] = payload
+            self.condition.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                while not self.pending and not self.stopped:
+                    self.condition.wait()
+                if self.stopped and not self.pending:
+                    return
+                if self.batched:
+                    batch, self.pending = self.pending, OrderedDict()
+                else:
+                    batch = OrderedDict([self.pending.popitem(last=False)])
+                self.busy = True
+                self.writing = set(batch)
+                self.condition.notify_all()
+
+            started = time.monotonic()
+            try:
+                with get_profiler().section(f"write:{self.destination.name}"):
+                    if self.batched:
+                        self.destination.write_batch(batch)
+                    else:
+                        self.destination.write(*next(iter(batch.items())))
+                with self.condition:
+                    self.stats["written"] += len(batch)
+                    self.latencies.append(time.monotonic() - started)
+                    self.failed.difference_update(batch)
+            except Exception as e:
+                with self.condition:
+                    self.stats["errors"] += 1
+                    self.failed.update(batch)
+                self.logger.error(f"Error writing {', '.join(batch)} to {self.destination.name}: {str(e)}")
+            finally:
+                with self.condition:
+                    self.busy = False
+                    self.writing = set()
+                    self.condition.notify_all()
+
+    def flush(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while self.pending or self.busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+        return True
+
+    def wait_written(self, filename: str, timeout: float) -> bool:
+        """Wait for the queued version of one file only; False on timeout, write error or drop"""
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while filename in self.pending or filename in self.writing:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+            return filename not in self.failed
+
+    def stop(self) -> None:
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+
+    def report(self) -> Dict[str, Any]:
+        with self.condition:
+            samples = sorted(self.latencies)
+            report = dict(self.stats, pending=len(self.pending))
+        if samples:
+            report["p50_ms"] = round(samples[len(samples) // 2] * 1000, 1)
+            report["max_ms"] = round(samples[-1] * 1000, 1)
+        return report
+
+
+class OutputQueue:
+    """Bounded async fan-out of rendered output files to one or more destinations"""
+
+    def __init__(self, destinations: List[Any], max_pending: int = 64, block_timeout: float = 0.0):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.max_pending = max_pending
+        self.block_timeout = block_timeout
+        self._lock = threading.Lock()
+        self._workers: Dict[str, _DestinationWorker] = {}
+        self._batch = threading.local()
+        self.set_destinations(destinations)
+
+    def set_destinations(self, destinations: List[Any]) -> None:
+        """Replace the destination list; workers for unchanged destinations keep running"""
+        wanted = {}
+        for config in destinations:
+            destination = config if hasattr(config, 'write') else destination_from_config(config)
+            wanted[destination.name] = destination
+        with self._lock:
+            for name in list(self._workers):
+                if name not in wanted:
+                    self._workers.pop(name).stop()
+            for name, destination in wanted.items():
+                if name not in self._workers:
+                    self._workers[name] = _DestinationWorker(destination, self.max_pending, self.logger)
+
+    def submit(self, filename: str, payload: bytes) -> None:
+        """Queue a file for every destination; never waits on disk or network I/O"""
+        batch = getattr(self._batch, 'files', None)
+        if batch is not None:
+            batch[filename] = payload
+            return
+        self._submit([(filename, payload)])
+
+    def _submit(self, files: List[Tuple[str, bytes]]) -> None:
+        with self._lock:
+            workers = list(self._workers.values())
+        for worker in workers:
+            worker.submit(files, self.block_timeout)
+
+    @contextmanager
+    def batch(self):
+        """Collect this thread's submits and queue them together on exit (nested batches join the outer one)"""
+        if getattr(self._batch, 'files', None) is not None:
+            yield
+            return
+        self._batch.files = OrderedDict()
+        try:
+            yield
+        finally:
+            files, self._batch.files = self._batch.files, None
+            if files:
+                self._submit(list(files.items()))
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every destination has written what was queued"""
+        with self._lock:
+            workers = list(self._workers.values())
+        return all(worker.flush(timeout) for worker in workers)
+
+    def wait_written(self, filename: str, directory: str, timeout: float = 5.0) -> bool:
+        """Wait until filename is written to the directory destination at directory, ignoring the others"""
+        directory = os.path.abspath(directory)
+        with self._lock:
+            worker = next((w for w in self._workers.values() if isinstance(w.destination, DirectoryDestination)
+                           and os.path.abspath(w.destination.path) == directory), None)
+        return worker is not None and worker.wait_written(filename, timeout)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-destination counters and write latency"""
+        with self._lock:
+            workers = dict(self._workers)
+        return {name: worker.report() for name, worker in workers.items()}
+
+
+_default_queue: Optional[OutputQueue] = None
+_default_lock = threading.Lock()
+
+
+def get_output_queue(output_dir: str) -> OutputQueue:
+    """Process-wide queue; the local output directory is always the first destination.
+
+    The first caller's output_dir wins; queue.local_dir tells later callers where files land."""
+    global _default_queue
+    with _default_lock:
+        if _default_queue is None:
+            _default_queue = OutputQueue([DirectoryDestination(output_dir)])
+            _default_queue.local_dir = output_dir
+            atexit.register(_default_queue.flush)
+        return _default_queue
+
+
+def output_batch(func):
+    """Decorator for handler methods: everything the call queues reaches the destinations as one batch"""
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with self.output_queue.batch():
+            return func(self, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,141 @@
+# src/api/participant_index.py
+"""
+In-memory participant lookup across start lists and results: exact match on
+dal_id and diacritic-folded name-prefix search.
+"""
+
+import threading
+import unicodedata
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+MAX_PREFIX = 12  # longer query tokens are narrowed by a startswith check
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip diacritics, so 'Ķēniņš' matches 'kenins'"""
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def _tokens(name: str) -> List[str]:
+    return [t for t in fold(name).replace('-', ' ').split() if t]
+
+
+class ParticipantIndex:
+    """Hash map on dal_id plus a prefix map on folded name tokens, updated per (source, distance)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._prefixes: Dict[str, Set[str]] = {}
+        # (source, distance) -> {dal_id: row fingerprint}, used to apply only what changed
+        self._batches: Dict[Tuple[str, str], Dict[str, tuple]] = {}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def update(self, source: str, distance: str, rows: List[Dict[str, Any]]) -> None:
+        """Apply a fresh batch of rows from one source ('startlist' or 'results') for one distance"""
+        incoming: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            if not isinstance(row, dict):
+                continue
+            dal_id = str(row.get('dal_id', '') or '')
+            if dal_id:
+                incoming[dal_id] = {
+                    'name': row.get('full_name') or row.get('Name') or '',
+                    'gender': row.get('dzimums', ''),
+                    'grupa': row.get('grupa', ''),
+                    'time': row.get('RaceTime', ''),
+                }
+
+        with self._lock:
+            previous = self._batches.get((source, distance), {})
+            current = {}
+            for dal_id, fields in incoming.items():
+                fingerprint = tuple(fields.values())
+                current[dal_id] = fingerprint
+                if previous.get(dal_id) != fingerprint:
+                    self._set(dal_id, source, distance, fields)
+            for dal_id in previous.keys() - current.keys():
+                self._drop(dal_id, source)
+            self._batches[(source, distance)] = current
+
+    def _set(self, dal_id: str, source: str, distance: str, fields: Dict[str, Any]) -> None:
+        record = self._records.get(dal_id)
+        if record is None:
+            record = self._records[dal_id] = {'dal_id': dal_id, 'name': '', 'distance': distance}
+        old_name = record['name']
+        record[source] = fields
+        record['distance'] = distance
+        if fields['name']:
+            record['name'] = fields['name']
+        if record['name'] != old_name:
+            self._unindex_name(dal_id, old_name)
+            self._index_name(dal_id, record['name'])
+
+    def _drop(self, dal_id: str, source: str) -> None:
+        record = self._records.get(dal_id)
+        if record is None:
+            return
+        record.pop(source, None)
+        if 'startlist' not in record and 'results' not in record:
+            self._unindex_name(dal_id, record['name'])
+            del self._records[dal_id]
+
+    def _index_name(self, dal_id: str, name: str) -> None:
+        for token in _tokens(name):
+            for i in range(1, min(len(token), MAX_PREFIX) + 1):
+                self._prefixes.setdefault(token[:i], set()).add(dal_id)
+
+    def _unindex_name(self, dal_id: str, name: str) -> None:
+        for token in _tokens(name):
+            for i in range(1, min(len(token), MAX_PREFIX) + 1):
+                ids = self._prefixes.get(token[:i])
+                if ids is not None:
+                    ids.discard(dal_id)
+                    if not ids:
+                        del self._prefixes[token[:i]]
+
+    def get(self, dal_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            record = self._records.get(str(dal_id))
+            return dict(record) if record else None
+
+    def search(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Bib exact match first, then participants whose name tokens start with every query token"""
+        query = query.strip()
+        if not query:
+            return []
+        with self._lock:
+            matches: List[Dict[str, Any]] = []
+            if query in self._records:
+                matches.append(self._records[query])
+
+            tokens = _tokens(query)
+            if tokens:
+                # Walk the smallest posting set and probe the others, stopping at limit
+                postings = sorted((self._prefixes.get(t[:MAX_PREFIX], set()) for t in tokens), key=len)
+                for dal_id in postings[0]:
+                    if len(matches) >= limit:
+                        break
+                    if dal_id == query or not all(dal_id in ids for ids in postings[1:]):
+                        continue
+                    record = self._records[dal_id]
+                    name_tokens = _tokens(record['name'])
+                    if all(any(nt.startswith(t) for nt in name_tokens) for t in tokens):
+                        matches.append(record)
+            return [dict(r) for r in matches[:limit]]
+
+
+_default_index: Optional[ParticipantIndex] = None
+_default_lock = threading.Lock()
+
+
+def get_index() -> ParticipantIndex:
+    """Process-wide index fed by every handler's fetch"""
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            _default_index = ParticipantIndex()
+        return _default_index
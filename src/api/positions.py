@@ -0,0 +1,180 @@
+# src/api/positions.py
+"""
+Per-athlete position history for "places gained" graphics.
+
+Each dal_id gets a fixed-size ring of one-minute buckets (array-backed, so a
+whole race day stays bounded at `capacity` buckets per athlete; queries can
+look back at most that far). Places are
+counted within distance + gender, in the order the API returns the rows.
+"""
+
+import threading
+import time
+from array import array
+from typing import Dict, Any, Callable, List, Optional, Set, Tuple
+
+from .teams import parse_race_time, format_race_time
+
+NO_PLACE = 0  # places are 1-based, 0 marks an empty bucket
+
+
+class _Ring:
+    """Place and race time for the last `capacity` buckets of one athlete"""
+
+    __slots__ = ("places", "times", "first_bucket", "last_bucket", "group")
+
+    def __init__(self, capacity: int):
+        self.places = array('H', [NO_PLACE]) * capacity
+        self.times = array('f', [-1.0]) * capacity
+        self.first_bucket = -1
+        self.last_bucket = -1
+        self.group: Tuple[str, str] = ("", "")
+
+    def record(self, bucket: int, place: int, seconds: float) -> None:
+        capacity = len(self.places)
+        if self.last_bucket < 0:
+            self.first_bucket = bucket
+        elif bucket < self.last_bucket:
+            return  # clock went backwards; keep the newer history
+        elif bucket > self.last_bucket + 1:
+            # Carry the last known place across skipped buckets (at most one full ring),
+            # so every bucket between first_bucket and last_bucket is filled
+            previous = self.last_bucket % capacity
+            for missing in range(max(self.last_bucket + 1, bucket - capacity + 1), bucket):
+                slot = missing % capacity
+                self.places[slot] = self.places[previous]
+                self.times[slot] = self.times[previous]
+        slot = bucket % capacity
+        self.places[slot] = min(place, 65535)
+        self.times[slot] = seconds
+        self.last_bucket = bucket
+
+    def place_at(self, bucket: int) -> int:
+        """Place recorded in `bucket`, NO_PLACE if it fell out of the ring or was never seen"""
+        oldest = max(self.first_bucket, self.last_bucket - len(self.places) + 1)
+        if self.last_bucket < 0 or not oldest <= bucket <= self.last_bucket:
+            return NO_PLACE
+        return self.places[bucket % len(self.places)]
+
+    def current(self) -> Tuple[int, float]:
+        slot = self.last_bucket % len(self.places)
+        return self.places[slot], self.times[slot]
+
+
+class PositionHistory:
+    """Position rings keyed by dal_id, plus a gain index for the configured climb window"""
+
+    def __init__(self, capacity: int = 180, bucket_seconds: float = 60.0, climb_window: int = 10,
+                 clock: Callable[[], float] = time.time):
+        self.capacity = capacity              # buckets kept per athlete (180 x 1 min = 3 h, ~1 KB)
+        self.bucket_seconds = bucket_seconds
+        self.climb_window = climb_window      # minutes, used for the fastest-climbers index
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._rings: Dict[str, _Ring] = {}
+        self._names: Dict[str, str] = {}
+        self._gains: Dict[str, int] = {}           # dal_id -> places gained over climb_window
+        self._by_gain: Dict[int, Set[str]] = {}    # gain -> dal_ids, so top-k walks k entries
+
+    def _bucket(self, now: float = None) -> int:
+        return int((self.clock() if now is None else now) // self.bucket_seconds)
+
+    def update(self, distance: str, rows: List[Dict[str, Any]], gender_of: Callable[[Dict[str, Any]], str],
+               now: float = None) -> int:
+        """Record the current places for a distance's result rows; returns how many gains changed"""
+        bucket = self._bucket(now)
+        window = max(1, int(self.climb_window * 60 // self.bucket_seconds))
+        next_place: Dict[str, int] = {}
+        changed = 0
+        with self._lock:
+            for row in rows:
+                if not isinstance(row, dict) or row.get('dal_id') in (None, ''):
+                    continue
+                dal_id = str(row['dal_id'])
+                gender = gender_of(row)
+                place = next_place.get(gender, 0) + 1
+                next_place[gender] = place
+                ring = self._rings.get(dal_id)
+                if ring is None:
+                    ring = self._rings[dal_id] = _Ring(self.capacity)
+                ring.group = (distance, gender)
+                seconds = parse_race_time(row.get('RaceTime'))
+                ring.record(bucket, place, -1.0 if seconds is None else seconds)
+                self._names[dal_id] = str(row.get('Name', '') or '')
+                if self._set_gain(dal_id, self._gain(ring, bucket, window)):
+                    changed += 1
+        return changed
+
+    @staticmethod
+    def _gain(ring: _Ring, bucket: int, window: int) -> int:
+        earlier = ring.place_at(bucket - window)
+        now = ring.place_at(bucket)
+        if earlier == NO_PLACE or now == NO_PLACE:
+            return 0
+        return earlier - now
+
+    def _set_gain(self, dal_id: str, gain: int) -> bool:
+        """Move dal_id to its new gain in the index; only non-zero gains are indexed"""
+        previous = self._gains.get(dal_id, 0)
+        if previous == gain:
+            return False
+        if previous:
+            holders = self._by_gain[previous]
+            holders.discard(dal_id)
+            if not holders:
+                del self._by_gain[previous]
+        if gain:
+            self._gains[dal_id] = gain
+            self._by_gain.setdefault(gain, set()).add(dal_id)
+        else:
+            del self._gains[dal_id]
+        return True
+
+    def places_gained(self, dal_id: str, minutes: int, now: float = None) -> int:
+        """Places gained (negative = lost) over the last `minutes`; 0 when history is missing"""
+        with self._lock:
+            ring = self._rings.get(str(dal_id))
+            if ring is None:
+                return 0
+            window = max(1, int(minutes * 60 // self.bucket_seconds))
+            bucket = min(self._bucket(now), ring.last_bucket)
+            return self._gain(ring, bucket, window)
+
+    def fastest_climbers(self, k: int = 10) -> List[Dict[str, Any]]:
+        """Top k athletes by places gained over climb_window, best first"""
+        result = []
+        with self._lock:
+            for gain in sorted((g for g in self._by_gain if g > 0), reverse=True):
+                for dal_id in sorted(self._by_gain[gain]):
+                    ring = self._rings[dal_id]
+                    place, seconds = ring.current()
+                    distance, gender = ring.group
+                    result.append({
+                        "Number": dal_id,
+                        "Name": self._names.get(dal_id, ''),
+                        "distance": distance,
+                        "gender": gender,
+                        "Place": str(place),
+                        "Gained": str(gain),
+                        "Time": "" if seconds < 0 else format_race_time(seconds),
+                    })
+                    if len(result) >= k:
+                        return result
+        return result
+
+    def snapshot(self, k: int = 10) -> Dict[str, Any]:
+        """Overlay output: {"window_minutes": N, "climbers": [...]}"""
+        return {"window_minutes": self.climb_window, "climbers": self.fastest_climbers(k)}
+
+
+_default_history: Optional[PositionHistory] = None
+_default_lock = threading.Lock()
+
+
+def get_position_history() -> PositionHistory:
+    """Process-wide position history fed by the summary and live handlers"""
+    global _default_history
+    with _default_lock:
+        if _default_history is None:
+            _default_history = PositionHistory()
+        return _default_history
@@ -0,0 +1,217 @@
+# src/api/profiling.py
+"""
+On-demand profiling of the poll loop. Arm the profiler from the GUI or with
+SIGUSR1 and it records the next N ticks, then writes cProfile stats, a
+collapsed-stack sampling profile (flamegraph.pl / speedscope ready), section
+timings and tracemalloc top allocations into output/profiles/.
+"""
+
+import cProfile
+import functools
+import io
+import logging
+import os
+import pstats
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class PollProfiler:
+    """Profiles sections (fetch_data, process_data, output writes) for the next N ticks once armed"""
+
+    def __init__(self, output_dir: str, sample_interval: float = 0.005):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.output_dir = output_dir
+        self.sample_interval = sample_interval
+        self.armed = False
+        self._lock = threading.Lock()
+        self._ticks_left = 0
+        self._mode = "cprofile"
+        self._stats: Optional[pstats.Stats] = None
+        self._timings: Dict[str, List[float]] = {}
+        self._stacks: Dict[str, int] = {}
+        self._active_threads: Dict[int, str] = {}
+        self._profiling_threads: set = set()
+        self._sampler: Optional[threading.Thread] = None
+
+    def arm(self, ticks: int = 5, mode: str = "cprofile", memory: bool = True) -> None:
+        """Profile the next `ticks` ticks; mode is 'cprofile' or 'sampling'"""
+        with self._lock:
+            if self.armed:
+                return
+            self._ticks_left = max(1, ticks)
+            self._mode = mode
+            self._stats = None
+            self._timings = {}
+            self._stacks = {}
+            self.armed = True
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start(25)
+        if mode == "sampling":
+            self._sampler = threading.Thread(target=self._sample_loop, name="poll-profiler-sampler", daemon=True)
+            self._sampler.start()
+        self.logger.info(f"Profiling armed for {ticks} tick(s), mode={mode}")
+
+    @contextmanager
+    def section(self, name: str):
+        """Time (and in cprofile mode, profile) the enclosed block when armed"""
+        if not self.armed:
+            yield
+            return
+
+        thread_id = threading.get_ident()
+        profile = None
+        if self._mode == "cprofile" and thread_id not in self._profiling_threads:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+                self._profiling_threads.add(thread_id)
+            except ValueError:  # another profiler already active
+                profile = None
+        # The sampler thread iterates _active_threads, so it only changes under the lock
+        with self._lock:
+            outer = self._active_threads.get(thread_id)
+            self._active_threads[thread_id] = name
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            if profile is not None:
+                profile.disable()
+                self._profiling_threads.discard(thread_id)
+            with self._lock:
+                if outer is None:
+                    self._active_threads.pop(thread_id, None)
+                else:
+                    self._active_threads[thread_id] = outer
+                self._timings.setdefault(name, []).append(elapsed)
+                if profile is not None:
+                    if self._stats is None:
+                        self._stats = pstats.Stats(profile)
+                    else:
+                        self._stats.add(profile)
+
+    def tick_done(self) -> None:
+        """Called at the end of every tick; dumps the reports after the last armed tick"""
+        if not self.armed:
+            return
+        with self._lock:
+            self._ticks_left -= 1
+            finished = self._ticks_left <= 0
+            if finished:
+                self.armed = False
+        if finished:
+            try:
+                path = self._dump()
+                self.logger.info(f"Profile written to {path}")
+            except Exception as e:
+                self.logger.error(f"Error writing profile: {str(e)}")
+
+    def _sample_loop(self) -> None:
+        while self.armed:
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, section in list(self._active_threads.items()):
+                    frame = frames.get(thread_id)
+                    if frame is None:
+                        continue
+                    stack = []
+                    while frame is not None:
+                        code = frame.f_code
+                        stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                        frame = frame.f_back
+                    key = ";".join([section] + stack[::-1])
+                    self._stacks[key] = self._stacks.get(key, 0) + 1
+            time.sleep(self.sample_interval)
+
+    def _dump(self) -> str:
+        if self._sampler is not None:
+            self._sampler.join(timeout=1)
+            self._sampler = None
+
+        profile_dir = os.path.join(self.output_dir, "profiles", datetime.now().strftime("%Y%m%d_%H%M%S"))
+        os.makedirs(profile_dir, exist_ok=True)
+
+        with self._lock:
+            timings = dict(self._timings)
+            stats = self._stats
+            stacks = dict(self._stacks)
+
+        with open(os.path.join(profile_dir, "sections.txt"), "w", encoding="utf-8") as f:
+            for name, samples in sorted(timings.items()):
+                samples = sorted(samples)
+                f.write(
+                    f"{name}: calls={len(samples)} total={sum(samples):.3f}s "
+                    f"median={samples[len(samples) // 2] * 1000:.1f}ms max={samples[-1] * 1000:.1f}ms\n"
+                )
+
+        if stats is not None:
+            stats.dump_stats(os.path.join(profile_dir, "cprofile.prof"))
+            text = io.StringIO()
+            stats.stream = text
+            stats.sort_stats("cumulative").print_stats(50)
+            with open(os.path.join(profile_dir, "cprofile.txt"), "w", encoding="utf-8") as f:
+                f.write(text.getvalue())
+
+        if stacks:
+            with open(os.path.join(profile_dir, "collapsed.txt"), "w", encoding="utf-8") as f:
+                for stack, count in sorted(stacks.items()):
+                    f.write(f"{stack} {count}\n")
+
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            with open(os.path.join(profile_dir, "tracemalloc.txt"), "w", encoding="utf-8") as f:
+                for stat in snapshot.statistics("lineno")[:25]:
+                    f.write(f"{stat}\n")
+
+        return profile_dir
+
+
+def profiled(section: str, tick: bool = False):
+    """Decorator that runs the function inside a profiler section; tick=True marks the end of a tick"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = get_profiler()
+            try:
+                with profiler.section(section):
+                    return func(*args, **kwargs)
+            finally:
+                if tick:
+                    profiler.tick_done()
+        return wrapper
+    return decorator
+
+
+_default_profiler: Optional[PollProfiler] = None
+_default_lock = threading.Lock()
+
+
+def get_profiler(output_dir: str = None) -> PollProfiler:
+    """Process-wide profiler writing into <output_dir>/profiles"""
+    global _default_profiler
+    with _default_lock:
+        if _default_profiler is None:
+            if output_dir is None:
+                output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'output')
+            _default_profiler = PollProfiler(output_dir)
+        return _default_profiler
+
+
+def install_signal_handler(ticks: int = 5) -> bool:
+    """Arm the profiler on SIGUSR1 (POSIX only); must be called from the main thread.
+
+    Python runs the handler only when the main thread next executes Python code; in the GUI the
+    event-loop lag heartbeat does so every 100 ms."""
+    if not hasattr(signal, "SIGUSR1"):
+        return False
+    signal.signal(signal.SIGUSR1, lambda signum, frame: get_profiler().arm(ticks))
+    return True
@@ -0,0 +1,250 @@
+# src/api/resilience.py
+"""
+Resilience layer shared by all API handlers: hedged requests, per-endpoint
+circuit breakers, jittered backoff, compressed transport over one pooled
+keep-alive session, and per-endpoint byte accounting (wire vs decoded).
+"""
+
+import random
+import threading
+import time
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import brotli  # noqa: F401  urllib3 decodes "br" responses when this is installed
+    ACCEPT_ENCODING = "br, gzip, deflate"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because its circuit breaker is open"""
+
+
+def jittered_backoff(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """Full-jitter exponential backoff delay in seconds for the given attempt (0-based)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """Simple closed/open/half-open breaker keyed to one endpoint"""
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False  # a half-open trial request is in flight
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Closed breakers let every request through, half-open ones a single trial request"""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self.probing = False
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class ResilientClient:
+    """HTTP GET client that hedges slow requests and trips breakers on repeated failures"""
+
+    def __init__(
+        self,
+        hedging: bool = True,
+        hedge_percentile: float = 0.95,
+        min_hedge_delay: float = 0.5,
+        timeout: float = 15.0,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        history_size: int = 200,
+        rate_window: float = 60.0,
+    ):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.hedging = hedging
+        self.hedge_percentile = hedge_percentile
+        self.min_hedge_delay = min_hedge_delay
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.history_size = history_size
+        self.rate_window = rate_window  # seconds of transfers used for wire_rate()
+
+        self._latencies: Dict[str, deque] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._stats = {"requests": 0, "hedges_fired": 0, "hedges_won": 0, "failures": 0, "rejected": 0}
+        self._bytes: Dict[str, Dict[str, int]] = {}  # endpoint -> responses/wire/decoded
+        self._transfers: deque = deque()  # (monotonic time, wire bytes) inside rate_window
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=20, thread_name_prefix="resilient-get")
+        # One keep-alive pool per host, sized for the executor, so TCP/TLS connections are reused
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def breaker(self, key: str) -> CircuitBreaker:
+        with self._lock:
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self._breakers[key]
+
+    def hedge_delay(self, key: str) -> Optional[float]:
+        """Observed latency percentile for this endpoint, or None until enough samples exist"""
+        with self._lock:
+            samples = sorted(self._latencies.get(key, ()))
+        if len(samples) < 10:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * self.hedge_percentile))
+        return max(self.min_hedge_delay, samples[index])
+
+    def _record_latency(self, key: str, seconds: float) -> None:
+        with self._lock:
+            if key not in self._latencies:
+                self._latencies[key] = deque(maxlen=self.history_size)
+            self._latencies[key].append(seconds)
+
+    def _record_primary_latency(self, key: str, future) -> None:
+        if future.exception() is None:
+            self._record_latency(key, future.result()[1])
+
+    def _record_bytes(self, key: str, response: requests.Response) -> None:
+        """Count wire (possibly compressed) and decoded body sizes; hedge losers count too"""
+        decoded = len(response.content)
+        wire = None
+        raw = getattr(response, 'raw', None)
+        if raw is not None and hasattr(raw, 'tell'):
+            try:
+                wire = raw.tell()  # urllib3: bytes pulled over the wire, before decoding
+            except Exception:
+                wire = None
+        if not wire:
+            length = response.headers.get('Content-Length') if response.headers else None
+            wire = int(length) if length and length.isdigit() else decoded
+        now = time.monotonic()
+        with self._lock:
+            counters = self._bytes.setdefault(key, {"responses": 0, "wire": 0, "decoded": 0})
+            counters["responses"] += 1
+            counters["wire"] += wire
+            counters["decoded"] += decoded
+            self._transfers.append((now, wire))
+            while self._transfers and self._transfers[0][0] < now - self.rate_window:
+                self._transfers.popleft()
+
+    def wire_rate(self) -> float:
+        """Average bytes/second received over the last rate_window seconds"""
+        now = time.monotonic()
+        with self._lock:
+            while self._transfers and self._transfers[0][0] < now - self.rate_window:
+                self._transfers.popleft()
+            total = sum(size for _, size in self._transfers)
+        return total / self.rate_window
+
+    def _timed_get(self, url: str, params: Dict[str, Any], key: str):
+        started = time.monotonic()
+        response = self.session.get(url, params=params, timeout=self.timeout, headers={"Accept-Encoding": ACCEPT_ENCODING})
+        response.raise_for_status()
+        self._record_bytes(key, response)
+        return response, time.monotonic() - started
+
+    def get(self, url: str, params: Dict[str, Any], key: str) -> requests.Response:
+        """GET url, hedging with a second request when the first exceeds the endpoint's p95"""
+        breaker = self.breaker(key)
+        if not breaker.allow():
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise CircuitOpenError(f"Circuit open for {key}")
+
+        with self._lock:
+            self._stats["requests"] += 1
+
+        primary = self._executor.submit(self._timed_get, url, params, key)
+        # The p95 must reflect the primary even when a hedge wins, or hedge delays drift ever lower
+        primary.add_done_callback(lambda future: self._record_primary_latency(key, future))
+        pending = {primary}
+        delay = self.hedge_delay(key) if self.hedging else None
+        if delay is not None:
+            done, _ = wait(pending, timeout=delay)
+            if not done:
+                hedge = self._executor.submit(self._timed_get, url, params, key)
+                pending.add(hedge)
+                with self._lock:
+                    self._stats["hedges_fired"] += 1
+
+        last_error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is not None:
+                    last_error = error
+                    continue
+                response, _ = future.result()
+                breaker.record_success()
+                if future is not primary:
+                    with self._lock:
+                        self._stats["hedges_won"] += 1
+                return response
+
+        breaker.record_failure()
+        with self._lock:
+            self._stats["failures"] += 1
+        raise last_error
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus hedge win rate, breaker states and byte counts per endpoint"""
+        with self._lock:
+            stats = dict(self._stats)
+            breakers = dict(self._breakers)
+            transfer = {key: dict(counters) for key, counters in self._bytes.items()}
+        fired = stats["hedges_fired"]
+        stats["hedge_win_rate"] = stats["hedges_won"] / fired if fired else 0.0
+        stats["breakers"] = {key: b.state for key, b in breakers.items()}
+        stats["bytes"] = transfer
+        stats["wire_bytes"] = sum(c["wire"] for c in transfer.values())
+        stats["decoded_bytes"] = sum(c["decoded"] for c in transfer.values())
+        stats["wire_rate"] = self.wire_rate()
+        return stats
+
+
+_default_client: Optional[ResilientClient] = None
+_default_lock = threading.Lock()
+
+
+def get_client() -> ResilientClient:
+    """Process-wide client shared by all handlers so breakers and latency history are common"""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = ResilientClient()
+        return _default_client
@@ -0,0 +1,105 @@
+# src/api/scheduler.py
+"""
+Deadline scheduler for the live poller. Each distance is on_air, standby or
+background; each class has its own freshness target. Due distances are
+fetched earliest-deadline-first within a global request budget, and when the
+budget can't cover everything that is due, on-air distances go first.
+"""
+
+import threading
+import time
+from typing import Dict, Callable, List, Optional
+
+PRIORITIES = ("on_air", "standby", "background")
+
+# Seconds between fetches per class; standby defaults to the handler's update_interval
+DEFAULT_TARGETS = {"on_air": 5.0, "standby": 30.0, "background": 120.0}
+
+
+class DeadlineScheduler:
+    """Per-distance deadlines plus a token bucket of requests per minute"""
+
+    def __init__(self, targets: Dict[str, float] = None, request_budget: float = 60.0,
+                 burst_seconds: float = 10.0, clock: Callable[[], float] = time.monotonic):
+        self.targets = dict(DEFAULT_TARGETS, **(targets or {}))
+        self.request_budget = request_budget  # requests per minute across all distances
+        self.burst_seconds = burst_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._priorities: Dict[str, str] = {}
+        self._last_fetch: Dict[str, float] = {}
+        self._tokens = self._capacity()
+        self._refilled_at = clock()
+
+    def _capacity(self) -> float:
+        return max(1.0, self.request_budget * self.burst_seconds / 60)
+
+    def set_priority(self, distance: str, priority: str) -> None:
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority '{priority}', expected one of {', '.join(PRIORITIES)}")
+        with self._lock:
+            previous = self._priorities.get(distance, "standby")
+            self._priorities[distance] = priority
+            if PRIORITIES.index(priority) < PRIORITIES.index(previous):
+                # Promoted (e.g. just put on air): refresh it on the next tick
+                self._last_fetch.pop(distance, None)
+
+    def priority(self, distance: str) -> str:
+        return self._priorities.get(distance, "standby")
+
+    def target(self, distance: str, stretch: float = 1.0) -> float:
+        """Freshness target; bandwidth stretch never slows the on-air class"""
+        priority = self.priority(distance)
+        return self.targets[priority] * (1.0 if priority == "on_air" else stretch)
+
+    def deadline(self, distance: str, stretch: float = 1.0) -> float:
+        last = self._last_fetch.get(distance)
+        return float("-inf") if last is None else last + self.target(distance, stretch)
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._capacity(), self._tokens + (now - self._refilled_at) * self.request_budget / 60)
+        self._refilled_at = now
+
+    def due(self, distances: List[str], stretch: float = 1.0) -> List[str]:
+        """Distances to fetch now, earliest deadline first, taking one budget token each"""
+        now = self.clock()
+        with self._lock:
+            self._refill(now)
+            due = sorted(
+                (d for d in distances if self.deadline(d, stretch) <= now),
+                key=lambda d: self.deadline(d, stretch)
+            )
+            allowed = int(self._tokens)
+            if len(due) > allowed:
+                # Not enough budget for everything due: higher classes first, then by deadline
+                due = sorted(due, key=lambda d: PRIORITIES.index(self.priority(d)))[:allowed]
+            self._tokens -= len(due)
+            return due
+
+    def mark_fetched(self, distance: str) -> None:
+        with self._lock:
+            self._last_fetch[distance] = self.clock()
+
+    def next_wakeup(self, distances: List[str], stretch: float = 1.0) -> float:
+        """Seconds until the next deadline, or until the budget has a token again if it is spent"""
+        now = self.clock()
+        with self._lock:
+            self._refill(now)
+            deadlines = [self.deadline(d, stretch) for d in distances]
+            token_wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) * 60 / self.request_budget
+        if not deadlines:
+            return self.targets["standby"]
+        return max(token_wait, min(deadlines) - now, 0.0)
+
+    def status(self, distances: List[str]) -> Dict[str, Dict[str, Optional[float]]]:
+        """{distance: {"priority", "age" (seconds since last fetch or None), "target"}} for the GUI"""
+        now = self.clock()
+        with self._lock:
+            return {
+                d: {
+                    "priority": self.priority(d),
+                    "age": None if d not in self._last_fetch else now - self._last_fetch[d],
+                    "target": self.target(d),
+                }
+                for d in distances
+            }
@@ -0,0 +1,195 @@
+# src/api/schema.py
+"""
+Schema-driven decoding of API rows. Each schema is compiled once into a plan
+of per-field converters and applied to whole responses; rows that fail
+validation go to a quarantine log instead of taking the distance down.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Callable, List, NamedTuple, Optional, Tuple
+
+from .teams import format_race_time
+
+
+class RowError(ValueError):
+    """Raised by a converter when a field can't be coerced"""
+
+
+def _to_id(value: Any) -> Any:
+    """Validated but returned as sent: decoded rows keep the API's id type (template slots use as_text)"""
+    if isinstance(value, bool):
+        raise RowError("dal_id is a boolean")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return value
+    raise RowError(f"dal_id {value!r} is not a number")
+
+
+def _to_str(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    raise RowError(f"expected text, got {type(value).__name__}")
+
+
+def _to_gender(value: Any) -> str:
+    return _to_str(value).strip().upper()
+
+
+def _to_time(value: Any) -> str:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return format_race_time(value)  # seconds
+    return _to_str(value).strip()
+
+
+def as_text(value: Any) -> str:
+    """Template slot text for a decoded field: '' when absent or None, str() otherwise"""
+    return str(value) if value is not None else ''
+
+
+CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    "id": _to_id,
+    "str": _to_str,
+    "gender": _to_gender,
+    "time": _to_time,
+}
+
+
+class Field(NamedTuple):
+    name: str
+    kind: str = "str"
+    required: bool = False
+
+
+class RowSchema:
+    """Validates and coerces rows of one API module; unknown and missing fields are left as sent"""
+
+    def __init__(self, module: str, fields: List[Field]):
+        self.module = module
+        self.fields = fields
+        # Compiled plan: (name, converter, required), resolved once
+        self._plan: Tuple[Tuple[str, Callable[[Any], Any], bool], ...] = tuple(
+            (f.name, CONVERTERS[f.kind], f.required) for f in fields
+        )
+
+    def decode_row(self, row: Any) -> Dict[str, Any]:
+        if not isinstance(row, dict):
+            raise RowError(f"row is {type(row).__name__}, not an object")
+        decoded = dict(row)
+        for name, convert, required in self._plan:
+            value = row.get(name)
+            if value is None or value == "":
+                if required:
+                    raise RowError(f"{name} is missing")
+            else:
+                try:
+                    decoded[name] = convert(value)
+                except RowError as e:
+                    raise RowError(f"{name}: {e}") from None
+        return decoded
+
+    def decode(self, rows: Any, context: str = "", quarantine: "Quarantine" = None) -> List[Dict[str, Any]]:
+        """Good rows in order; bad rows (or a non-list response) are quarantined"""
+        if not isinstance(rows, list):
+            if quarantine is not None:
+                quarantine.add(self.module, context, "response is not a list", rows)
+            return []
+        good = []
+        for row in rows:
+            try:
+                good.append(self.decode_row(row))
+            except RowError as e:
+                if quarantine is not None:
+                    quarantine.add(self.module, context, str(e), row)
+        return good
+
+
+RESULTS_POSMS = RowSchema("results_posms", [
+    Field("dal_id", "id", required=True),
+    Field("Name"),
+    Field("dzimums", "gender"),
+    Field("RaceTime", "time"),
+    Field("grupa"),
+    Field("full_name"),
+    Field("komanda"),
+    Field("skola"),
+])
+
+RESULTS_STARTLIST = RowSchema("results_startlist", [
+    Field("dal_id", "id", required=True),
+    Field("full_name"),
+    Field("dzimums", "gender"),
+    Field("grupa"),
+    Field("komanda"),
+    Field("skola"),
+])
+
+SCHEMAS: Dict[str, RowSchema] = {
+    RESULTS_POSMS.module: RESULTS_POSMS,
+    RESULTS_STARTLIST.module: RESULTS_STARTLIST,
+}
+
+
+class Quarantine:
+    """Append-only JSON-lines log of rejected rows, one file per module, deduplicated across ticks"""
+
+    def __init__(self, directory: str, max_bytes: int = 5 * 1024 * 1024, remember: int = 10000):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.remember = remember
+        self._lock = threading.Lock()
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._counts: Dict[str, int] = {}
+
+    def add(self, module: str, context: str, reason: str, row: Any) -> None:
+        try:
+            row_json = json.dumps(row, ensure_ascii=False, sort_keys=True, default=str)
+        except Exception:
+            row_json = json.dumps(repr(row))
+        fingerprint = f"{module}|{context}|{reason}|{row_json}"
+        with self._lock:
+            self._counts[module] = self._counts.get(module, 0) + 1
+            if fingerprint in self._seen:
+                return  # the same bad row comes back every tick; log it once
+            self._seen[fingerprint] = None
+            if len(self._seen) > self.remember:
+                self._seen.popitem(last=False)
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                path = os.path.join(self.directory, f"{module}.jsonl")
+                if os.path.exists(path) and os.path.getsize(path) > self.max_bytes:
+                    os.replace(path, path + ".1")
+                with open(path, 'a', encoding='utf-8') as f:
+                    f.write(f'{{"time": {time.time():.3f}, "context": {json.dumps(context)}, '
+                            f'"reason": {json.dumps(reason, ensure_ascii=False)}, "row": {row_json}}}\n')
+            except Exception as e:
+                self.logger.error(f"Error writing quarantine log: {str(e)}")
+        self.logger.warning(f"Quarantined {module} row ({context}): {reason}")
+
+    def stats(self) -> Dict[str, int]:
+        """Rejected rows per module since start (repeats included)"""
+        with self._lock:
+            return dict(self._counts)
+
+
+_default_quarantine: Optional[Quarantine] = None
+_default_lock = threading.Lock()
+
+
+def get_quarantine(output_dir: str) -> Quarantine:
+    """Process-wide quarantine writing into <output_dir>/quarantine"""
+    global _default_quarantine
+    with _default_lock:
+        if _default_quarantine is None:
+            _default_quarantine = Quarantine(os.path.join(output_dir, 'quarantine'))
+        return _default_quarantine
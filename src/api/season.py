@@ -0,0 +1,221 @@
+from .base import BaseAPIHandler
+from .profiling import profiled
+from .output_queue import output_batch
+from .teams import parse_race_time, format_race_time
+from .analytics import get_analytics
+from typing import Dict, Any, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import os
+import json
+
+class SeasonAPI(BaseAPIHandler):
+    """Season-cumulative standings: finished posmi come from a permanent disk cache, only the current one is fetched live"""
+    BASE_URL = "https://www.stirnubuks.lv/api/"
+
+    def __init__(self, posmi: List[str], current_posms: str, distances: List[str], auth_token: str, test_mode: bool = False, output_formats: Dict[str, List[str]] = None):
+        super().__init__()
+        self.posmi = [p for p in posmi if p]  # Season order
+        self.posms = current_posms
+        self.distances = distances
+        self.AUTH_TOKEN = auth_token
+        self.test_mode = test_mode
+        self.output_formats = output_formats or {}
+        self.cache_dir = self._season_cache_dir()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        get_analytics(self.cache_dir).season_order = list(self.posmi)
+        # Per-distance totals from finished posmi, merged once and reused every tick
+        self._base_totals: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._base_stages: Tuple[str, ...] = ()
+        self._partial_totals: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.last_result: Dict[str, List[Dict[str, str]]] = {}  # season_standings from the last process_data call
+
+    def finished_posmi(self) -> List[str]:
+        """Posmi before the current one in season order; their results no longer change.
+
+        Empty when the current posms is empty or unknown: no stage is known to be over."""
+        if self.posms not in self.posmi:
+            return []
+        return self.posmi[:self.posmi.index(self.posms)]
+
+    def _translate_gender(self, dzimums: str) -> str:
+        gender_map = {
+            'S': 'Sievietes',
+            'V': 'Vīrieši'
+        }
+        return gender_map.get(dzimums, dzimums)
+
+    def _fetch_stage(self, posms: str, distance: str) -> List[Dict[str, Any]]:
+        params = {
+            "module": "results_posms",
+            "auth_token": self.AUTH_TOKEN,
+            "distance": distance,
+            "posms": posms
+        }
+        if self.test_mode:
+            params["gads"] = "2024"
+        try:
+            rows = self._fetch_json(params, key=f"results_posms:{distance}")
+            return rows if isinstance(rows, list) else []
+        except Exception as e:
+            self.logger.error(f"Error fetching season stage {posms}/{distance}: {str(e)}")
+            return []
+
+    def _cached_stage(self, posms: str, distance: str) -> List[Dict[str, Any]]:
+        """Finished stage results, downloaded once and then always read from disk"""
+        if posms not in self.finished_posmi():
+            # Never cache a stage that may still be running
+            return self._fetch_stage(posms, distance)
+        path = os.path.join(self.cache_dir, f"{posms}_{distance}.json")
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        rows = self._fetch_stage(posms, distance)
+        if rows:
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(rows, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            # Analytics reads the cache only at start-up, so hand the new stage over directly
+            get_analytics(self.cache_dir).load_stage(posms, distance, rows)
+        return rows
+
+    @profiled("fetch_data")
+    def fetch_data(self) -> Dict[str, Any]:
+        """Fetch the current posms live; finished posmi only on a cold cache"""
+        finished = tuple(self.finished_posmi())
+        if finished != self._base_stages:
+            self._base_totals = {}
+            self._base_stages = finished
+        self._partial_totals = {}
+
+        missing = [d for d in self.distances if d not in self._base_totals]
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            stage_futures = {
+                (posms, distance): executor.submit(self._cached_stage, posms, distance)
+                for distance in missing
+                for posms in finished
+            }
+            live_futures = {}
+            if self.posms:
+                live_futures = {
+                    distance: executor.submit(self._fetch_stage, self.posms, distance)
+                    for distance in self.distances
+                }
+
+        for distance in missing:
+            totals: Dict[str, Dict[str, Any]] = {}
+            complete = True
+            for posms in finished:
+                rows = stage_futures[(posms, distance)].result()
+                complete = complete and bool(rows)
+                self._add_stage(totals, posms, rows)
+            if complete:
+                self._base_totals[distance] = totals
+            else:
+                # Retry the missing stage next tick; use what we have for now
+                self._partial_totals[distance] = totals
+
+        return {distance: future.result() for distance, future in live_futures.items()}
+
+    def _stage_points(self, rows: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], float, float]]:
+        """(row, seconds, points) per finisher; points = 1000 * gender winner's time / own time"""
+        finishers = []
+        for row in rows:
+            if not isinstance(row, dict) or row.get('dal_id') in (None, ''):
+                continue
+            seconds = parse_race_time(row.get('RaceTime'))
+            if seconds:
+                finishers.append((row, seconds))
+
+        best: Dict[str, float] = {}
+        for row, seconds in finishers:
+            gender = row.get('dzimums', '')
+            best[gender] = min(best.get(gender, seconds), seconds)
+        return [(row, seconds, 1000.0 * best[row.get('dzimums', '')] / seconds) for row, seconds in finishers]
+
+    def _add_stage(self, totals: Dict[str, Dict[str, Any]], posms: str, rows: List[Dict[str, Any]]) -> None:
+        for row, seconds, points in self._stage_points(rows):
+            dal_id = str(row['dal_id'])
+            athlete = totals.get(dal_id)
+            if athlete is None:
+                athlete = totals[dal_id] = {
+                    'name': row.get('Name', ''),
+                    'gender': self._translate_gender(row.get('dzimums', '')),
+                    'points': 0.0,
+                    'seconds': 0.0,
+                    'stages': [],
+                }
+            else:
+                # Copy so the cached base totals are never mutated by live merges
+                athlete = totals[dal_id] = dict(athlete, stages=list(athlete['stages']))
+            athlete['points'] += points
+            athlete['seconds'] += seconds
+            athlete['stages'].append(posms)
+            if row.get('Name'):
+                athlete['name'] = row['Name']
+
+    @profiled("process_data", tick=True)
+    @output_batch
+    def process_data(self, all_data: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, str]]]:
+        """Merge the live posms onto the cached season totals and write season_standings"""
+        result = {}
+        base_totals = {**self._partial_totals, **self._base_totals}
+        for distance in sorted(base_totals):
+            totals = dict(base_totals[distance])
+            if distance in all_data:
+                self._add_stage(totals, self.posms, all_data[distance])
+
+            ranked = sorted(
+                totals.items(),
+                key=lambda item: (item[1]['gender'], -item[1]['points'], item[1]['seconds'])
+            )
+            rows = []
+            positions: Dict[str, int] = {}
+            for dal_id, athlete in ranked:
+                positions[athlete['gender']] = positions.get(athlete['gender'], 0) + 1
+                rows.append({
+                    'Position': str(positions[athlete['gender']]),
+                    'Number': dal_id,
+                    'Name': athlete['name'],
+                    'Gender': athlete['gender'],
+                    'Points': str(round(athlete['points'])),
+                    'Laiks': format_race_time(athlete['seconds']),
+                    'Stages': str(len(athlete['stages'])),
+                })
+            result[distance] = rows
+
+        self.last_result = result
+        self.write_output(result, "season_standings")
+        self._update_analytics(all_data)
+        return result
+
+    def preview_groups(self) -> List[Dict[str, str]]:
+        """last_result as group/gender slot objects (Name{i}, Number{i}, ...) for the results preview"""
+        groups = []
+        for distance, rows in self.last_result.items():
+            by_gender: Dict[str, Dict[str, str]] = {}
+            for row in rows:
+                group = by_gender.setdefault(row['Gender'], {'group': distance, 'gender': row['Gender']})
+                i = int(row['Position'])
+                group[f'Name{i}'] = row['Name']
+                group[f'Number{i}'] = row['Number']
+                group[f'Time{i}'] = row['Laiks']
+                group[f'StartaNr{i}'] = row['Position']
+            groups.extend(by_gender.values())
+        return groups
+
+    def fetch_and_process(self) -> bool:
+        """Single fetch and process operation"""
+        if self.posms not in self.posmi:
+            self.logger.error(f"Season standings need a posms from the season, got '{self.posms}'")
+            return False
+        try:
+            all_data = self.fetch_data()
+            if not self._base_totals and not self._partial_totals and not all_data:
+                return False
+            self.process_data(all_data)
+            self.logger.info("Season standings updated successfully")
+            return True
+        except Exception as e:
+            self.logger.error(f"Error fetching season standings: {str(e)}")
+            return False
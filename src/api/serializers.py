@@ -0,0 +1,154 @@
+# src/api/serializers.py
+"""
+Serializer registry for handler outputs: pretty/compact JSON (orjson when
+installed), CSV and vMix-style XML data sources.
+"""
+
+import csv
+import io
+import json
+import os
+import re
+from typing import Any, Callable, Dict, List, Tuple
+from xml.sax.saxutils import escape
+
+try:
+    import orjson
+except ImportError:  # optional fast path
+    orjson = None
+
+
+DEFAULT_FORMATS = ["json"]
+
+_SERIALIZERS: Dict[str, Dict[str, Any]] = {}
+
+
+def register_serializer(name: str, extension: str, func: Callable[[Any], bytes]) -> None:
+    """Register a serializer; func turns the output data into bytes"""
+    _SERIALIZERS[name] = {"extension": extension, "func": func}
+
+
+def available_formats() -> List[str]:
+    return sorted(_SERIALIZERS)
+
+
+def serialize(data: Any, fmt: str) -> bytes:
+    if fmt not in _SERIALIZERS:
+        raise ValueError(f"Unknown output format '{fmt}', available: {', '.join(available_formats())}")
+    return _SERIALIZERS[fmt]["func"](data)
+
+
+def extension_for(fmt: str) -> str:
+    return _SERIALIZERS[fmt]["extension"]
+
+
+def conflicting_formats(formats: List[str]) -> List[str]:
+    """Formats that would write the same file as an earlier one in the list (json vs json_compact)"""
+    seen = set()
+    conflicts = []
+    for fmt in formats:
+        extension = extension_for(fmt)
+        if extension in seen:
+            conflicts.append(fmt)
+        seen.add(extension)
+    return conflicts
+
+
+def _rows(data: Any) -> List[Dict[str, Any]]:
+    """Flatten handler output shapes into a list of flat dicts for tabular formats"""
+    if isinstance(data, dict) and set(data) == {"teams"}:
+        data = data["teams"]
+    if isinstance(data, list):
+        return [row for row in data if isinstance(row, dict)]
+    if isinstance(data, dict):
+        # {distance: [rows]} as written by the live results handler
+        rows = []
+        for key, value in data.items():
+            if isinstance(value, list):
+                rows.extend({"distance": key, **row} for row in value if isinstance(row, dict))
+        return rows
+    return []
+
+
+def _columns(rows: List[Dict[str, Any]]) -> List[str]:
+    columns: Dict[str, None] = {}
+    for row in rows:
+        for key in row:
+            columns.setdefault(key, None)
+    return list(columns)
+
+
+def _json_pretty(data: Any) -> bytes:
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _json_compact(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _csv(data: Any) -> bytes:
+    rows = _rows(data)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=_columns(rows), extrasaction="ignore")
+    writer.writeheader()
+    writer.writerows(rows)
+    # BOM so Excel and mixers detect UTF-8 (Latvian diacritics)
+    return buffer.getvalue().encode("utf-8-sig")
+
+
+_TAG_RE = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def _tag(name: str) -> str:
+    tag = _TAG_RE.sub("_", str(name))
+    return tag if tag and (tag[0].isalpha() or tag[0] == "_") else f"_{tag}"
+
+
+def _vmix_xml(data: Any) -> bytes:
+    """<data><row><Name1>..</Name1>...</row>...</data>, addressable as /data/row[n]/Name1"""
+    parts = ['<?xml version="1.0" encoding="utf-8"?>', "<data>"]
+    for row in _rows(data):
+        parts.append("<row>")
+        for key, value in row.items():
+            tag = _tag(key)
+            text = "" if value is None else escape(str(value))
+            parts.append(f"<{tag}>{text}</{tag}>")
+        parts.append("</row>")
+    parts.append("</data>")
+    return "".join(parts).encode("utf-8")
+
+
+register_serializer("json", ".json", _json_pretty)
+register_serializer("json_compact", ".json", _json_compact)
+register_serializer("csv", ".csv", _csv)
+register_serializer("vmix_xml", ".xml", _vmix_xml)
+
+
+def render_outputs(name: str, data: Any, formats: List[str] = None) -> List[Tuple[str, bytes]]:
+    """Serialize data once per format; returns (filename, payload) pairs"""
+    formats = formats or DEFAULT_FORMATS
+    conflicts = conflicting_formats(formats)
+    if conflicts:
+        raise ValueError(f"Formats {', '.join(formats)} for {name} write the same file, drop {', '.join(conflicts)}")
+    return [(name + extension_for(fmt), serialize(data, fmt)) for fmt in formats]
+
+
+def write_file(path: str, payload: bytes) -> None:
+    """Write to a temp file and swap so readers never see a half-written file"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def write_output(output_dir: str, name: str, data: Any, formats: List[str] = None) -> List[str]:
+    """Write data as output_dir/name.<ext> in each format; returns the written paths"""
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for filename, payload in render_outputs(name, data, formats):
+        path = os.path.join(output_dir, filename)
+        write_file(path, payload)
+        paths.append(path)
+    return paths
@@ -0,0 +1,185 @@
+# src/api/shared_state.py
+"""
+Memory-mapped latest-state channel for graphics software on the same machine.
+
+Each published output (e.g. summary_results) gets one mapped file holding a
+header and two payload slots. The writer fills the inactive slot, then flips
+the active slot under a sequence counter (odd while publishing). Readers copy
+the active slot and retry if the counter moved, so they never see a torn
+payload and never open a file after the first mapping.
+
+Only the standard library is used here, so the reader half can be copied into
+consumer scripts as-is:
+
+    reader = SharedStateReader("summary_results")
+    seq, data = reader.wait_for_change(0)
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+MAGIC = b"SBST"
+VERSION = 1
+# magic, version, reserved, slot capacity, sequence, active slot, payload length, payload crc32
+HEADER = struct.Struct("<4sHHIQIII")
+HEADER_SIZE = 64
+SEQ_OFFSET = 12
+DEFAULT_CAPACITY = 4 * 1024 * 1024
+
+
+def shared_state_dir() -> str:
+    """/dev/shm when available (RAM-backed), otherwise the temp directory"""
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "stirnubuks-state")
+
+
+def state_path(name: str, directory: str = None) -> str:
+    return os.path.join(directory or shared_state_dir(), f"{name}.state")
+
+
+class SharedStateWriter:
+    """Single writer for one output's mapped file"""
+
+    def __init__(self, name: str, capacity: int = DEFAULT_CAPACITY, directory: str = None):
+        self.name = name
+        self.capacity = capacity
+        self.path = state_path(name, directory)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        size = HEADER_SIZE + 2 * capacity
+        # Reuse an existing file of the right size so mapped readers keep working across restarts
+        if not os.path.exists(self.path) or os.path.getsize(self.path) != size:
+            with open(self.path, "wb") as f:
+                f.truncate(size)
+        self._file = open(self.path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), size)
+        magic, version, _, capacity_found, seq, active, length, crc = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or capacity_found != capacity:
+            seq, active, length, crc = 0, 0, 0, 0
+        self._seq = seq + (seq & 1)  # an interrupted publish leaves an odd counter
+        self._active = active
+        HEADER.pack_into(self._map, 0, MAGIC, VERSION, 0, capacity, self._seq, active, length, crc)
+        self._lock = threading.Lock()
+
+    def publish(self, payload: bytes) -> bool:
+        """Make payload the latest state; False if it doesn't fit the slot capacity"""
+        if len(payload) > self.capacity:
+            return False
+        with self._lock:
+            target = 1 - self._active
+            offset = HEADER_SIZE + target * self.capacity
+            self._map[offset:offset + len(payload)] = payload
+            crc = zlib.crc32(payload)
+            self._seq += 1
+            struct.pack_into("<Q", self._map, SEQ_OFFSET, self._seq)
+            HEADER.pack_into(self._map, 0, MAGIC, VERSION, 0, self.capacity, self._seq, target, len(payload), crc)
+            self._seq += 1
+            struct.pack_into("<Q", self._map, SEQ_OFFSET, self._seq)
+            self._active = target
+        return True
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+
+class SharedStateReader:
+    """Reads the latest payload of one output without file opens or torn reads"""
+
+    def __init__(self, name: str, directory: str = None):
+        self.path = state_path(name, directory)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.capacity, *_ = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a shared state file")
+
+    def sequence(self) -> int:
+        """Even publish counter; grows by 2 per published state"""
+        return struct.unpack_from("<Q", self._map, SEQ_OFFSET)[0]
+
+    def read(self, retries: int = 1000) -> Tuple[int, bytes]:
+        """(sequence, payload) of the latest complete state; sequence 0 means nothing published yet"""
+        for _ in range(retries):
+            _, _, _, _, seq, active, length, crc = HEADER.unpack_from(self._map, 0)
+            if seq & 1 or length > self.capacity:
+                time.sleep(0)
+                continue
+            offset = HEADER_SIZE + active * self.capacity
+            payload = self._map[offset:offset + length]
+            if self.sequence() == seq and zlib.crc32(payload) == crc:
+                return seq, payload
+        raise TimeoutError(f"No consistent read of {self.path} after {retries} attempts")
+
+    def read_json(self) -> Tuple[int, Any]:
+        seq, payload = self.read()
+        return seq, json.loads(payload) if payload else None
+
+    def wait_for_change(self, last_seq: int, timeout: float = None, poll: float = 0.005) -> Tuple[int, Any]:
+        """Block until the sequence differs from last_seq, then return (sequence, decoded JSON)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.sequence() in (last_seq, last_seq + 1):
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"No new state in {self.path} within {timeout} s")
+            time.sleep(poll)
+        return self.read_json()
+
+    def close(self) -> None:
+        self._map.close()
+
+
+class SharedStatePublisher:
+    """Publishes selected outputs as compact JSON; a no-op for outputs not enabled"""
+
+    def __init__(self, directory: str = None, capacity: int = DEFAULT_CAPACITY):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.directory = directory
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._enabled: frozenset = frozenset()
+        self._writers: Dict[str, SharedStateWriter] = {}
+
+    def set_outputs(self, names: Iterable[str]) -> None:
+        """Choose which output names are mirrored into shared memory"""
+        self._enabled = frozenset(names)
+
+    @property
+    def outputs(self) -> frozenset:
+        return self._enabled
+
+    def publish(self, name: str, data: Any) -> bool:
+        if name not in self._enabled:
+            return False
+        try:
+            payload = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            with self._lock:
+                writer = self._writers.get(name)
+                if writer is None:
+                    writer = self._writers[name] = SharedStateWriter(name, self.capacity, self.directory)
+            if not writer.publish(payload):
+                self.logger.error(f"{name} state is {len(payload)} bytes, over the {self.capacity} byte slot")
+                return False
+            return True
+        except Exception as e:
+            self.logger.error(f"Error publishing {name} to shared memory: {str(e)}")
+            return False
+
+
+_default_publisher: Optional[SharedStatePublisher] = None
+_default_lock = threading.Lock()
+
+
+def get_shared_state() -> SharedStatePublisher:
+    """Process-wide publisher used by the handlers' output stage"""
+    global _default_publisher
+    with _default_lock:
+        if _default_publisher is None:
+            _default_publisher = SharedStatePublisher()
+        return _default_publisher
@@ -0,0 +1,93 @@
+# src/api/singleflight.py
+"""
+Request coalescing: concurrent identical calls share one in-flight fetch, and
+the decoded result is reused for a short window to absorb repeated clicks.
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class SingleFlight:
+    """Runs fn once per key at a time; callers arriving meanwhile wait for the same result"""
+
+    def __init__(self, window: float = 2.0, prefetch_window: float = 30.0):
+        self.window = window
+        self.prefetch_window = prefetch_window
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._recent: Dict[Hashable, Tuple[float, Any, bool]] = {}  # key -> (expires at, result, prefetched)
+        self._stats = {"calls": 0, "executed": 0, "coalesced": 0, "cached": 0, "prefetch_hits": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any], ttl: float = None, prefetch: bool = False) -> Any:
+        """Return fn()'s result for key; results are shared and must be treated as read-only.
+
+        ttl overrides how long a fresh result is reused. Results of prefetch calls (warm-up) stay
+        for prefetch_window and are handed to the first interactive call only; later interactive
+        calls fetch fresh. An interactive call can also join a prefetch that is in flight."""
+        with self._lock:
+            self._stats["calls"] += 1
+            recent = self._recent.get(key)
+            if recent is not None and time.monotonic() < recent[0]:
+                if recent[2] and not prefetch:
+                    del self._recent[key]  # consumed by the first real action
+                    self._stats["prefetch_hits"] += 1
+                else:
+                    self._stats["cached"] += 1
+                return recent[1]
+
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+                self._stats["executed"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._in_flight[key]
+            window = self.prefetch_window if prefetch else (self.window if ttl is None else ttl)
+            self._recent[key] = (time.monotonic() + window, result, prefetch)
+            self._prune()
+        future.set_result(result)
+        return result
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, (expires, _, _) in self._recent.items() if now >= expires]:
+            del self._recent[key]
+
+    def forget(self, key: Hashable) -> None:
+        """Drop the micro-cached result for key so the next call fetches fresh"""
+        with self._lock:
+            self._recent.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+
+_default_flight: Optional[SingleFlight] = None
+_default_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """Process-wide coalescing layer shared by the GUI actions and pollers"""
+    global _default_flight
+    with _default_lock:
+        if _default_flight is None:
+            _default_flight = SingleFlight()
+        return _default_flight
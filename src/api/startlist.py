@@ -1,4 +1,8 @@
 from .base import BaseAPIHandler
+from .profiling import profiled
+from .output_queue import output_batch
+from .config_store import ConfigStore
+from .schema import as_text
 from typing import Dict, Any, List, Tuple
 import requests
 import logging
@@ -9,13 +13,18 @@ import json
 class StartListAPI(BaseAPIHandler):
     BASE_URL = "https://www.stirnubuks.lv/api/"
     
-    def __init__(self, posms: str, distances: List[str], auth_token: str, test_mode: bool = False, group_configs: Dict[str, Dict[str, Any]] = None):
+    def __init__(self, posms: str, distances: List[str], auth_token: str, test_mode: bool = False, group_configs: Dict[str, Dict[str, Any]] = None, output_formats: Dict[str, List[str]] = None, config_store: ConfigStore = None):
         super().__init__()
         self.posms = posms
         self.distances = distances  # Now accepts a list of distances
         self.AUTH_TOKEN = auth_token
         self.test_mode = test_mode
-        self.group_configs = group_configs or {}  # Dictionary to store custom group names and image links
+        # Custom group names and image links, read from a snapshot once per tick
+        self.config = config_store or ConfigStore(group_configs)
+        self.output_formats = output_formats or {}
+        self.last_result: List[Dict[str, Any]] = []  # Group objects from the last process_data call
+        # (distance, gender) -> (fingerprint, rendered group object)
+        self._rendered: Dict[Tuple[str, str], Tuple[tuple, Dict[str, Any]]] = {}
         
     def _translate_gender(self, dzimums: str) -> str:
         """Translate gender code to full Latvian words"""
@@ -44,16 +53,16 @@ class StartListAPI(BaseAPIHandler):
         # Print API request details
         print(f"\nAPI Request for distance {distance}:")
         print(f"URL: {self.BASE_URL}")
-        print(f"Parameters: {params}")
+        shown_params = {k: v for k, v in params.items() if k != "auth_token"}  # never log the token
+        print(f"Parameters: {shown_params}")
             
         try:
-            response = requests.get(self.BASE_URL, params=params)
-            response.raise_for_status()
-            return distance, response.json()
+            return distance, self._fetch_json(params, key=f"results_startlist:{distance}")
         except Exception as e:
             self.logger.error(f"Error fetching data for distance {distance}: {str(e)}")
             return distance, []
 
+    @profiled("fetch_data")
     def fetch_data(self) -> Dict[str, List[Dict[str, Any]]]:
         """Fetch data for all distances concurrently"""
         all_data = {}
@@ -71,17 +80,54 @@ class StartListAPI(BaseAPIHandler):
                 distance, data = future.result()
                 if data:  # Only add if we got valid data
                     all_data[distance] = data
+                    self.index.update('startlist', distance, data)
+                    self.join.store(self._join_key(distance), data)
         
         return all_data
 
-    def process_data(self, all_data: Dict[str, List[Dict[str, Any]]]) -> None:
-        """Process all fetched data into the required format"""
+    def _render_group(self, group_key: str, group_config, gender: str, gender_participants: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the 60-slot object for one distance+gender"""
+        custom_name = group_config.get('name', group_key)
+        image_path = group_config.get('image', '')
+        
+        # Create a single object for all participants in this distance+gender
+        group_data = {
+            'Group1': custom_name,
+            'Gender1': gender
+        }
+        
+        # Add up to 60 participants per group
+        for i in range(1, 61):
+            if i <= len(gender_participants):
+                participant = gender_participants[i-1]
+                # Schema rows keep the API's types (int dal_id, absent/None fields); templates need strings
+                group_data[f'Name{i}'] = as_text(participant.get('full_name'))
+                group_data[f'Image{i}'] = image_path
+                group_data[f'Number{i}'] = as_text(participant.get('dal_id'))
+                group_data[f'Subgroup{i}'] = as_text(participant.get('grupa'))
+                # Add sequential start number with dot
+                group_data[f'StartaNr{i}'] = f"{i}"
+            else:
+                # Fill empty slots if we don't have enough participants
+                group_data[f'Name{i}'] = ''
+                group_data[f'Image{i}'] = ''
+                group_data[f'Number{i}'] = ''
+                group_data[f'Subgroup{i}'] = ''
+                group_data[f'StartaNr{i}'] = ''
+        return group_data
+
+    @profiled("process_data", tick=True)
+    @output_batch
+    def process_data(self, all_data: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Process all fetched data into the required format and return the group objects"""
         if not all_data:
             self.logger.warning("No data to process")
-            return
+            return []
 
         result = []
         total_participants = 0
+        config = self.config.snapshot()
+        rendered = {}
         
         # Sort distances to ensure consistent order
         sorted_distances = sorted(all_data.keys())
@@ -110,43 +156,29 @@ class StartListAPI(BaseAPIHandler):
                     
                     # Get custom group name and image link from config if available
                     group_key = str(f"{distance}_{gender}")
-                    group_config = self.group_configs.get(group_key, {})
-                    custom_name = group_config.get('name', group_key)
-                    image_path = group_config.get('image', '')
-                    
-                    # Create a single object for all participants in this distance+gender
-                    group_data = {
-                        'Group1': custom_name,
-                        'Gender1': gender
-                    }
-                    
-                    # Add up to 60 participants per group
-                    for i in range(1, 61):
-                        if i <= len(gender_participants):
-                            participant = gender_participants[i-1]
-                            group_data[f'Name{i}'] = str(participant.get('full_name', ''))
-                            group_data[f'Image{i}'] = image_path
-                            group_data[f'Number{i}'] = str(participant.get('dal_id', ''))
-                            group_data[f'Subgroup{i}'] = str(participant.get('grupa', ''))
-                            # Add sequential start number with dot
-                            group_data[f'StartaNr{i}'] = f"{i}"
-                        else:
-                            # Fill empty slots if we don't have enough participants
-                            group_data[f'Name{i}'] = ''
-                            group_data[f'Image{i}'] = ''
-                            group_data[f'Number{i}'] = ''
-                            group_data[f'Subgroup{i}'] = ''
-                            group_data[f'StartaNr{i}'] = ''
+                    group_config = config.group_configs.get(group_key, {})
                     
+                    # Only re-render groups whose participants or config changed since the last call
+                    render_key = (distance, gender)
+                    fingerprint = (
+                        config.group_version(group_key, distance),
+                        tuple(
+                            (p.get('full_name'), p.get('dal_id'), p.get('grupa'))
+                            for p in gender_participants[:60]
+                        )
+                    )
+                    cached = self._rendered.get(render_key)
+                    if cached is not None and cached[0] == fingerprint:
+                        group_data = cached[1]
+                    else:
+                        group_data = self._render_group(group_key, group_config, gender, gender_participants)
+                    rendered[render_key] = (fingerprint, group_data)
                     result.append(group_data)
 
+        self._rendered = rendered
         print(f"\nTotal participants processed and saved to JSON: {total_participants}")
         
-        try:
-            os.makedirs(self.output_dir, exist_ok=True)
-            filepath = os.path.join(self.output_dir, "all_participants.json")
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump({"teams": result}, f, ensure_ascii=False, indent=2)
-            
-        except Exception as e:
-            self.logger.error(f"Error in save/verify process: {str(e)}")
\ No newline at end of file
+        self.write_output({"teams": result}, "all_participants")
+
+        self.last_result = result
+        return result
\ No newline at end of file
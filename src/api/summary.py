@@ -1,31 +1,49 @@
 from .base import BaseAPIHandler
+from .profiling import profiled
+from .output_queue import output_batch
+from .config_store import ConfigStore
+from .schema import as_text
 from typing import Dict, Any, List, Tuple
 import requests
 import logging
 from datetime import datetime
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
 import json
 
 class SummaryAPI(BaseAPIHandler):  # Renamed from LiveResultsAPI to SummaryAPI
     BASE_URL = "https://www.stirnubuks.lv/api/"
     
-    def __init__(self, posms: str, distances: List[str], auth_token: str, test_mode: bool = False, group_configs: Dict[str, Dict[str, Any]] = None):
+    def __init__(self, posms: str, distances: List[str], auth_token: str, test_mode: bool = False, group_configs: Dict[str, Dict[str, Any]] = None, output_formats: Dict[str, List[str]] = None, distance_configs: Dict[str, Dict[str, Any]] = None, config_store: ConfigStore = None):
         super().__init__()
         self.posms = posms
         self.distances = distances
         self.AUTH_TOKEN = auth_token
         self.test_mode = test_mode
-        self.group_configs = group_configs or {}
+        # Group names/images and per-distance group_by are read from a snapshot once per tick
+        self.config = config_store or ConfigStore(group_configs, distance_configs)
+        self.output_formats = output_formats or {}
+        self.last_result: List[Dict[str, Any]] = []
+        # (distance, gender, grupa) -> (fingerprint, rendered group object)
+        self._rendered: Dict[Tuple[str, str, str], Tuple[tuple, Dict[str, Any]]] = {}
 
+    @profiled("fetch_data")
     def fetch_data(self) -> Dict[str, Any]:
         """Implementation of abstract method from BaseAPIHandler"""
         all_data = {}
-        for distance in self.distances:
-            distance_name, data = self._fetch_single_distance(distance)
-            if data:
-                all_data[distance_name] = data
+        if not self.distances:
+            return all_data
+
+        # Fetch distances concurrently so one slow response doesn't stall the others
+        with ThreadPoolExecutor(max_workers=min(len(self.distances), 10)) as executor:
+            futures = [executor.submit(self._fetch_single_distance, distance) for distance in self.distances]
+            for future in as_completed(futures):
+                distance_name, data = future.result()
+                if data:
+                    all_data[distance_name] = data
+                    self.index.update('results', distance_name, data)
         return all_data
 
     def _translate_gender(self, dzimums: str) -> str:
@@ -35,6 +53,48 @@ class SummaryAPI(BaseAPIHandler):  # Renamed from LiveResultsAPI to SummaryAPI
         }
         return gender_map.get(dzimums, dzimums)
 
+    def _split_by_class(self, distance: str, participants: List[Dict[str, Any]], distance_configs) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """Split a gender group by start-list class (grupa) when the distance is configured for classgroups"""
+        if distance_configs.get(distance, {}).get('group_by') != 'classgroups':
+            return [('', participants)]
+        classes: Dict[str, List[Dict[str, Any]]] = {}
+        for participant in participants:
+            classes.setdefault(str(participant.get('grupa', '') or ''), []).append(participant)
+        return sorted(classes.items())
+
+    def _render_group(self, group_key: str, group_config, gender: str, grupa: str, gender_participants: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the 60-slot object for one distance+gender(+class group)"""
+        custom_name = group_config.get('name', group_key)
+        image_path = group_config.get('image', '')
+        group_data = {
+            'group': f"{custom_name} {grupa}" if grupa else custom_name,
+            'gender': gender
+        }
+        if grupa:
+            group_data['subgroup'] = grupa
+        
+        # Add up to 60 participants per group
+        for i in range(1, 61):
+            if i <= len(gender_participants):
+                participant = gender_participants[i-1]
+                # Schema rows keep the API's types (int dal_id, absent/None fields); templates need strings
+                group_data[f'Name{i}'] = as_text(participant.get('Name'))
+                group_data[f'Image{i}'] = image_path
+                group_data[f'Time{i}'] = as_text(participant.get('RaceTime'))
+                group_data[f'StartaNr{i}'] = f"{i}"
+                # Add dal_id as number
+                group_data[f'Number{i}'] = as_text(participant.get('dal_id'))
+                # Class group joined in from the start list
+                group_data[f'Subgroup{i}'] = as_text(participant.get('grupa'))
+            else:
+                group_data[f'Name{i}'] = ''
+                group_data[f'Image{i}'] = ''
+                group_data[f'Time{i}'] = ''
+                group_data[f'StartaNr{i}'] = ''
+                group_data[f'Number{i}'] = ''
+                group_data[f'Subgroup{i}'] = ''
+        return group_data
+
     def _fetch_single_distance(self, distance: str) -> Tuple[str, List[Dict[str, Any]]]:
         params = {
             "module": "results_posms",
@@ -51,25 +111,26 @@ class SummaryAPI(BaseAPIHandler):  # Renamed from LiveResultsAPI to SummaryAPI
             params["gads"] = "2024"
             
         try:
-            print(f"Fetching summary data for distance {distance}")  # Debug print
-            print(f"URL params: {params}")  # Debug print
-            response = requests.get(self.BASE_URL, params=params)
-            print(f"Response status: {response.status_code}")  # Debug print
-            print(f"Response content: {response.text[:200]}")  # Debug print first 200 chars
-            response.raise_for_status()
-            return distance, response.json()
+            shown_params = {k: v for k, v in params.items() if k != "auth_token"}  # never log the token
+            self.logger.debug(f"Fetching summary data for distance {distance}, params {shown_params}")
+            rows = self._fetch_json(params, key=f"results_posms:{distance}")
+            self.logger.debug(f"Summary rows for distance {distance}: {len(rows) if isinstance(rows, list) else type(rows).__name__}")
+            return distance, self._join_startlist(distance, rows)
         except Exception as e:
             self.logger.error(f"Error fetching summary for distance {distance}: {str(e)}")
-            print(f"Error in _fetch_single_distance: {str(e)}")  # Debug print
             return distance, []
 
-    def process_data(self, all_data: Dict[str, List[Dict[str, Any]]]) -> None:
-        """Process all fetched data into the required format"""
+    @profiled("process_data", tick=True)
+    @output_batch
+    def process_data(self, all_data: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Process all fetched data into the required format and return the group objects"""
         if not all_data:
             self.logger.warning("No data to process")
-            return
+            return []
 
         result = []
+        config = self.config.snapshot()
+        rendered = {}
         
         # Sort distances to ensure consistent order
         sorted_distances = sorted(all_data.keys())
@@ -89,46 +150,37 @@ class SummaryAPI(BaseAPIHandler):  # Renamed from LiveResultsAPI to SummaryAPI
             gender_order = ['Sievietes', 'Vīrieši']
             for gender in gender_order:
                 if gender in gender_groups:
-                    gender_participants = gender_groups[gender]
                     group_key = str(f"{distance}_{gender}")
-                    group_config = self.group_configs.get(group_key, {})
-                    custom_name = group_config.get('name', group_key)
-                    image_path = group_config.get('image', '')
+                    group_config = config.group_configs.get(group_key, {})
                     
-                    # Create a single object for all participants in this distance+gender
-                    group_data = {
-                        'group': custom_name,
-                        'gender': gender
-                    }
-                    
-                    # Add up to 60 participants per group
-                    for i in range(1, 61):
-                        if i <= len(gender_participants):
-                            participant = gender_participants[i-1]
-                            group_data[f'Name{i}'] = str(participant.get('Name', '')) if participant.get('Name') else ''
-                            group_data[f'Image{i}'] = image_path
-                            race_time = participant.get('RaceTime')
-                            group_data[f'Time{i}'] = str(race_time) if race_time is not None else ''
-                            group_data[f'StartaNr{i}'] = f"{i}"
-                            # Add dal_id as number
-                            group_data[f'Number{i}'] = str(participant.get('dal_id', ''))
+                    for grupa, gender_participants in self._split_by_class(distance, gender_groups[gender], config.distance_configs):
+                        # Only re-render groups whose participants or config changed since the last tick
+                        render_key = (distance, gender, grupa)
+                        fingerprint = (
+                            config.group_version(group_key, distance),
+                            tuple(
+                                (p.get('Name'), p.get('RaceTime'), p.get('dal_id'), p.get('grupa'))
+                                for p in gender_participants[:60]
+                            )
+                        )
+                        cached = self._rendered.get(render_key)
+                        if cached is not None and cached[0] == fingerprint:
+                            group_data = cached[1]
                         else:
-                            group_data[f'Name{i}'] = ''
-                            group_data[f'Image{i}'] = ''
-                            group_data[f'Time{i}'] = ''
-                            group_data[f'StartaNr{i}'] = ''
-                            group_data[f'Number{i}'] = ''
-                    
-                    result.append(group_data)
+                            group_data = self._render_group(group_key, group_config, gender, grupa, gender_participants)
+                        rendered[render_key] = (fingerprint, group_data)
+                        result.append(group_data)
 
-        try:
-            os.makedirs(self.output_dir, exist_ok=True)
-            filepath = os.path.join(self.output_dir, "summary_results.json")
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump({"teams": result}, f, ensure_ascii=False, indent=2)
-            
-        except Exception as e:
-            self.logger.error(f"Error in save/verify process: {str(e)}")
+        self._rendered = rendered
+        self.write_output({"teams": result}, "summary_results")
+        self._update_team_standings(all_data)
+        self._update_positions(all_data)
+        self._update_analytics(all_data)
+        self._render_layouts(all_data)
+        self._archive_tick()
+
+        self.last_result = result
+        return result
 
     def fetch_and_process(self):
         """Single fetch and process operation"""
@@ -0,0 +1,152 @@
+# src/api/teams.py
+"""
+Live team and school standings, maintained incrementally from result ticks.
+
+A team's total is the sum of its best `counting_members` finish times on a
+distance; teams with more counting finishers rank ahead of teams with fewer.
+"""
+
+import re
+import threading
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+# Standing kind -> row field holding the team name (joined in from the start list)
+TEAM_FIELDS = {
+    "teams": "komanda",
+    "schools": "skola",
+}
+
+TIME_RE = re.compile(r"^(?:(\d+):)?(\d{1,2}):(\d{1,2})(?:[.,](\d+))?$")
+
+
+def parse_race_time(value: Any) -> Optional[float]:
+    """'1:02:03', '02:03' or '02:03,5' -> seconds; None for empty/DNF values"""
+    if value is None:
+        return None
+    m = TIME_RE.match(str(value).strip())
+    if not m:
+        return None
+    hours, minutes, seconds, fraction = m.groups()
+    total = int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds)
+    if fraction:
+        total += float(f"0.{fraction}")
+    return float(total)
+
+
+def format_race_time(seconds: float) -> str:
+    seconds = int(round(seconds))
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+class TeamStandings:
+    """Running totals for every team of one kind on one distance"""
+
+    def __init__(self, field: str, counting_members: int = 3):
+        self.field = field
+        self.counting_members = counting_members
+        self._athletes: Dict[str, Tuple[str, float]] = {}    # dal_id -> (team, seconds)
+        self._members: Dict[str, Dict[str, float]] = {}      # team -> {dal_id: seconds}
+        self._totals: Dict[str, Tuple[int, float]] = {}      # team -> (counting finishers, total seconds)
+
+    def update(self, rows: List[Dict[str, Any]]) -> Set[str]:
+        """Apply one tick of result rows; returns the teams whose totals changed"""
+        seen: Set[str] = set()
+        affected: Set[str] = set()
+        for row in rows:
+            if not isinstance(row, dict):
+                continue
+            if row.get('dal_id') in (None, ''):
+                continue
+            dal_id = str(row['dal_id'])
+            team = str(row.get(self.field, '') or '').strip()
+            seconds = parse_race_time(row.get('RaceTime'))
+            seen.add(dal_id)
+            entry = (team, seconds) if team and seconds is not None else None
+            if self._athletes.get(dal_id) != entry:
+                affected |= self._move(dal_id, entry)
+
+        for dal_id in list(self._athletes.keys() - seen):
+            affected |= self._move(dal_id, None)
+
+        return {team for team in affected if self._recompute(team)}
+
+    def _move(self, dal_id: str, entry: Optional[Tuple[str, float]]) -> Set[str]:
+        affected = set()
+        previous = self._athletes.pop(dal_id, None)
+        if previous is not None:
+            team = previous[0]
+            self._members[team].pop(dal_id, None)
+            affected.add(team)
+        if entry is not None:
+            team, seconds = entry
+            self._athletes[dal_id] = entry
+            self._members.setdefault(team, {})[dal_id] = seconds
+            affected.add(team)
+        return affected
+
+    def _recompute(self, team: str) -> bool:
+        """Recompute a team's total; True if it differs from the previous one"""
+        previous = self._totals.get(team)
+        members = self._members.get(team)
+        if not members:
+            self._members.pop(team, None)
+            self._totals.pop(team, None)
+            return previous is not None
+        best = sorted(members.values())[:self.counting_members]
+        self._totals[team] = (len(best), sum(best))
+        return self._totals[team] != previous
+
+    def standings(self) -> List[Dict[str, str]]:
+        ranked = sorted(self._totals.items(), key=lambda item: (-item[1][0], item[1][1], item[0]))
+        return [
+            {
+                "Position": str(position),
+                "Name": team,
+                "Finishers": str(count),
+                "Laiks": format_race_time(total),
+            }
+            for position, (team, (count, total)) in enumerate(ranked, 1)
+        ]
+
+
+class TeamStandingsEngine:
+    """Team and school standings per distance for one source of result rows"""
+
+    def __init__(self, counting_members: int = 3):
+        self.counting_members = counting_members
+        self._lock = threading.Lock()
+        self._standings: Dict[Tuple[str, str], TeamStandings] = {}
+
+    def update(self, distance: str, rows: List[Dict[str, Any]]) -> int:
+        """Feed a distance's result rows; returns how many team totals changed"""
+        changed = 0
+        with self._lock:
+            for kind, field in TEAM_FIELDS.items():
+                key = (kind, distance)
+                if key not in self._standings:
+                    self._standings[key] = TeamStandings(field, self.counting_members)
+                changed += len(self._standings[key].update(rows))
+        return changed
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        """{"teams": [...], "schools": [...]}, one block per distance with its ranked teams"""
+        with self._lock:
+            result: Dict[str, List[Dict[str, Any]]] = {kind: [] for kind in TEAM_FIELDS}
+            for (kind, distance), standings in sorted(self._standings.items()):
+                ranked = standings.standings()
+                if ranked:
+                    result[kind].append({"distance": distance, "standings": ranked})
+            return result
+
+
+_default_engines: Dict[str, TeamStandingsEngine] = {}
+_default_lock = threading.Lock()
+
+
+def get_team_engine(source: str) -> TeamStandingsEngine:
+    """Process-wide standings engine per source (summary vs live ticks carry different row sets,
+    and an engine drops athletes missing from a tick, so sharing one would make standings flap)"""
+    with _default_lock:
+        if source not in _default_engines:
+            _default_engines[source] = TeamStandingsEngine()
+        return _default_engines[source]
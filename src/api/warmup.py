@@ -0,0 +1,80 @@
+# src/api/warmup.py
+"""
+Background warm-up: prefetch start lists, current results and the podium page
+for a settings preset. Each prefetched response is handed to the first
+interactive fetch of the same request within 30 s (SingleFlight's
+prefetch_window); later fetches go to the API. Warm-up also fills the
+start-list join cache, the participant index and the season disk cache, and
+opens the keep-alive connections of the shared client session.
+"""
+
+import logging
+import threading
+from typing import Dict, Any, Callable, List, Optional
+
+from .startlist import StartListAPI
+from .summary import SummaryAPI
+from .season import SeasonAPI
+from .awarding import fetch_podium_html
+
+logger = logging.getLogger("WarmUp")
+
+def selected_distances(settings: Dict[str, Any]) -> List[str]:
+    """Distances ticked in a settings preset (older presets store a plain list)"""
+    selected = settings.get('selected_distances', {})
+    if isinstance(selected, dict):
+        return [distance for distance, on in selected.items() if on]
+    return list(selected)
+
+
+def warm_up(settings: Dict[str, Any], posmi: List[str] = None) -> Dict[str, Any]:
+    """Prefetch everything the first real action needs; returns a small report"""
+    report = {"startlist": 0, "results": 0, "podium": False, "season_stages": 0}
+    distances = selected_distances(settings)
+    auth_token = settings.get('auth_key', '')
+    posms = settings.get('posms', '')
+    test_mode = bool(settings.get('test_mode', False))
+
+    if distances and auth_token:
+        # Start lists also prime the start-list join cache and the participant index
+        startlist_api = StartListAPI(posms, distances, auth_token, test_mode)
+        startlist_api.prefetch = True
+        report["startlist"] = len(startlist_api.fetch_data())
+
+        summary_api = SummaryAPI(posms, distances, auth_token, test_mode)
+        summary_api.prefetch = True
+        report["results"] = len(summary_api.fetch_data())
+
+        if posmi:
+            # Finished posmi go to the permanent season disk cache
+            season_api = SeasonAPI(posmi, posms, distances, auth_token, test_mode)
+            for stage in season_api.finished_posmi():
+                for distance in distances:
+                    if season_api._cached_stage(stage, distance):
+                        report["season_stages"] += 1
+
+    try:
+        fetch_podium_html(prefetch=True)
+        report["podium"] = True
+    except Exception as e:
+        logger.error(f"Error prefetching podium page: {str(e)}")
+
+    logger.info(f"Warm-up finished: {report}")
+    return report
+
+
+def start_warm_up(settings: Dict[str, Any], posmi: List[str] = None,
+                  on_done: Optional[Callable[[Dict[str, Any]], None]] = None) -> threading.Thread:
+    """Run warm_up on a daemon thread; on_done receives the report (or {'error': ...})"""
+    def run():
+        try:
+            report = warm_up(settings, posmi)
+        except Exception as e:
+            logger.error(f"Warm-up failed: {str(e)}")
+            report = {"error": str(e)}
+        if on_done is not None:
+            on_done(report)
+
+    thread = threading.Thread(target=run, name="warm-up", daemon=True)
+    thread.start()
+    return thread
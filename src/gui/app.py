@@ -2,9 +2,28 @@ import tkinter as tk
 from tkinter import ttk
 from api.startlist import StartListAPI
 from api.summary import SummaryAPI
-from api.awarding import fetch_and_save_awards
+from api.season import SeasonAPI
+from api.liveresults import LiveResultsAPI
+from api.scheduler import PRIORITIES
+from api.awarding import fetch_and_save_awards, AwardingPoller
+from api.serializers import available_formats, conflicting_formats
+from api.participant_index import get_index
+from api.output_queue import get_output_queue
+from api.shared_state import get_shared_state, shared_state_dir
+from api.layouts import available_layouts
+from api.archive import ArchiveReader, get_archive, list_archives, replay
+from api.engine import EngineClient, launch_engine
+from api.resilience import get_client
+from api.schema import get_quarantine
+from api.profiling import get_profiler
+from api.config_store import ConfigStore
+from api.warmup import start_warm_up
+from gui.results_view import ResultsView
+from gui.lag_monitor import LagMonitor
 import os
 import json
+import threading
+import time
 
 class App:
     def __init__(self, root):
@@ -42,6 +61,23 @@ class App:
         # Initialize group configs and active distance configs
         self.group_configs = {}
         self.active_distance_configs = {}  # Initialize active_distance_configs
+        # Versioned snapshot store the handlers read each tick, so config edits apply without rebuilding them
+        self.config_store = ConfigStore()
+        self._config_version_shown = 0
+        self.summary_api = None  # Reused between clicks so unchanged groups aren't re-rendered
+        self.output_formats = {}  # Output name -> list of serializer formats
+        self.output_destinations = []  # Extra output directories / HTTP URLs besides ./output
+        self.shared_state_outputs = []  # Output names mirrored into memory-mapped latest-state files
+        self.layouts = []  # Extra overlay layouts rendered per tick (written as layout_<name>)
+        self.output_dir = os.path.abspath(os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'output'))
+        self.season_api = None  # Reused between clicks so cached season totals stay in memory
+        self.live_api = None  # Running live poller, if any
+        self._live_status_after = None
+        self.archive_reader = None  # Archive session opened for scrubbing
+        self.engine = None  # EngineClient while fetching runs in the engine process
+        self._engine_live = False
+        self._preview_view = None
+        self._preview_groups = {}
         
         # Create presets directory if it doesn't exist
         self.presets_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'presets')
@@ -49,6 +85,12 @@ class App:
         
         self._create_widgets()
         
+        # Optionally restore the last-used settings preset and warm caches in the background
+        self._warmup_report = None
+        self.root.after(100, self._start_warm_up)
+        # Re-attach to an engine process left running by a previous window
+        self.root.after(200, self._reattach_engine)
+        
     def _create_widgets(self):
         # Create notebook for tabs
         self.notebook = ttk.Notebook(self.root)
@@ -124,6 +166,16 @@ class App:
         # Save/Load buttons
         ttk.Button(all_settings_frame, text="Save All Settings", command=self._save_all_settings).pack(side=tk.LEFT, padx=5)
         ttk.Button(all_settings_frame, text="Load Settings", command=self._load_all_settings).pack(side=tk.LEFT, padx=5)
+        self.warm_up_var = tk.BooleanVar()
+        ttk.Checkbutton(all_settings_frame, text="Warm up on start", variable=self.warm_up_var).pack(side=tk.LEFT, padx=5)
+        self.watch_settings_var = tk.BooleanVar()
+        ttk.Checkbutton(
+            all_settings_frame,
+            text="Watch loaded file for changes",
+            variable=self.watch_settings_var,
+            command=self._toggle_settings_watch
+        ).pack(side=tk.LEFT, padx=5)
+        self.loaded_settings_file = None
 
         # Control Buttons Frame
         control_frame = ttk.LabelFrame(main_container, text="Controls", padding=10)
@@ -144,6 +196,14 @@ class App:
         )
         self.fetch_summary_button.pack(side=tk.LEFT, padx=5)
 
+        # Season Standings Button
+        self.season_button = ttk.Button(
+            control_frame,
+            text="Fetch Season Standings",
+            command=self._fetch_season
+        )
+        self.season_button.pack(side=tk.LEFT, padx=5)
+
         # Awards V2 Button
         self.awarding_v2_button = ttk.Button(
             control_frame,
@@ -151,17 +211,71 @@ class App:
             command=self._fetch_awards_v2
         )
         self.awarding_v2_button.pack(side=tk.LEFT, padx=5)
+        # Polling mode: re-parses only podium tables that changed
+        self.poll_awards_var = tk.BooleanVar()
+        ttk.Checkbutton(
+            control_frame,
+            text="Poll Awards",
+            variable=self.poll_awards_var,
+            command=self._toggle_awards_polling
+        ).pack(side=tk.LEFT, padx=5)
+        self.awarding_poller = None
+
+        # Engine process: fetching, processing and writing run outside the GUI process
+        self.engine_mode_var = tk.BooleanVar()
+        ttk.Checkbutton(
+            control_frame,
+            text="Engine Process",
+            variable=self.engine_mode_var,
+            command=self._toggle_engine_mode
+        ).pack(side=tk.LEFT, padx=5)
+
+        # Profiling controls
+        profile_frame = ttk.Frame(control_frame)
+        profile_frame.pack(side=tk.RIGHT, padx=5)
+        self.profile_ticks_var = tk.StringVar(value="5")
+        ttk.Entry(profile_frame, textvariable=self.profile_ticks_var, width=4).pack(side=tk.LEFT)
+        self.profile_mode_var = tk.StringVar(value="cprofile")
+        ttk.Combobox(
+            profile_frame,
+            textvariable=self.profile_mode_var,
+            values=["cprofile", "sampling"],
+            state="readonly",
+            width=9
+        ).pack(side=tk.LEFT, padx=2)
+        ttk.Button(profile_frame, text="Profile Ticks", command=self._arm_profiler).pack(side=tk.LEFT)
 
         # Status Label
         self.status_label = ttk.Label(main_container, text="")
         self.status_label.pack(fill="x", pady=5)
+
+        # Status bar: API bytes received (wire vs decoded) and UI responsiveness, refreshed periodically
+        status_bar = ttk.Frame(main_container)
+        status_bar.pack(fill="x")
+        self.transfer_label = ttk.Label(status_bar, text="", foreground="gray")
+        self.transfer_label.pack(side=tk.LEFT)
+        self.root.after(5000, self._refresh_transfer_stats)
+        self.lag_label = ttk.Label(status_bar, text="", foreground="gray")
+        self.lag_label.pack(side=tk.RIGHT)
+        self.lag_monitor = LagMonitor(self.root, on_update=self._show_lag)
+        self.lag_monitor.start()
         
+        # Participant Search
+        search_frame = ttk.LabelFrame(main_container, text="Participant Search (bib or name)", padding=10)
+        search_frame.pack(fill="x", pady=5)
+
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *args: self._search_participants())
+        ttk.Entry(search_frame, textvariable=self.search_var, width=30).pack(side=tk.LEFT, padx=5, anchor="n")
+        self.search_results = tk.Listbox(search_frame, height=5)
+        self.search_results.pack(side=tk.LEFT, fill="x", expand=True, padx=5)
+
         # Results Display
         results_frame = ttk.LabelFrame(main_container, text="Results", padding=10)
         results_frame.pack(fill="both", expand=True)
         
-        self.results_text = tk.Text(results_frame, wrap=tk.WORD)
-        self.results_text.pack(fill="both", expand=True)
+        self.results_view = ResultsView(results_frame)
+        self.results_view.pack(fill="both", expand=True)
 
         # Group Config tab content
         config_container = ttk.Frame(config_tab, padding="10")
@@ -325,6 +439,305 @@ class App:
         ttk.Button(preset_frame, text="Save Preset", command=self._save_distance_preset).pack(side=tk.LEFT, padx=5)
         ttk.Button(preset_frame, text="Load Preset", command=self._load_distance_preset).pack(side=tk.LEFT, padx=5)
 
+        # Output Formats tab
+        formats_tab = ttk.Frame(self.notebook)
+        self.notebook.add(formats_tab, text="Output Formats")
+
+        formats_container = ttk.Frame(formats_tab, padding="10")
+        formats_container.pack(fill=tk.BOTH, expand=True)
+
+        ttk.Label(
+            formats_container,
+            text=f"Comma-separated formats per output. Available: {', '.join(available_formats())}"
+        ).pack(anchor="w", pady=5)
+
+        self.output_format_vars = {}
+        for output_name in ['all_participants', 'summary_results', 'latest_live_results', 'live_results', 'awarding_results', 'team_standings', 'position_movers', 'season_standings', 'race_analytics'] + [f"layout_{name}" for name in available_layouts()]:
+            frame = ttk.Frame(formats_container)
+            frame.pack(fill="x", pady=2)
+            ttk.Label(frame, text=f"{output_name}:", width=22).pack(side=tk.LEFT, padx=5)
+            format_var = tk.StringVar(value="json")
+            ttk.Entry(frame, textvariable=format_var, width=40).pack(side=tk.LEFT, padx=5)
+            self.output_format_vars[output_name] = format_var
+
+        # Extra destinations (network share paths or local HTTP endpoints)
+        destinations_frame = ttk.LabelFrame(formats_container, text="Extra Destinations", padding=5)
+        destinations_frame.pack(fill="x", pady=5)
+        ttk.Label(destinations_frame, text="Paths, http:// URLs or generations:<path>, comma-separated:").pack(side=tk.LEFT, padx=5)
+        self.output_destinations_var = tk.StringVar()
+        ttk.Entry(destinations_frame, textvariable=self.output_destinations_var, width=50).pack(side=tk.LEFT, padx=5)
+
+        # Memory-mapped latest state for graphics on this machine
+        shared_frame = ttk.LabelFrame(formats_container, text=f"Shared Memory ({shared_state_dir()})", padding=5)
+        shared_frame.pack(fill="x", pady=5)
+        ttk.Label(shared_frame, text="Output names, comma-separated:").pack(side=tk.LEFT, padx=5)
+        self.shared_state_var = tk.StringVar()
+        ttk.Entry(shared_frame, textvariable=self.shared_state_var, width=50).pack(side=tk.LEFT, padx=5)
+
+        # Overlay layouts rendered in worker processes each summary/live tick
+        layouts_frame = ttk.LabelFrame(formats_container, text="Layouts", padding=5)
+        layouts_frame.pack(fill="x", pady=5)
+        ttk.Label(layouts_frame, text=f"Comma-separated, available: {', '.join(available_layouts())}").pack(side=tk.LEFT, padx=5)
+        self.layouts_var = tk.StringVar()
+        ttk.Entry(layouts_frame, textvariable=self.layouts_var, width=40).pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(
+            formats_container,
+            text="Save Output Formats",
+            command=self._save_output_formats
+        ).pack(pady=10)
+
+        # Per-destination write latency and per-endpoint API transfer
+        ttk.Button(formats_container, text="Refresh Write Stats", command=self._show_output_stats).pack(pady=5)
+        self.output_stats_label = ttk.Label(formats_container, text="", justify=tk.LEFT)
+        self.output_stats_label.pack(anchor="w", pady=5)
+
+        # Live tab: per-distance on-air / standby / background priorities for the live poller
+        live_tab = ttk.Frame(self.notebook)
+        self.notebook.add(live_tab, text="Live")
+
+        live_container = ttk.Frame(live_tab, padding="10")
+        live_container.pack(fill=tk.BOTH, expand=True)
+
+        budget_frame = ttk.Frame(live_container)
+        budget_frame.pack(fill="x", pady=5)
+        ttk.Label(budget_frame, text="Request budget (requests/min):").pack(side=tk.LEFT, padx=5)
+        self.request_budget_var = tk.StringVar(value="60")
+        ttk.Entry(budget_frame, textvariable=self.request_budget_var, width=8).pack(side=tk.LEFT, padx=5)
+        ttk.Label(budget_frame, text="Bandwidth budget (KB/s, 0 = off):").pack(side=tk.LEFT, padx=5)
+        self.bandwidth_budget_var = tk.StringVar(value="0")
+        ttk.Entry(budget_frame, textvariable=self.bandwidth_budget_var, width=8).pack(side=tk.LEFT, padx=5)
+        self.live_button = ttk.Button(budget_frame, text="Start Live Results", command=self._toggle_live_results)
+        self.live_button.pack(side=tk.LEFT, padx=20)
+
+        ttk.Label(
+            live_container,
+            text="On air: refreshed every 5 s. Standby: every update interval. Background: every 2 min."
+        ).pack(anchor="w", pady=5)
+
+        self.priority_vars = {}
+        self.freshness_labels = {}
+        for distance, name in self.DISTANCES.items():
+            frame = ttk.Frame(live_container)
+            frame.pack(fill="x", pady=2)
+            ttk.Label(frame, text=f"{name}:", width=25).pack(side=tk.LEFT, padx=5)
+            priority_var = tk.StringVar(value="standby")
+            priority_box = ttk.Combobox(frame, textvariable=priority_var, values=list(PRIORITIES), state="readonly", width=12)
+            priority_box.pack(side=tk.LEFT, padx=5)
+            priority_box.bind("<<ComboboxSelected>>", lambda event, d=distance: self._on_priority_changed(d))
+            freshness_label = ttk.Label(frame, text="", foreground="gray")
+            freshness_label.pack(side=tk.LEFT, padx=10)
+            self.priority_vars[distance] = priority_var
+            self.freshness_labels[distance] = freshness_label
+
+        # Archive tab: record summary/live ticks and scrub/replay them afterwards
+        archive_tab = ttk.Frame(self.notebook)
+        self.notebook.add(archive_tab, text="Archive")
+
+        archive_container = ttk.Frame(archive_tab, padding="10")
+        archive_container.pack(fill=tk.BOTH, expand=True)
+
+        self.record_archive_var = tk.BooleanVar()
+        ttk.Checkbutton(
+            archive_container,
+            text="Record summary and live results ticks",
+            variable=self.record_archive_var,
+            command=self._toggle_archive_recording
+        ).pack(anchor="w", pady=5)
+
+        session_frame = ttk.Frame(archive_container)
+        session_frame.pack(fill="x", pady=5)
+        ttk.Label(session_frame, text="Session:").pack(side=tk.LEFT, padx=5)
+        self.archive_session_var = tk.StringVar()
+        self.archive_session_box = ttk.Combobox(session_frame, textvariable=self.archive_session_var, state="readonly", width=30)
+        self.archive_session_box.pack(side=tk.LEFT, padx=5)
+        ttk.Button(session_frame, text="Refresh", command=self._refresh_archive_sessions).pack(side=tk.LEFT, padx=5)
+        ttk.Button(session_frame, text="Open", command=self._open_archive).pack(side=tk.LEFT, padx=5)
+
+        self.scrub_var = tk.DoubleVar()
+        self.scrub_scale = tk.Scale(
+            archive_container,
+            variable=self.scrub_var,
+            orient=tk.HORIZONTAL,
+            from_=0,
+            to=0,
+            resolution=1,
+            showvalue=False,
+            command=self._on_scrub
+        )
+        self.scrub_scale.pack(fill="x", pady=5)
+
+        replay_frame = ttk.Frame(archive_container)
+        replay_frame.pack(fill="x", pady=5)
+        self.emit_while_scrubbing_var = tk.BooleanVar()
+        ttk.Checkbutton(replay_frame, text="Emit while scrubbing", variable=self.emit_while_scrubbing_var).pack(side=tk.LEFT, padx=5)
+        ttk.Button(replay_frame, text="Emit Outputs at This Time", command=self._emit_archive_state).pack(side=tk.LEFT, padx=5)
+        self.scrub_label = ttk.Label(archive_container, text="")
+        self.scrub_label.pack(anchor="w", pady=5)
+        self._refresh_archive_sessions()
+
+    def _save_output_formats(self):
+        """Validate and store the per-output serializer formats"""
+        formats = {}
+        known = set(available_formats())
+        for output_name, var in self.output_format_vars.items():
+            selected = [f.strip() for f in var.get().split(',') if f.strip()]
+            unknown = [f for f in selected if f not in known]
+            if unknown:
+                self.status_label.config(
+                    text=f"Unknown format(s) for {output_name}: {', '.join(unknown)}",
+                    foreground="red"
+                )
+                return
+            conflicts = conflicting_formats(selected)
+            if conflicts:
+                self.status_label.config(
+                    text=f"Formats for {output_name} write the same file, drop {', '.join(conflicts)}",
+                    foreground="red"
+                )
+                return
+            formats[output_name] = selected or ['json']
+
+        layouts = [n.strip() for n in self.layouts_var.get().split(',') if n.strip()]
+        unknown = [n for n in layouts if n not in available_layouts()]
+        if unknown:
+            self.status_label.config(text=f"Unknown layout(s): {', '.join(unknown)}", foreground="red")
+            return
+
+        self.output_formats = formats
+        self.output_destinations = [d.strip() for d in self.output_destinations_var.get().split(',') if d.strip()]
+        self._apply_output_destinations()
+        self.layouts = layouts
+        self.shared_state_outputs = [n.strip() for n in self.shared_state_var.get().split(',') if n.strip()]
+        get_shared_state().set_outputs(self.shared_state_outputs)
+        self._push_engine_settings()
+        self.status_label.config(text="Output formats saved", foreground="green")
+
+    def _apply_output_destinations(self):
+        """Point the shared output queue at ./output plus the extra destinations"""
+        get_output_queue(self.output_dir).set_destinations([self.output_dir] + self.output_destinations)
+
+    def _show_output_stats(self):
+        """Show written/coalesced/dropped counts and write latency per destination"""
+        stats = get_output_queue(self.output_dir).stats()
+        lines = []
+        for name, report in stats.items():
+            latency = f"p50 {report['p50_ms']} ms, max {report['max_ms']} ms" if 'p50_ms' in report else "no writes yet"
+            lines.append(
+                f"{name}: written {report['written']}, coalesced {report['coalesced']}, "
+                f"dropped {report['dropped']}, errors {report['errors']}, pending {report['pending']} ({latency})"
+            )
+        transfer = get_client().stats()["bytes"]
+        if transfer:
+            lines.append("")
+            lines.append("API transfer (wire / decoded):")
+        for endpoint, counters in sorted(transfer.items()):
+            lines.append(
+                f"{endpoint}: {counters['responses']} responses, "
+                f"{self._format_bytes(counters['wire'])} / {self._format_bytes(counters['decoded'])}"
+            )
+        quarantined = get_quarantine(self.output_dir).stats()
+        if quarantined:
+            lines.append("")
+            lines.append("Quarantined rows: " + ", ".join(f"{module} {count}" for module, count in sorted(quarantined.items())))
+        self.output_stats_label.config(text="\n".join(lines))
+
+    @staticmethod
+    def _format_bytes(size):
+        for unit in ("B", "KB", "MB"):
+            if size < 1024:
+                return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+            size /= 1024
+        return f"{size:.1f} GB"
+
+    def _show_lag(self, stats):
+        """Event-loop lag over the last minute; the peak is the longest freeze since start"""
+        color = "red" if stats["p95"] > 200 else "gray"
+        self.lag_label.config(
+            text=f"UI lag p50 {stats['p50']:.0f} ms, p95 {stats['p95']:.0f} ms, "
+                 f"max {stats['max']:.0f} ms (peak {stats['peak']:.0f} ms)",
+            foreground=color
+        )
+
+    def _refresh_transfer_stats(self):
+        """Update the wire vs decoded byte summary under the status line"""
+        try:
+            if self.engine is None:
+                self._show_transfer(get_client().stats())
+        finally:
+            self.root.after(5000, self._refresh_transfer_stats)
+
+    def _show_transfer(self, stats):
+        wire, decoded = stats["wire_bytes"], stats["decoded_bytes"]
+        if decoded:
+            saved = 100 * (1 - wire / decoded)
+            self.transfer_label.config(
+                text=f"API data: {self._format_bytes(wire)} on the wire, {self._format_bytes(decoded)} decoded "
+                     f"({saved:.0f}% saved by compression), {self._format_bytes(stats['wire_rate'])}/s"
+            )
+
+    def _toggle_settings_watch(self):
+        """Hot-reload group/distance configs from the loaded settings file while the box is checked"""
+        if self.watch_settings_var.get() and self.loaded_settings_file:
+            self.config_store.watch(self.loaded_settings_file)
+            self._poll_config_store()
+        else:
+            self.config_store.stop_watching()
+
+    def _poll_config_store(self):
+        """Mirror configs reloaded from the watched file into the config tabs"""
+        snapshot = self.config_store.snapshot()
+        if snapshot.version != self._config_version_shown:
+            self._config_version_shown = snapshot.version
+            self.group_configs = {key: dict(value) for key, value in snapshot.group_configs.items()}
+            self.active_distance_configs = {key: dict(value) for key, value in snapshot.distance_configs.items()}
+            for group_key, config in self.group_configs.items():
+                if group_key in self.group_config_entries:
+                    self.group_config_entries[group_key]['name'].set(config.get('name', ''))
+                    self.group_config_entries[group_key]['image'].set(config.get('image', ''))
+            for distance, config in self.active_distance_configs.items():
+                if distance in self.distance_configs:
+                    self.distance_configs[distance]['group_by'].set(config.get('group_by', 'distance'))
+                    self.distance_configs[distance]['top_count'].set(str(config.get('top_count', 3)))
+            self.status_label.config(text=f"Configs reloaded (version {snapshot.version})", foreground="green")
+        if self.watch_settings_var.get():
+            self.root.after(1000, self._poll_config_store)
+
+    def _arm_profiler(self):
+        """Profile the next N ticks; reports land in output/profiles/"""
+        try:
+            ticks = int(self.profile_ticks_var.get())
+            if ticks < 1:
+                raise ValueError
+        except ValueError:
+            self.status_label.config(text="Invalid tick count for profiling", foreground="red")
+            return
+        get_profiler().arm(ticks, mode=self.profile_mode_var.get())
+        self.status_label.config(
+            text=f"Profiling next {ticks} tick(s), results in {os.path.join(self.output_dir, 'profiles')}",
+            foreground="black"
+        )
+
+    def _search_participants(self):
+        """Look up participants from the shared index as the operator types"""
+        query = self.search_var.get()
+        started = time.perf_counter()
+        matches = get_index().search(query, limit=20)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        self.search_results.delete(0, tk.END)
+        for record in matches:
+            startlist = record.get('startlist', {})
+            results = record.get('results', {})
+            distance = self.DISTANCES.get(record['distance'], record['distance'])
+            self.search_results.insert(
+                tk.END,
+                f"{record['dal_id']} | {record['name']} | {distance} | "
+                f"{startlist.get('grupa', '')} | {results.get('time', '')}"
+            )
+        if query.strip():
+            self.search_results.insert(tk.END, f"{len(matches)} match(es) in {elapsed_ms:.2f} ms")
+
     def _browse_image(self, image_var, type_var):
         """Open file dialog to select an image file or handle web link"""
         if type_var.get() == "local":
@@ -406,9 +819,12 @@ class App:
                     'image': entries['image'].get()
                 }
         
-        # Store the configurations and update all APIs
+        # Store the configurations and publish them to running handlers at their next tick
         self.group_configs = group_configs
+        self.config_store.update(group_configs=group_configs)
+        self._config_version_shown = self.config_store.version
         
+        self._push_engine_settings()
         self.status_label.config(text="Group configurations saved", foreground="green")
 
     def _fetch_data(self):
@@ -421,9 +837,9 @@ class App:
         if not selected_distances or not auth_token:
             self.status_label.config(text="Please select at least one Distance and enter Auth Key", foreground="red")
             return
-        
-        # Reset results text
-        self.results_text.delete(1.0, tk.END)
+        if self.engine is not None:
+            self._engine_action("fetch_startlist", "Fetching start list in the engine...")
+            return
         
         # Create API instance with all selected distances and group configs
         api = StartListAPI(
@@ -431,52 +847,43 @@ class App:
             selected_distances, 
             auth_token, 
             self.test_mode_var.get(),
-            self.group_configs
+            self.group_configs,
+            self.output_formats,
+            config_store=self.config_store
         )
         
-        try:
-            # Fetch all data
+        def fetch():
+            # Fetch all data, then process and save it
             all_data = api.fetch_data()
-            
-            if all_data:
-                # Process and save all data
-                api.process_data(all_data)
-                
-                # Display results preview
-                try:
-                    output_dir = os.path.abspath(os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'output'))
-                    filepath = os.path.join(output_dir, 'all_participants.json')
-                    
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        # Show preview of data for each distance
-                        for distance in selected_distances:
-                            if distance in data:
-                                self.results_text.insert(tk.END, f"\nDistance: {distance} - {self.DISTANCES[distance]}\n")
-                                self.results_text.insert(tk.END, f"Participants: {len(data[distance])}\n")
-                                if data[distance]:  # Show first participant as example
-                                    self.results_text.insert(tk.END, "Example participant:\n")
-                                    self.results_text.insert(tk.END, 
-                                        json.dumps(data[distance][0], indent=2, ensure_ascii=False) + "\n")
+            return api.process_data(all_data) if all_data else None
+
+        def done(result, error):
+            self.startlist_button.config(state=tk.NORMAL)
+            if error is not None:
+                self.status_label.config(
+                    text=f"Error during data fetch: {str(error)}",
+                    foreground="red"
+                )
+            elif result is not None:
+                # Show the in-memory result
+                self.results_view.set_groups(result)
                 
-                    self.status_label.config(
-                        text=f"Data saved successfully in: {filepath}\n" + 
-                             f"Posms: {self.POSMI.get(posms, posms)} | " + 
-                             f"Total distances processed: {len(selected_distances)}",
-                        foreground="green"
-                    )
-                except Exception as e:
-                    self.results_text.insert(tk.END, f"Error reading saved file: {str(e)}\n")
+                filepath = os.path.join(api.output_dir, 'all_participants.json')
+                self.status_label.config(
+                    text=f"Data saved successfully in: {filepath}\n" + 
+                         f"Posms: {self.POSMI.get(posms, posms)} | " + 
+                         f"Total distances processed: {len(selected_distances)}",
+                    foreground="green"
+                )
             else:
                 self.status_label.config(
                     text="No data could be fetched for the selected distances",
                     foreground="red"
                 )
-        except Exception as e:
-            self.status_label.config(
-                text=f"Error during data fetch: {str(e)}",
-                foreground="red"
-            )
+
+        self.startlist_button.config(state=tk.DISABLED)
+        self.status_label.config(text="Fetching start list...", foreground="black")
+        self._run_in_background(fetch, done)
 
     def _fetch_summary(self):
         """Fetch summary data once"""
@@ -488,41 +895,468 @@ class App:
             if not selected_distances or not auth_token:
                 self.status_label.config(text="Please select at least one Distance and enter Auth Key", foreground="red")
                 return
+            if self.engine is not None:
+                self._engine_action("fetch_summary", "Fetching summary data in the engine...")
+                return
 
-            summary_api = SummaryAPI(
-                posms=posms,
-                distances=selected_distances,
-                auth_token=auth_token,
-                test_mode=self.test_mode_var.get(),
-                group_configs=self.group_configs
-            )
+            summary_api = self.summary_api
+            if (summary_api is None or summary_api.posms != posms or summary_api.distances != selected_distances
+                    or summary_api.AUTH_TOKEN != auth_token or summary_api.test_mode != self.test_mode_var.get()):
+                summary_api = self.summary_api = SummaryAPI(
+                    posms=posms,
+                    distances=selected_distances,
+                    auth_token=auth_token,
+                    test_mode=self.test_mode_var.get(),
+                    output_formats=self.output_formats,
+                    config_store=self.config_store
+                )
+            summary_api.output_formats = self.output_formats
+            summary_api.layouts = self.layouts
+            summary_api.archive = self._recording_archive()
             
             # Disable button while fetching
             self.fetch_summary_button.config(state=tk.DISABLED)
             self.status_label.config(text="Fetching summary data...", foreground="black")
             
-            # Fetch and process data
-            success = summary_api.fetch_and_process()
-            
-            # Re-enable button
-            self.fetch_summary_button.config(state=tk.NORMAL)
-            
-            if success:
-                self.status_label.config(text="Summary data updated successfully", foreground="green")
-            else:
-                self.status_label.config(text="Failed to fetch summary data", foreground="red")
+            # Fetch and process data off the Tk thread
+            self._run_in_background(summary_api.fetch_and_process, self._on_summary_fetched)
 
         except Exception as e:
             self.fetch_summary_button.config(state=tk.NORMAL)
             self.status_label.config(text=f"Error fetching summary data: {str(e)}", foreground="red")
 
+    def _on_summary_fetched(self, success, error):
+        # Re-enable button
+        self.fetch_summary_button.config(state=tk.NORMAL)
+        if error is not None:
+            self.status_label.config(text=f"Error fetching summary data: {str(error)}", foreground="red")
+            return
+
+        summary_api = self.summary_api
+        stats = summary_api.client.stats()
+        hedge_info = f" (hedges won {stats['hedges_won']}/{stats['hedges_fired']})"
+        
+        if success:
+            self.results_view.set_groups(summary_api.last_result)
+            self.status_label.config(text="Summary data updated successfully" + hedge_info, foreground="green")
+        else:
+            self.status_label.config(text="Failed to fetch summary data", foreground="red")
+
+    def _run_in_background(self, work, on_done):
+        """Run work() on a worker thread; on_done(result, error) is called back on the Tk thread"""
+        outcome = {}
+
+        def run():
+            try:
+                outcome['result'] = work()
+            except Exception as e:
+                outcome['error'] = e
+            outcome['done'] = True
+
+        def poll():
+            if 'done' not in outcome:
+                self.root.after(50, poll)
+            else:
+                on_done(outcome.get('result'), outcome.get('error'))
+
+        threading.Thread(target=run, name="gui-fetch", daemon=True).start()
+        self.root.after(50, poll)
+
+    def _fetch_season(self):
+        """Fetch season-cumulative standings; finished posmi come from the disk cache"""
+        posms = self.posms_var.get()
+        auth_token = self.auth_key_var.get()
+        selected_distances = [key for key, var in self.distances_vars.items() if var.get()]
+
+        if not selected_distances or not auth_token:
+            self.status_label.config(text="Please select at least one Distance and enter Auth Key", foreground="red")
+            return
+        if posms not in self.POSMI or not posms:
+            self.status_label.config(text="Please select the current Posms for season standings", foreground="red")
+            return
+        if self.engine is not None:
+            self._engine_action("fetch_season", "Fetching season standings in the engine...", list(self.POSMI.keys()))
+            return
+
+        api = self.season_api
+        if (api is None or api.posms != posms or api.distances != selected_distances
+                or api.AUTH_TOKEN != auth_token or api.test_mode != self.test_mode_var.get()):
+            api = self.season_api = SeasonAPI(
+                posmi=list(self.POSMI.keys()),
+                current_posms=posms,
+                distances=selected_distances,
+                auth_token=auth_token,
+                test_mode=self.test_mode_var.get(),
+                output_formats=self.output_formats
+            )
+        api.output_formats = self.output_formats
+
+        def done(success, error):
+            self.season_button.config(state=tk.NORMAL)
+            if error is not None:
+                self.status_label.config(text=f"Error fetching season standings: {str(error)}", foreground="red")
+            elif success:
+                self.results_view.set_groups(api.preview_groups())
+                self.status_label.config(
+                    text=f"Season standings updated ({len(api.finished_posmi())} cached posmi + {self.POSMI.get(posms, posms)})",
+                    foreground="green"
+                )
+            else:
+                self.status_label.config(text="Failed to fetch season standings", foreground="red")
+
+        # A cold cache fetches every earlier stage; keep that off the Tk thread
+        self.season_button.config(state=tk.DISABLED)
+        self.status_label.config(text="Fetching season standings...", foreground="black")
+        self._run_in_background(api.fetch_and_process, done)
+
     def _fetch_awards_v2(self):
+        if self.engine is not None:
+            self._engine_action("fetch_awards", "Fetching awards in the engine...")
+            return
+        formats = self.output_formats.get('awarding_results')
+
+        def done(filename, error):
+            self.awarding_v2_button.config(state=tk.NORMAL)
+            if error is not None:
+                self.status_label.config(text=f"Failed to fetch/save Awards V2: {error}", foreground="red")
+            else:
+                self.status_label.config(text=f"Awards V2 data saved to {filename}", foreground="green")
+
+        self.awarding_v2_button.config(state=tk.DISABLED)
+        self.status_label.config(text="Fetching awards...", foreground="black")
+        self._run_in_background(lambda: fetch_and_save_awards(output_dir=self.output_dir, formats=formats), done)
+
+    def _toggle_live_results(self):
+        """Start or stop the live results poller with the priorities from the Live tab"""
+        if self.engine is not None and self._engine_live:
+            self._engine_action("stop_live", "Stopping live results in the engine...")
+            return
+        if self.live_api is not None:
+            self.live_api.stop_live_updates()
+            self.live_api = None
+            if self._live_status_after is not None:
+                self.root.after_cancel(self._live_status_after)
+                self._live_status_after = None
+            self.live_button.config(text="Start Live Results")
+            for label in self.freshness_labels.values():
+                label.config(text="")
+            self.status_label.config(text="Live results stopped", foreground="black")
+            return
+
+        auth_token = self.auth_key_var.get()
+        selected_distances = [key for key, var in self.distances_vars.items() if var.get()]
+        if not selected_distances or not auth_token:
+            self.status_label.config(text="Please select at least one Distance and enter Auth Key", foreground="red")
+            return
+        try:
+            update_interval = int(self.update_interval_var.get())
+            request_budget = float(self.request_budget_var.get())
+            bandwidth_budget = float(self.bandwidth_budget_var.get() or 0)
+            if update_interval < 1 or request_budget <= 0 or bandwidth_budget < 0:
+                raise ValueError
+        except ValueError:
+            self.status_label.config(text="Invalid update interval, request budget or bandwidth budget", foreground="red")
+            return
+        if self.engine is not None:
+            self._engine_action("start_live", "Starting live results in the engine...")
+            return
+
+        self.live_api = LiveResultsAPI(
+            posms=self.posms_var.get(),
+            distances=selected_distances,
+            auth_token=auth_token,
+            update_interval=update_interval,
+            test_mode=self.test_mode_var.get(),
+            output_formats=self.output_formats,
+            priorities={distance: self.priority_vars[distance].get() for distance in selected_distances},
+            request_budget=request_budget,
+            bandwidth_budget=bandwidth_budget * 1024 or None
+        )
+        self.live_api.layouts = self.layouts
+        self.live_api.archive = self._recording_archive()
+        self.live_api.start_live_updates()
+        self.live_button.config(text="Stop Live Results")
+        self.status_label.config(text="Live results running", foreground="green")
+        self._refresh_live_status()
+
+    def _on_priority_changed(self, distance):
+        """Apply a priority change to the running poller immediately"""
+        if self.engine is not None:
+            self.engine.call("set_priority", distance, self.priority_vars[distance].get())
+        if self.live_api is not None and distance in self.live_api.distances:
+            self.live_api.set_priority(distance, self.priority_vars[distance].get())
+            self._refresh_live_status(reschedule=False)
+
+    def _refresh_live_status(self, reschedule=True):
+        """Show how old each distance's data is against its freshness target"""
+        if self.live_api is None:
+            return
+        self._show_freshness(self.live_api.scheduler.status(self.live_api.distances))
+        if reschedule:
+            self._live_status_after = self.root.after(1000, self._refresh_live_status)
+
+    def _show_freshness(self, statuses):
+        for distance, label in self.freshness_labels.items():
+            status = statuses.get(distance)
+            if status is None:
+                label.config(text="")
+            elif status["age"] is None:
+                label.config(text=f"waiting (target {status['target']:.0f} s)", foreground="gray")
+            else:
+                label.config(
+                    text=f"{status['age']:.0f} s old (target {status['target']:.0f} s)",
+                    foreground="red" if status["age"] > 2 * status["target"] else "gray"
+                )
+
+    def _toggle_engine_mode(self):
+        """Move fetching into a separate engine process, or stop that process"""
+        if not self.engine_mode_var.get():
+            if self.engine is not None:
+                self.engine.call("shutdown")
+                self.engine.pump()
+                self._detach_engine("Engine process stopped", "black")
+            return
+        if self.live_api is not None:
+            self._toggle_live_results()  # the engine takes over live polling
+        if self.awarding_poller is not None:
+            # Only one process writes the outputs; awards polling is restarted in the engine
+            self.awarding_poller.stop()
+            self.awarding_poller = None
+            self.poll_awards_var.set(False)
+        if self._connect_engine():
+            self._attach_engine()
+            return
+        main_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'main.py')
+        try:
+            launch_engine(main_path)
+        except OSError as e:
+            self.engine_mode_var.set(False)
+            self.status_label.config(text=f"Error starting the engine process: {str(e)}", foreground="red")
+            return
+        self.status_label.config(text="Starting engine process...", foreground="black")
+        self.root.after(250, self._wait_for_engine, 40)
+
+    def _wait_for_engine(self, attempts):
+        if not self.engine_mode_var.get():
+            return
+        if self._connect_engine():
+            self._attach_engine()
+        elif attempts > 1:
+            self.root.after(250, self._wait_for_engine, attempts - 1)
+        else:
+            self.engine_mode_var.set(False)
+            self.status_label.config(text="Engine process did not start, see output/engine.log", foreground="red")
+
+    def _reattach_engine(self):
+        """Pick up an engine left running by a previous window (never starts one)"""
+        if self.engine is None and self._connect_engine():
+            self.engine_mode_var.set(True)
+            self._attach_engine()
+
+    def _connect_engine(self):
+        """Connect to the running engine, closing any connection this window still holds"""
+        if self.engine is not None:
+            self.engine.close()
+            self.engine = None
+        self.engine = EngineClient.connect()
+        return self.engine is not None
+
+    def _attach_engine(self):
+        # Adopt the engine's settings; ours are only sent with the next user action
+        self.engine.call("get_settings", callback=self._on_engine_settings)
+        self.status_label.config(text=f"Attached to engine process (pid {self.engine.pid})", foreground="green")
+        self._pump_engine(self.engine)
+        self._poll_engine_status(self.engine)
+
+    def _on_engine_settings(self, ok, result):
+        if not ok:
+            self.status_label.config(text=f"Engine error: {result}", foreground="red")
+            return
+        settings = result["settings"]
+        if not settings:
+            return  # a fresh engine; it gets our settings with the first action
+        try:
+            self._apply_settings(settings, self.loaded_settings_file)
+        except Exception as e:
+            self.status_label.config(text=f"Error applying the engine's settings: {str(e)}", foreground="red")
+            return
+        self.record_archive_var.set(bool(settings.get('record_archive', False)))
+        self.status_label.config(
+            text=f"Attached to engine process (pid {self.engine.pid}), settings loaded from the engine",
+            foreground="green"
+        )
+
+    def _detach_engine(self, message, color):
+        self.engine.close()
+        self.engine = None
+        self._engine_live = False
+        self._preview_view, self._preview_groups = None, {}
+        self.engine_mode_var.set(False)
+        self.live_button.config(text="Start Live Results")
+        self.poll_awards_var.set(False)
+        self._show_freshness({})
+        self.status_label.config(text=message, foreground=color)
+
+    def _pump_engine(self, client):
+        if self.engine is not client:
+            return  # detached or replaced; the new connection runs its own loop
+        if not self.engine.pump():
+            self._detach_engine("Engine process exited, see output/engine.log", "red")
+            return
+        self.root.after(50, self._pump_engine, client)
+
+    def _poll_engine_status(self, client):
+        if self.engine is not client:
+            return
+        self.engine.call("status", callback=self._on_engine_status)
+        self.root.after(1000, self._poll_engine_status, client)
+
+    def _on_engine_status(self, ok, status):
+        if not ok:
+            return
+        self._engine_live = status["live"]
+        self.live_button.config(text="Stop Live Results" if status["live"] else "Start Live Results")
+        self.poll_awards_var.set(status["awards"])
+        self._show_freshness(status["freshness"])
+        self._show_transfer(status["transfer"])
+
+    def _engine_settings(self):
+        settings = self._current_settings()
+        settings['record_archive'] = self.record_archive_var.get()
+        return settings
+
+    def _push_engine_settings(self, callback=None):
+        if self.engine is not None:
+            self.engine.call("configure", self._engine_settings(), callback=callback)
+
+    def _engine_action(self, command, pending_text, *args):
+        """Send the current settings, then the command; the result arrives via pump"""
+        self.engine.call("configure", self._engine_settings())
+        self.engine.call(command, *args, callback=self._on_engine_result)
+        self.status_label.config(text=pending_text, foreground="black")
+
+    def _on_engine_result(self, ok, result):
+        if not ok:
+            self.status_label.config(text=f"Engine error: {result}", foreground="red")
+            return
+        preview = result.get("preview")
+        if preview is not None:
+            # Only changed groups travel; the rest are reused from the last preview
+            if preview["view"] != self._preview_view:
+                self._preview_view, self._preview_groups = preview["view"], {}
+            self._preview_groups.update(preview["changed"])
+            self._preview_groups = {key: self._preview_groups[key] for key in preview["order"]}
+            self.results_view.set_groups(list(self._preview_groups.values()))
+        if result.get("message"):
+            self.status_label.config(text=result["message"], foreground="green" if result.get("ok") else "red")
+
+    def _recording_archive(self):
+        return get_archive(self.output_dir) if self.record_archive_var.get() else None
+
+    def _toggle_archive_recording(self):
+        """Start or stop archiving ticks of the summary and live handlers"""
+        if self.engine is not None:
+            # The engine records into its own session; show that one
+            self._push_engine_settings(callback=self._on_engine_archive)
+            return
+        archive = self._recording_archive()
+        for api in (self.summary_api, self.live_api):
+            if api is not None:
+                api.archive = archive
+        self._show_archive_path(archive.data_path if archive is not None else None)
+
+    def _on_engine_archive(self, ok, result):
+        if not ok:
+            self.status_label.config(text=f"Engine error: {result}", foreground="red")
+            return
+        self._show_archive_path(result.get("archive"))
+
+    def _show_archive_path(self, data_path):
+        if data_path is not None:
+            self.status_label.config(text=f"Recording ticks to {data_path}", foreground="green")
+        else:
+            self.status_label.config(text="Archive recording stopped", foreground="black")
+
+    def _refresh_archive_sessions(self):
+        sessions = [os.path.basename(path) for path in list_archives(os.path.join(self.output_dir, 'archive'))]
+        self.archive_session_box.config(values=sessions)
+        if sessions and self.archive_session_var.get() not in sessions:
+            self.archive_session_var.set(sessions[-1])
+
+    def _open_archive(self):
+        """Map the selected session and set the scrub bar to its time range"""
+        session = self.archive_session_var.get()
+        if not session:
+            self.status_label.config(text="No archive session selected", foreground="red")
+            return
+        try:
+            if self.archive_reader is not None:
+                self.archive_reader.close()
+            self.archive_reader = ArchiveReader(os.path.join(self.output_dir, 'archive', session))
+            self.archive_reader.refresh()
+        except Exception as e:
+            self.archive_reader = None
+            self.status_label.config(text=f"Error opening archive: {str(e)}", foreground="red")
+            return
+        time_range = self.archive_reader.time_range()
+        if time_range is None:
+            self.status_label.config(text="Archive session is empty", foreground="red")
+            return
+        self.scrub_scale.config(to=max(1, int(time_range[1] - time_range[0])))
+        self.scrub_var.set(0)
+        self._on_scrub(0)
+        self.status_label.config(text=f"Opened {session}: {len(self.archive_reader)} ticks", foreground="green")
+
+    def _scrub_time(self):
+        return self.archive_reader.time_range()[0] + self.scrub_var.get()
+
+    def _on_scrub(self, _value):
+        if self.archive_reader is None or not len(self.archive_reader):
+            return
+        at = self._scrub_time()
+        tick = self.archive_reader.entry_at(at)
+        self.scrub_label.config(
+            text=f"{time.strftime('%H:%M:%S', time.localtime(at))} (tick {tick + 1}/{len(self.archive_reader)})"
+        )
+        if self.emit_while_scrubbing_var.get():
+            self._emit_archive_state()
+
+    def _emit_archive_state(self):
+        """Re-emit every archived output as of the scrub position"""
+        if self.archive_reader is None:
+            self.status_label.config(text="Open an archive session first", foreground="red")
+            return
         try:
-            output_dir = os.path.abspath(os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'output'))
-            filename = fetch_and_save_awards(output_dir=output_dir)
-            self.status_label.config(text=f"Awards V2 data saved to {filename}", foreground="green")
+            started = time.perf_counter()
+            names = replay(self.archive_reader.state_at(self._scrub_time()), self.output_dir, self.output_formats)
+            elapsed = (time.perf_counter() - started) * 1000
+            self.status_label.config(
+                text=f"Emitted {len(names)} output(s) as of {time.strftime('%H:%M:%S', time.localtime(self._scrub_time()))} "
+                     f"in {elapsed:.0f} ms",
+                foreground="green"
+            )
         except Exception as e:
-            self.status_label.config(text=f"Failed to fetch/save Awards V2: {e}", foreground="red")
+            self.status_label.config(text=f"Error replaying archive: {str(e)}", foreground="red")
+
+    def _toggle_awards_polling(self):
+        """Start or stop polling the podium page every few seconds"""
+        if self.engine is not None:
+            if self.poll_awards_var.get():
+                self._engine_action("start_awards", "Starting awards polling in the engine...")
+            else:
+                self._engine_action("stop_awards", "Stopping awards polling in the engine...")
+            return
+        if self.poll_awards_var.get():
+            self.awarding_poller = AwardingPoller(
+                output_dir=self.output_dir,
+                formats=self.output_formats.get('awarding_results')
+            )
+            self.awarding_poller.start()
+            self.status_label.config(text="Polling awards; changed podiums are written as they appear", foreground="green")
+        elif self.awarding_poller is not None:
+            self.awarding_poller.stop()
+            self.awarding_poller = None
+            self.status_label.config(text="Awards polling stopped", foreground="black")
 
     def _save_distance_configs(self):
         """Save distance configurations"""
@@ -546,6 +1380,9 @@ class App:
             }
         
         self.active_distance_configs = configs  # Update active_distance_configs
+        self.config_store.update(distance_configs=configs)
+        self._config_version_shown = self.config_store.version
+        self._push_engine_settings()
         self.status_label.config(text="Distance configurations saved", foreground="green")
 
     def _save_distance_preset(self):
@@ -595,11 +1432,9 @@ class App:
         except Exception as e:
             self.status_label.config(text=f"Error loading preset: {str(e)}", foreground="red")
 
-    def _save_all_settings(self):
-        """Save all current settings including selections, configs, and parameters"""
-        try:
-            # Get all current settings
-            settings = {
+    def _current_settings(self):
+        """All current settings, in the all-settings preset format"""
+        return {
                 'posms': self.posms_var.get(),
                 'auth_key': self.auth_key_var.get(),
                 'test_mode': self.test_mode_var.get(),
@@ -609,9 +1444,23 @@ class App:
                     for distance, var in self.distances_vars.items()
                 },
                 'group_configs': self.group_configs,
-                'distance_configs': self.active_distance_configs
+                'distance_configs': self.active_distance_configs,
+                'output_formats': self.output_formats,
+                'output_destinations': self.output_destinations,
+                'shared_state_outputs': self.shared_state_outputs,
+                'layouts': self.layouts,
+                'priorities': {distance: var.get() for distance, var in self.priority_vars.items()},
+                'request_budget': self.request_budget_var.get(),
+                'bandwidth_budget': self.bandwidth_budget_var.get(),
+                'warm_up': self.warm_up_var.get()
             }
 
+    def _save_all_settings(self):
+        """Save all current settings including selections, configs, and parameters"""
+        try:
+            # Get all current settings
+            settings = self._current_settings()
+
             # Get settings name
             name = self.all_settings_name_var.get().strip()
             if not name:
@@ -623,6 +1472,7 @@ class App:
             with open(settings_file, 'w', encoding='utf-8') as f:
                 json.dump(settings, f, ensure_ascii=False, indent=2)
             
+            self._remember_settings_file(settings_file)
             self.status_label.config(text=f"All settings saved as '{name}'", foreground="green")
         except Exception as e:
             self.status_label.config(text=f"Error saving settings: {str(e)}", foreground="red")
@@ -644,33 +1494,119 @@ class App:
             with open(settings_file, 'r', encoding='utf-8') as f:
                 settings = json.load(f)
 
-            # Apply loaded settings
-            self.posms_var.set(settings.get('posms', ''))
-            self.auth_key_var.set(settings.get('auth_key', ''))
-            self.test_mode_var.set(settings.get('test_mode', False))
-            self.update_interval_var.set(settings.get('update_interval', '30'))
-
-            # Set selected distances
-            for distance, selected in settings.get('selected_distances', {}).items():
-                if distance in self.distances_vars:
-                    self.distances_vars[distance].set(selected)
+            self._apply_settings(settings, settings_file)
+            self._remember_settings_file(settings_file)
+            self.status_label.config(text="All settings loaded successfully", foreground="green")
+        except Exception as e:
+            self.status_label.config(text=f"Error loading settings: {str(e)}", foreground="red")
 
-            # Set group configs
-            self.group_configs = settings.get('group_configs', {})
-            # Update group config entries if they exist
-            for group_key, config in self.group_configs.items():
-                if group_key in self.group_config_entries:
-                    self.group_config_entries[group_key]['name'].set(config.get('name', ''))
-                    self.group_config_entries[group_key]['image'].set(config.get('image', ''))
+    def _remember_settings_file(self, settings_file):
+        """Record the last-used settings preset for warm-up on the next start"""
+        try:
+            with open(os.path.join(self.presets_dir, '.last_used.json'), 'w', encoding='utf-8') as f:
+                json.dump({'path': settings_file}, f)
+        except OSError:
+            pass
 
-            # Set distance configs
-            self.active_distance_configs = settings.get('distance_configs', {})
-            # Update distance config entries
-            for distance, config in self.active_distance_configs.items():
-                if distance in self.distance_configs:
-                    self.distance_configs[distance]['group_by'].set(config.get('group_by', 'distance'))
-                    self.distance_configs[distance]['top_count'].set(str(config.get('top_count', 3)))
+    def _start_warm_up(self):
+        """Apply the last-used preset and prefetch its data if it has warm-up enabled"""
+        try:
+            with open(os.path.join(self.presets_dir, '.last_used.json'), 'r', encoding='utf-8') as f:
+                settings_file = json.load(f)['path']
+            with open(settings_file, 'r', encoding='utf-8') as f:
+                settings = json.load(f)
+        except (OSError, ValueError, KeyError):
+            return
+        if not settings.get('warm_up'):
+            return
 
-            self.status_label.config(text="All settings loaded successfully", foreground="green")
+        try:
+            self._apply_settings(settings, settings_file)
         except Exception as e:
-            self.status_label.config(text=f"Error loading settings: {str(e)}", foreground="red")
\ No newline at end of file
+            self.status_label.config(text=f"Error restoring settings: {str(e)}", foreground="red")
+            return
+        self.status_label.config(text="Warming up caches in the background...", foreground="black")
+        start_warm_up(settings, list(self.POSMI.keys()), on_done=self._on_warm_up_done)
+        self.root.after(500, self._poll_warm_up)
+
+    def _on_warm_up_done(self, report):
+        # Runs on the warm-up thread; the Tk side picks it up in _poll_warm_up
+        self._warmup_report = report
+
+    def _poll_warm_up(self):
+        report = self._warmup_report
+        if report is None:
+            self.root.after(500, self._poll_warm_up)
+        elif 'error' in report:
+            self.status_label.config(text=f"Warm-up failed: {report['error']}", foreground="red")
+        else:
+            self.status_label.config(
+                text=f"Warm-up done: {report['startlist']} start list(s), {report['results']} result set(s), "
+                     f"podium {'cached' if report['podium'] else 'unavailable'}",
+                foreground="green"
+            )
+
+    def _apply_settings(self, settings, settings_file):
+        """Apply a parsed all-settings preset to the GUI and the config store"""
+        # Apply loaded settings
+        self.posms_var.set(settings.get('posms', ''))
+        self.auth_key_var.set(settings.get('auth_key', ''))
+        self.test_mode_var.set(settings.get('test_mode', False))
+        self.update_interval_var.set(settings.get('update_interval', '30'))
+        self.warm_up_var.set(settings.get('warm_up', False))
+
+        # Set selected distances
+        for distance, selected in settings.get('selected_distances', {}).items():
+            if distance in self.distances_vars:
+                self.distances_vars[distance].set(selected)
+
+        # Set group configs
+        self.group_configs = settings.get('group_configs', {})
+        # Update group config entries if they exist
+        for group_key, config in self.group_configs.items():
+            if group_key in self.group_config_entries:
+                self.group_config_entries[group_key]['name'].set(config.get('name', ''))
+                self.group_config_entries[group_key]['image'].set(config.get('image', ''))
+
+        # Set distance configs
+        self.active_distance_configs = settings.get('distance_configs', {})
+        # Update distance config entries
+        for distance, config in self.active_distance_configs.items():
+            if distance in self.distance_configs:
+                self.distance_configs[distance]['group_by'].set(config.get('group_by', 'distance'))
+                self.distance_configs[distance]['top_count'].set(str(config.get('top_count', 3)))
+
+        # Publish group/distance configs to the handlers in one atomic update
+        self.config_store.update(
+            group_configs=self.group_configs if isinstance(self.group_configs, dict) else {},
+            distance_configs=self.active_distance_configs if isinstance(self.active_distance_configs, dict) else {}
+        )
+        self._config_version_shown = self.config_store.version
+        self.loaded_settings_file = settings_file
+        self._toggle_settings_watch()
+
+        # Set output formats
+        self.output_formats = settings.get('output_formats', {})
+        for output_name, var in self.output_format_vars.items():
+            var.set(', '.join(self.output_formats.get(output_name, ['json'])))
+
+        # Set output destinations
+        self.output_destinations = settings.get('output_destinations', [])
+        self.output_destinations_var.set(', '.join(self.output_destinations))
+        self._apply_output_destinations()
+
+        # Set shared-memory outputs
+        self.shared_state_outputs = settings.get('shared_state_outputs', [])
+        self.shared_state_var.set(', '.join(self.shared_state_outputs))
+        get_shared_state().set_outputs(self.shared_state_outputs)
+
+        # Set overlay layouts
+        self.layouts = [n for n in settings.get('layouts', []) if n in available_layouts()]
+        self.layouts_var.set(', '.join(self.layouts))
+
+        # Set live poller priorities
+        for distance, priority in settings.get('priorities', {}).items():
+            if distance in self.priority_vars and priority in PRIORITIES:
+                self.priority_vars[distance].set(priority)
+        self.request_budget_var.set(settings.get('request_budget', '60'))
+        self.bandwidth_budget_var.set(settings.get('bandwidth_budget', '0'))
@@ -0,0 +1,67 @@
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+
+class LagMonitor:
+    """Measures Tk event-loop lag: how late a heartbeat scheduled with root.after actually runs"""
+
+    def __init__(self, root, interval_ms: int = 100, window: int = 600,
+                 on_update: Optional[Callable[[Dict[str, float]], None]] = None, update_every: int = 10):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.on_update = on_update
+        self.update_every = update_every  # heartbeats between on_update calls
+        self._samples = deque(maxlen=window)  # (monotonic time, lag in ms)
+        self._peak_ms = 0.0
+        self._expected = None
+        self._beats = 0
+        self._after_id = None
+
+    def start(self) -> None:
+        if self._after_id is None:
+            self._schedule()
+
+    def stop(self) -> None:
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _schedule(self) -> None:
+        self._expected = time.monotonic() + self.interval_ms / 1000
+        self._after_id = self.root.after(self.interval_ms, self._beat)
+
+    def _beat(self) -> None:
+        now = time.monotonic()
+        lag_ms = max(0.0, (now - self._expected) * 1000)
+        self._samples.append((now, lag_ms))
+        self._peak_ms = max(self._peak_ms, lag_ms)
+        self._beats += 1
+        self._schedule()
+        if self.on_update is not None and self._beats % self.update_every == 0:
+            self.on_update(self.stats())
+
+    def stats(self) -> Dict[str, float]:
+        """Lag percentiles over the recent window, plus the peak since the last reset"""
+        lags = sorted(lag for _, lag in self._samples)
+        if not lags:
+            return {"samples": 0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0, "peak": self._peak_ms}
+
+        def pick(fraction):
+            return lags[min(len(lags) - 1, int(len(lags) * fraction))]
+
+        return {
+            "samples": len(lags),
+            "p50": pick(0.5),
+            "p95": pick(0.95),
+            "p99": pick(0.99),
+            "max": lags[-1],
+            "peak": self._peak_ms,
+        }
+
+    def worst_since(self, since: float) -> float:
+        """Largest lag (ms) of heartbeats that ran at or after the monotonic time `since`"""
+        return max((lag for at, lag in self._samples if at >= since), default=0.0)
+
+    def reset_peak(self) -> None:
+        self._peak_ms = 0.0
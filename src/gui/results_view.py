@@ -0,0 +1,163 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import Dict, Any, List, Tuple
+
+
+def flatten_groups(groups: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """Turn the 60-slot group objects written by the handlers into one row per participant"""
+    rows = []
+    for group_data in groups:
+        group = group_data.get('Group1', group_data.get('group', ''))
+        gender = group_data.get('Gender1', group_data.get('gender', ''))
+        i = 1
+        while f'Name{i}' in group_data:
+            name = group_data[f'Name{i}']
+            if name:
+                rows.append({
+                    'group': group,
+                    'gender': gender,
+                    'position': group_data.get(f'StartaNr{i}', str(i)),
+                    'number': group_data.get(f'Number{i}', ''),
+                    'name': name,
+                    'time': group_data.get(f'Time{i}', ''),
+                    'subgroup': group_data.get(f'Subgroup{i}', ''),
+                })
+            i += 1
+    return rows
+
+
+class ResultsView(ttk.Frame):
+    """Treeview bound to in-memory rows; only materializes rows as the user scrolls to them"""
+
+    COLUMNS = (
+        ('group', 'Group', 180),
+        ('gender', 'Gender', 90),
+        ('position', 'Pos', 50),
+        ('number', 'Number', 70),
+        ('name', 'Name', 220),
+        ('time', 'Time', 90),
+        ('subgroup', 'Subgroup', 90),
+    )
+    PAGE_SIZE = 200
+
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, **kwargs)
+        self._rows: List[Dict[str, str]] = []
+        self._view: List[Tuple[str, Tuple[str, ...]]] = []  # filtered + sorted (iid, values)
+        self._values: Dict[str, Tuple[str, ...]] = {}       # materialized iid -> values
+        self._order: List[str] = []                          # materialized iids in tree order
+        self._materialized = 0
+        self._sort_column = None
+        self._sort_reverse = False
+
+        # Filter entry
+        filter_frame = ttk.Frame(self)
+        filter_frame.pack(fill="x", pady=(0, 5))
+        ttk.Label(filter_frame, text="Filter:").pack(side=tk.LEFT, padx=5)
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add("write", lambda *args: self._refresh())
+        ttk.Entry(filter_frame, textvariable=self.filter_var, width=30).pack(side=tk.LEFT, padx=5)
+        self.count_label = ttk.Label(filter_frame, text="")
+        self.count_label.pack(side=tk.LEFT, padx=10)
+
+        # Table
+        table_frame = ttk.Frame(self)
+        table_frame.pack(fill="both", expand=True)
+        columns = [c[0] for c in self.COLUMNS]
+        self.tree = ttk.Treeview(table_frame, columns=columns, show="headings")
+        for key, title, width in self.COLUMNS:
+            self.tree.heading(key, text=title, command=lambda c=key: self._sort_by(c))
+            self.tree.column(key, width=width, anchor="w")
+
+        scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=lambda first, last: self._on_scroll(scrollbar, first, last))
+        scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+    def set_rows(self, rows: List[Dict[str, str]]) -> None:
+        """Replace the bound rows; the tree is updated incrementally"""
+        self._rows = rows
+        self._refresh()
+
+    def set_groups(self, groups: List[Dict[str, Any]]) -> None:
+        """Bind to the processed group objects returned by a handler"""
+        self.set_rows(flatten_groups(groups))
+
+    def _row_key(self, row: Dict[str, str]) -> str:
+        return f"{row['group']}|{row['gender']}|{row['number'] or row['position']}"
+
+    def _refresh(self) -> None:
+        needle = self.filter_var.get().strip().lower()
+        rows = self._rows
+        if needle:
+            rows = [r for r in rows if any(needle in str(v).lower() for v in r.values())]
+        if self._sort_column:
+            rows = sorted(rows, key=lambda r: self._sort_value(r[self._sort_column]), reverse=self._sort_reverse)
+
+        columns = [c[0] for c in self.COLUMNS]
+        self._view = []
+        seen: Dict[str, int] = {}
+        for r in rows:
+            key = self._row_key(r)
+            seen[key] = seen.get(key, 0) + 1
+            if seen[key] > 1:
+                key = f"{key}#{seen[key]}"
+            self._view.append((key, tuple(r.get(c, '') for c in columns)))
+        self.count_label.config(text=f"{len(self._view)} / {len(self._rows)} rows")
+        self._materialize(max(self._materialized, min(self.PAGE_SIZE, len(self._view))))
+
+    def _sort_value(self, value: str):
+        # Numbers sort numerically, everything else as text
+        try:
+            return (0, float(value.replace(':', '')), value)
+        except (ValueError, AttributeError):
+            return (1, 0.0, str(value).lower())
+
+    def _sort_by(self, column: str) -> None:
+        if self._sort_column == column:
+            self._sort_reverse = not self._sort_reverse
+        else:
+            self._sort_column, self._sort_reverse = column, False
+        self._refresh()
+
+    def _materialize(self, count: int) -> None:
+        """Make the tree hold exactly the first `count` rows of the view, touching only changed items"""
+        count = min(count, len(self._view))
+        wanted = self._view[:count]
+        wanted_keys = {key for key, _ in wanted}
+
+        stale = [iid for iid in self._values if iid not in wanted_keys]
+        if stale:
+            self.tree.delete(*stale)
+            for iid in stale:
+                del self._values[iid]
+
+        # Tree order is tracked here instead of asking Tk for each item's index: positions before
+        # `index` hold the wanted rows already placed, the next one is the first unplaced old row
+        previous = [iid for iid in self._order if iid in self._values]
+        placed = set()
+        cursor = 0
+        for index, (iid, values) in enumerate(wanted):
+            while cursor < len(previous) and previous[cursor] in placed:
+                cursor += 1
+            placed.add(iid)
+            if iid not in self._values:
+                self.tree.insert('', index, iid=iid, values=values)
+                self._values[iid] = values
+                continue
+            if self._values[iid] != values:
+                self.tree.item(iid, values=values)
+                self._values[iid] = values
+            if cursor < len(previous) and previous[cursor] == iid:
+                cursor += 1
+            else:
+                self.tree.move(iid, '', index)
+
+        self._order = [iid for iid, _ in wanted]
+        self._materialized = count
+
+    def _on_scroll(self, scrollbar, first, last) -> None:
+        scrollbar.set(first, last)
+        # Load the next page when the user nears the end of what's materialized
+        if float(last) > 0.9 and self._materialized < len(self._view):
+            self.after_idle(lambda: self._materialize(self._materialized + self.PAGE_SIZE))
@@ -1,10 +1,19 @@
+import multiprocessing
+import sys
 import tkinter as tk
 from gui.app import App
+from api.profiling import install_signal_handler
 
 def main():
+    install_signal_handler()  # kill -USR1 <pid> profiles the next ticks
+    if "--engine" in sys.argv:
+        from api.engine import run_engine
+        run_engine()  # fetch/process engine without a window, see api/engine.py
+        return
     root = tk.Tk()
     app = App(root)
     root.mainloop()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    multiprocessing.freeze_support()  # layout worker processes in packaged builds
+    main()
@@ -0,0 +1,149 @@
+# src/tools/gui_bench.py
+"""
+Scripted GUI responsiveness benchmark.
+
+Opens the real App window against the local simulated API, drives the main
+actions (start list, summary, loading an all-settings preset, a large results
+preview) a few times each and reports the worst event-loop freeze per action,
+as measured by the App's LagMonitor. Needs a display.
+
+    cd src && python -m tools.gui_bench --repeat 3 --max-freeze-ms 500
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tkinter as tk
+from tkinter import filedialog
+from typing import Dict, Any, Callable, List, Tuple
+
+from api.startlist import StartListAPI
+from api.summary import SummaryAPI
+from api.season import SeasonAPI
+from api.liveresults import LiveResultsAPI
+from api.output_queue import get_output_queue
+from gui.app import App
+from tools.simulated_api import RaceClock, SimulatedRace, SimulatedAPIServer
+
+
+def _pump(root: tk.Tk, seconds: float) -> None:
+    """Run the event loop for a while so pending heartbeats record the freeze"""
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        root.update()
+        time.sleep(0.005)
+
+
+def _big_preview(groups: int = 100) -> List[Dict[str, Any]]:
+    result = []
+    for g in range(groups):
+        group = {'group': f"Grupa {g}", 'gender': 'Vīrieši' if g % 2 else 'Sievietes'}
+        for i in range(1, 61):
+            group[f'Name{i}'] = f"Dalībnieks {g}-{i}"
+            group[f'Number{i}'] = str(g * 100 + i)
+            group[f'Time{i}'] = f"1:{i:02d}:00"
+            group[f'StartaNr{i}'] = str(i)
+            group[f'Subgroup{i}'] = f"V{20 + i % 5 * 10}"
+        result.append(group)
+    return result
+
+
+def run_benchmark(distances: List[str] = None, athletes: int = 500, repeat: int = 3,
+                  latency: float = 0.05, settle: float = 0.5) -> Dict[str, Any]:
+    distances = distances or ['buks', 'vilks', 'zakis']
+    clock = RaceClock(speed=1e6)  # the race is over by the first request: full result lists
+    server = SimulatedAPIServer(SimulatedRace(distances, athletes), clock, latency=latency)
+    server.start()
+    for handler in (StartListAPI, SummaryAPI, SeasonAPI, LiveResultsAPI):
+        handler.BASE_URL = server.base_url
+
+    output_dir = tempfile.mkdtemp(prefix="gui-bench-")
+    get_output_queue(output_dir).set_destinations([output_dir])
+
+    # No warm-up from the operator's last-used preset, and don't overwrite it
+    App._start_warm_up = lambda self: None
+    App._remember_settings_file = lambda self, settings_file: None
+
+    root = tk.Tk()
+    app = App(root)
+    app.lag_monitor.interval_ms = 20
+    app.auth_key_var.set("bench-token")
+    for distance in distances:
+        app.distances_vars[distance].set(True)
+
+    settings_path = os.path.join(output_dir, "bench_settings.json")
+    with open(settings_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'auth_key': 'bench-token',
+            'posms': '',
+            'selected_distances': {distance: True for distance in distances},
+            'group_configs': {f"{d}_{g}": {'name': f"{d} {g}", 'image': ''} for d in distances for g in ('Sievietes', 'Vīrieši')},
+            'distance_configs': {},
+        }, f, ensure_ascii=False)
+    filedialog.askopenfilename = lambda **kwargs: settings_path
+
+    preview = _big_preview()
+    actions: List[Tuple[str, Callable[[], None]]] = [
+        ("fetch_start_list", app._fetch_data),
+        ("fetch_summary", app._fetch_summary),
+        ("load_all_settings", app._load_all_settings),
+        ("results_preview_6000_rows", lambda: app.results_view.set_groups(preview)),
+    ]
+
+    report: Dict[str, Any] = {"actions": {}}
+    try:
+        _pump(root, settle)
+        for name, action in actions:
+            walls, freezes = [], []
+            for _ in range(repeat):
+                started = time.monotonic()
+                action()
+                walls.append((time.monotonic() - started) * 1000)
+                _pump(root, settle)
+                freezes.append(app.lag_monitor.worst_since(started))
+            report["actions"][name] = {
+                "wall_ms_max": round(max(walls), 1),
+                "wall_ms_median": round(sorted(walls)[len(walls) // 2], 1),
+                "worst_freeze_ms": round(max(freezes), 1),
+            }
+            print(f"{name}: worst freeze {max(freezes):.0f} ms, wall max {max(walls):.0f} ms")
+        report["lag"] = app.lag_monitor.stats()
+    finally:
+        root.destroy()
+        server.stop()
+    report["worst_freeze_ms"] = max(a["worst_freeze_ms"] for a in report["actions"].values())
+    return report
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure GUI freezes while driving the main actions")
+    parser.add_argument("--distances", default="buks,vilks,zakis")
+    parser.add_argument("--athletes", type=int, default=500, help="athletes per distance")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated API latency in seconds")
+    parser.add_argument("--max-freeze-ms", type=float, help="exit with status 1 if any action freezes longer")
+    parser.add_argument("--report", help="also write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        distances=[d.strip() for d in args.distances.split(',') if d.strip()],
+        athletes=args.athletes,
+        repeat=args.repeat,
+        latency=args.latency,
+    )
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"Worst freeze: {report['worst_freeze_ms']:.0f} ms")
+    if args.max_freeze_ms is not None and report['worst_freeze_ms'] > args.max_freeze_ms:
+        print(f"FAIL: above the {args.max_freeze_ms:.0f} ms budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
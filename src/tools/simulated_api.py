@@ -0,0 +1,139 @@
+# src/tools/simulated_api.py
+"""
+Local stand-in for the stirnubuks.lv API, driven by a simulated race clock.
+
+Serves results_posms and results_startlist for a set of distances: every
+athlete has a fixed finish time, and a row appears in results_posms once the
+race clock passes it. Used by the soak harness and benchmarks.
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List
+from urllib.parse import urlparse, parse_qs
+
+
+class RaceClock:
+    """Simulated time that runs `speed` times faster than wall time"""
+
+    def __init__(self, speed: float = 1.0, start: float = None):
+        self.speed = speed
+        self.start = time.time() if start is None else start
+        self._wall_start = time.monotonic()
+
+    def elapsed(self) -> float:
+        """Simulated seconds since the race started"""
+        return (time.monotonic() - self._wall_start) * self.speed
+
+    def time(self) -> float:
+        """Simulated epoch time, a drop-in for time.time"""
+        return self.start + self.elapsed()
+
+
+def _format_time(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+class SimulatedRace:
+    """Start lists and finish times for a few distances"""
+
+    def __init__(self, distances: List[str], athletes_per_distance: int = 300, race_hours: float = 6.0, seed: int = 1):
+        rng = random.Random(seed)
+        self.startlists: Dict[str, List[Dict[str, Any]]] = {}
+        self.finishes: Dict[str, List[Any]] = {}
+        dal_id = 1000
+        for distance in distances:
+            rows, finishes = [], []
+            for i in range(athletes_per_distance):
+                dal_id += 1
+                gender = 'S' if i % 2 else 'V'
+                row = {
+                    'dal_id': dal_id,
+                    'Name': f"Dalībnieks {dal_id}",
+                    'full_name': f"Dalībnieks {dal_id}",
+                    'dzimums': gender,
+                    'grupa': f"{gender}{rng.choice([16, 21, 35, 45, 55])}",
+                    'komanda': f"Komanda {rng.randint(1, 40)}",
+                    'skola': f"Skola {rng.randint(1, 25)}" if rng.random() < 0.3 else '',
+                }
+                rows.append(row)
+                # Finishers spread over the race; a few never finish
+                if rng.random() < 0.97:
+                    finishes.append((rng.uniform(0.1, 1.0) * race_hours * 3600, row))
+            finishes.sort(key=lambda item: item[0])
+            self.startlists[distance] = rows
+            self.finishes[distance] = finishes
+
+    def results(self, distance: str, elapsed: float, limit: int = None) -> List[Dict[str, Any]]:
+        """Finished athletes at `elapsed` race seconds, fastest first (like results_posms)"""
+        rows = []
+        for finish, athlete in self.finishes.get(distance, []):
+            if finish > elapsed:
+                break
+            rows.append({
+                'dal_id': athlete['dal_id'],
+                'Name': athlete['Name'],
+                'dzimums': athlete['dzimums'],
+                'RaceTime': _format_time(finish),
+            })
+        rows.sort(key=lambda row: row['RaceTime'].zfill(8))
+        return rows[:limit]
+
+
+class SimulatedAPIServer:
+    """Threaded HTTP server answering GET /api/?module=...&distance=..."""
+
+    def __init__(self, race: SimulatedRace, clock: RaceClock, port: int = 0, latency: float = 0.0):
+        self.race = race
+        self.clock = clock
+        self.latency = latency  # added per request, in wall seconds
+        self.requests = 0
+        self._requests_lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server._requests_lock:
+                    server.requests += 1
+                query = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+                module = query.get('module')
+                distance = query.get('distance', '')
+                limit = int(query['limit']) if 'limit' in query else None
+                if module == 'results_posms':
+                    body = server.race.results(distance, server.clock.elapsed(), limit)
+                elif module == 'results_startlist':
+                    body = server.race.startlists.get(distance, [])
+                else:
+                    self.send_error(404)
+                    return
+                if server.latency:
+                    time.sleep(server.latency)
+                payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}/api/"
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="simulated-api", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -0,0 +1,281 @@
+# src/tools/soak.py
+"""
+Soak test for the live results poller.
+
+Runs LiveResultsAPI._update_loop against a local simulated API for hours of
+race time at an accelerated clock, samples RSS, open file descriptors, thread
+count, tick latency and output file count, then flags regressions and checks
+that stop_live_updates shuts the poller down.
+
+    cd src && python -m tools.soak --hours 8 --speed 120
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from api.liveresults import LiveResultsAPI
+from api.generations import HISTORY_RE
+from api.output_queue import get_output_queue, HISTORY_KEEP
+from api.positions import get_position_history
+from tools.simulated_api import RaceClock, SimulatedRace, SimulatedAPIServer
+
+logger = logging.getLogger("Soak")
+
+# Growth allowed between the warmed-up start and the end of the run
+DEFAULT_THRESHOLDS = {
+    "rss_growth_mb": 50.0,
+    "fd_growth": 10,
+    "thread_growth": 5,
+    "latency_drift": 2.0,          # end p95 / start p95, per result row
+    "latency_floor_ms": 50.0,      # drift below this p95 is ignored
+    "files_per_1000_ticks": 50.0,  # output files added per 1000 poll ticks
+    "shutdown_seconds": 10.0,
+}
+
+
+def rss_mb() -> Optional[float]:
+    """Resident set size from /proc, falling back to peak RSS from getrusage"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except Exception:
+        return None
+
+
+def open_fds() -> Optional[int]:
+    for path in ('/proc/self/fd', '/dev/fd'):
+        try:
+            return len(os.listdir(path))
+        except OSError:
+            continue
+    return None
+
+
+def count_files(path: str) -> Dict[str, int]:
+    """{"files": regular output files, "history": largest count of one output's timestamped files}"""
+    total = 0
+    history: Dict[str, int] = {}
+    for _, _, files in os.walk(path):
+        for name in files:
+            match = HISTORY_RE.search(name)
+            if match:
+                key = name[:match.start()] + os.path.splitext(name)[1]
+                history[key] = history.get(key, 0) + 1
+            else:
+                total += 1
+    return {"files": total, "history": max(history.values(), default=0)}
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+def find_regressions(samples: List[Dict[str, Any]], thresholds: Dict[str, float]) -> List[str]:
+    """Compare the first quarter after warm-up (first 10% skipped) with the last quarter"""
+    if len(samples) < 8:
+        return ["too few samples to judge (run longer or sample more often)"]
+    warm = samples[max(1, len(samples) // 10):]
+    quarter = max(1, len(warm) // 4)
+    start, end = warm[:quarter], warm[-quarter:]
+    problems = []
+
+    def median(rows, field):
+        values = [row[field] for row in rows if row.get(field) is not None]
+        return _percentile(values, 0.5) if values else None
+
+    start_rss, end_rss = median(start, "rss_mb"), median(end, "rss_mb")
+    if start_rss is not None and end_rss - start_rss > thresholds["rss_growth_mb"]:
+        problems.append(f"RSS grew {end_rss - start_rss:.1f} MB ({start_rss:.1f} -> {end_rss:.1f})")
+
+    for field, limit, label in (("fds", "fd_growth", "open file descriptors"), ("threads", "thread_growth", "threads")):
+        before = max((row[field] for row in start if row.get(field) is not None), default=None)
+        after = max((row[field] for row in end if row.get(field) is not None), default=None)
+        if before is not None and after - before > thresholds[limit]:
+            problems.append(f"{label} grew from {before} to {after}")
+
+    # Results grow as athletes finish, so drift is judged on latency per 1000 result rows
+    def per_rows(rows):
+        return [ms * 1000 / count for row in rows for ms, count in zip(row["tick_ms"], row["tick_rows"]) if count]
+
+    start_p95 = _percentile([ms for row in start for ms in row["tick_ms"]], 0.95)
+    end_p95 = _percentile([ms for row in end for ms in row["tick_ms"]], 0.95)
+    start_cost, end_cost = _percentile(per_rows(start), 0.95), _percentile(per_rows(end), 0.95)
+    if start_cost and end_p95 > thresholds["latency_floor_ms"] and end_cost / start_cost > thresholds["latency_drift"]:
+        problems.append(
+            f"tick latency p95 drifted {start_p95:.1f} ms -> {end_p95:.1f} ms "
+            f"({start_cost:.1f} -> {end_cost:.1f} ms per 1000 rows)"
+        )
+
+    # Per tick rather than per race hour: several ticks can replace the same file
+    ticks = sum(row["ticks"] for row in warm[1:])
+    if ticks:
+        per_1000 = (warm[-1]["files"] - warm[0]["files"]) * 1000 / ticks
+        if per_1000 > thresholds["files_per_1000_ticks"]:
+            problems.append(f"output files grow by {per_1000:.0f} per 1000 ticks ({warm[-1]['files']} at the end)")
+    # Timestamped history is bounded by retention instead
+    history = max(row["history"] for row in samples)
+    if history > HISTORY_KEEP:
+        problems.append(f"{history} timestamped history files kept for one output, retention is {HISTORY_KEEP}")
+    return problems
+
+
+def run_soak(hours: float = 4.0, speed: float = 60.0, interval: float = 30.0, distances: List[str] = None,
+             athletes: int = 300, sample_every: float = 300.0, latency: float = 0.0,
+             thresholds: Dict[str, float] = None, keep_output: bool = False) -> Dict[str, Any]:
+    """Run the poller for `hours` of race time; returns samples, regressions and the output dir"""
+    thresholds = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+    distances = distances or ['buks', 'vilks', 'zakis']
+    clock = RaceClock(speed)
+    race = SimulatedRace(distances, athletes, race_hours=hours)
+    server = SimulatedAPIServer(race, clock, latency=latency)
+    server.start()
+
+    output_dir = tempfile.mkdtemp(prefix="soak-output-")
+    queue = get_output_queue(output_dir)
+    queue.set_destinations([output_dir])
+    get_position_history().clock = clock.time
+
+    # Request budget scaled with the clock so the scheduler never throttles accelerated ticks
+    api = LiveResultsAPI('soak', distances, 'soak-token', update_interval=interval / speed,
+                         request_budget=2 * len(distances) * 60 * speed / interval)
+    api.BASE_URL = server.base_url
+    api.cache_ttl = 0  # every accelerated tick must reach the simulated API
+
+    # Time each tick from the start of fetch_data to the end of process_data
+    tick_ms: List[float] = []
+    tick_rows: List[int] = []
+    tick_lock = threading.Lock()
+    fetch_data, process_data = api.fetch_data, api.process_data
+    tick_started = [0.0]
+
+    def timed_fetch():
+        tick_started[0] = time.perf_counter()
+        return fetch_data()
+
+    def timed_process(all_data):
+        try:
+            return process_data(all_data)
+        finally:
+            with tick_lock:
+                tick_ms.append((time.perf_counter() - tick_started[0]) * 1000)
+                tick_rows.append(sum(len(rows) for rows in all_data.values()))
+
+    api.fetch_data, api.process_data = timed_fetch, timed_process
+
+    samples: List[Dict[str, Any]] = []
+    problems: List[str] = []
+    api.start_live_updates()
+    try:
+        next_sample = 0.0
+        while clock.elapsed() < hours * 3600:
+            if clock.elapsed() >= next_sample:
+                queue.flush(timeout=5)
+                with tick_lock:
+                    recent, tick_ms[:] = list(tick_ms), []
+                    recent_rows, tick_rows[:] = list(tick_rows), []
+                sample = {
+                    "sim_seconds": round(clock.elapsed()),
+                    "rss_mb": rss_mb(),
+                    "fds": open_fds(),
+                    "threads": threading.active_count(),
+                    **count_files(output_dir),
+                    "ticks": len(recent),
+                    "tick_ms": recent,
+                    "tick_rows": recent_rows,
+                    "api_requests": server.requests,
+                }
+                samples.append(sample)
+                logger.info(
+                    f"t={sample['sim_seconds'] / 3600:.2f}h rss={sample['rss_mb']} fds={sample['fds']} "
+                    f"threads={sample['threads']} files={sample['files']} history={sample['history']} ticks={sample['ticks']} "
+                    f"p95={_percentile(recent, 0.95):.1f}ms"
+                )
+                next_sample += sample_every
+            time.sleep(min(0.5, sample_every / speed / 4))
+    finally:
+        # stop_live_updates joins the poller thread; it must return within a tick or two
+        stopper = threading.Thread(target=api.stop_live_updates, name="soak-stop", daemon=True)
+        stopper.start()
+        stopper.join(thresholds["shutdown_seconds"])
+        if stopper.is_alive() or (api.thread is not None and api.thread.is_alive()):
+            problems.append(f"stop_live_updates did not finish within {thresholds['shutdown_seconds']} s")
+        queue.flush(timeout=10)
+        server.stop()
+
+    problems = find_regressions(samples, thresholds) + problems
+    report = {
+        "hours": hours,
+        "speed": speed,
+        "interval": interval,
+        "distances": distances,
+        "samples": [
+            dict(s, tick_ms=None, tick_rows=None, tick_p95_ms=round(_percentile(s["tick_ms"], 0.95), 1))
+            for s in samples
+        ],
+        "regressions": problems,
+        "output_dir": output_dir,
+    }
+    if not keep_output:
+        shutil.rmtree(output_dir, ignore_errors=True)
+        report["output_dir"] = None
+    return report
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Soak-test the live results poller against a simulated API")
+    parser.add_argument("--hours", type=float, default=4.0, help="simulated race hours to run")
+    parser.add_argument("--speed", type=float, default=60.0, help="race seconds per wall second")
+    parser.add_argument("--interval", type=float, default=30.0, help="poll interval in race seconds")
+    parser.add_argument("--distances", default="buks,vilks,zakis")
+    parser.add_argument("--athletes", type=int, default=300, help="athletes per distance")
+    parser.add_argument("--sample-every", type=float, default=300.0, help="race seconds between samples")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated API latency in wall seconds")
+    parser.add_argument("--report", help="write the JSON report here (default output/soak/<timestamp>.json)")
+    parser.add_argument("--keep-output", action="store_true", help="keep the written output files")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    report = run_soak(
+        hours=args.hours,
+        speed=args.speed,
+        interval=args.interval,
+        distances=[d.strip() for d in args.distances.split(',') if d.strip()],
+        athletes=args.athletes,
+        sample_every=args.sample_every,
+        latency=args.latency,
+        keep_output=args.keep_output,
+    )
+
+    report_path = args.report or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+        'output', 'soak', f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(report_path) or '.', exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"Report written to {report_path}")
+    for problem in report["regressions"]:
+        print(f"REGRESSION: {problem}")
+    return 1 if report["regressions"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
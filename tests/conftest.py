@@ -0,0 +1,7 @@
+# tests/conftest.py
+"""Make the src/ packages importable the way main.py sees them (`from api.x import ...`)."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
@@ -0,0 +1,86 @@
+import os
+import threading
+
+from api.generations import GenerationDestination, read_current
+from api.output_queue import DirectoryDestination, OutputQueue
+
+
+class _BlockingDestination:
+    """Holds every write until released"""
+    name = "blocking"
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def write(self, filename, payload):
+        self.release.wait(5)
+
+
+def test_flush_waits_for_every_destination(tmp_path):
+    blocking = _BlockingDestination()
+    queue = OutputQueue([DirectoryDestination(str(tmp_path)), blocking])
+    queue.submit("a.json", b"{}")
+    assert not queue.flush(timeout=0.2)
+    blocking.release.set()
+    assert queue.flush(timeout=5)
+    assert (tmp_path / "a.json").read_bytes() == b"{}"
+
+
+def test_wait_written_ignores_other_destinations(tmp_path):
+    blocking = _BlockingDestination()
+    queue = OutputQueue([DirectoryDestination(str(tmp_path)), blocking])
+    queue.submit("a.json", b"{}")
+    assert queue.wait_written("a.json", str(tmp_path), timeout=5)
+    assert (tmp_path / "a.json").exists()
+    blocking.release.set()
+
+
+def test_wait_written_reports_a_failed_write(tmp_path):
+    missing = tmp_path / "file-not-dir"
+    missing.write_text("")
+    queue = OutputQueue([DirectoryDestination(str(missing))])
+    queue.submit("a.json", b"{}")
+    assert not queue.wait_written("a.json", str(missing), timeout=5)
+
+
+def test_history_files_are_pruned(tmp_path):
+    destination = DirectoryDestination(str(tmp_path), history_keep=2)
+    for second in range(4):
+        destination.write(f"live_results_20240501_12000{second}.json", b"{}")
+    destination.write("latest_live_results.json", b"{}")
+    assert sorted(os.listdir(tmp_path)) == [
+        "latest_live_results.json", "live_results_20240501_120002.json", "live_results_20240501_120003.json",
+    ]
+
+
+def test_batch_is_one_generation_and_unchanged_files_carry_forward(tmp_path):
+    destination = GenerationDestination(str(tmp_path), keep=3, grace_seconds=0)
+    destination.write_batch({"summary_results.json": b"1", "live_results_20240501_120000.json": b"h"})
+    destination.write_batch({"awarding_results.json": b"2"})
+
+    generation, directory = read_current(str(tmp_path))
+    assert generation == 2
+    # History files stay in their own generation; other files are linked forward
+    assert sorted(os.listdir(directory)) == ["awarding_results.json", "summary_results.json"]
+    with open(os.path.join(directory, "summary_results.json"), "rb") as f:
+        assert f.read() == b"1"
+
+
+def test_old_generations_are_collected(tmp_path):
+    destination = GenerationDestination(str(tmp_path), keep=2, grace_seconds=0)
+    for value in range(5):
+        destination.write_batch({"summary_results.json": str(value).encode()})
+    # keep counts the current generation
+    assert sorted(os.listdir(tmp_path / "generations")) == ["g00000004", "g00000005"]
+    assert read_current(str(tmp_path))[0] == 5
+
+
+def test_queue_batch_reaches_a_generation_destination_together(tmp_path):
+    queue = OutputQueue([f"generations:{tmp_path}"])
+    with queue.batch():
+        queue.submit("summary_results.json", b"1")
+        queue.submit("awarding_results.json", b"2")
+    assert queue.flush(timeout=5)
+    generation, directory = read_current(str(tmp_path))
+    assert generation == 1
+    assert sorted(os.listdir(directory)) == ["awarding_results.json", "summary_results.json"]
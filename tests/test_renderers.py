@@ -0,0 +1,41 @@
+from api.layouts import LayoutSnapshot, flat_groups, lower_thirds, ticker
+from api.startlist import StartListAPI
+from api.summary import SummaryAPI
+
+# Decoded rows as the schema leaves them: int dal_id, None or absent optional fields
+ROWS = [
+    {"dal_id": 123, "Name": "Anna", "RaceTime": None, "dzimums": "S"},
+    {"dal_id": 124, "Name": "Berta", "RaceTime": "0:59:00", "dzimums": "S", "grupa": "S21"},
+]
+
+
+def _all_strings(data):
+    return all(isinstance(value, str) for value in data.values())
+
+
+def test_summary_group_slots_are_strings():
+    api = SummaryAPI.__new__(SummaryAPI)  # _render_group needs no handler state
+    group = api._render_group("1", {}, "Sievietes", "", ROWS)
+    assert _all_strings(group)
+    assert (group["Number1"], group["Time1"], group["Subgroup1"]) == ("123", "", "")
+    assert "Name60" in group and "Name61" not in group
+
+
+def test_startlist_group_slots_are_strings():
+    api = StartListAPI.__new__(StartListAPI)
+    group = api._render_group("1", {}, "Sievietes", [{"dal_id": 123, "full_name": "Anna"}])
+    assert _all_strings(group)
+    assert (group["Number1"], group["Subgroup1"]) == ("123", "")
+
+
+def test_layouts_are_strings_and_fastest_first():
+    snapshot = LayoutSnapshot.from_data({"1": ROWS})
+    group = flat_groups(snapshot)["teams"][0]
+    assert _all_strings(group)
+    assert (group["Name1"], group["Name2"]) == ("Berta", "Anna")
+
+    rows = lower_thirds(snapshot)
+    assert all(_all_strings(row) for row in rows)
+    assert [row["Number"] for row in rows] == ["124", "123"]
+
+    assert ticker(snapshot)[0]["Text"] == "1. Berta 0:59:00 · 2. Anna"
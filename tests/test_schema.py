@@ -0,0 +1,54 @@
+import pytest
+
+from api.schema import RESULTS_POSMS, RESULTS_STARTLIST, RowError, as_text
+
+
+def test_decode_keeps_id_type_and_absent_fields():
+    row = RESULTS_POSMS.decode_row({"dal_id": 123, "Name": "Anna", "RaceTime": None})
+    assert row["dal_id"] == 123
+    assert row["RaceTime"] is None
+    assert "grupa" not in row
+
+
+def test_decode_coerces_gender_and_numeric_time():
+    row = RESULTS_POSMS.decode_row({"dal_id": "7", "dzimums": " v ", "RaceTime": 3723})
+    assert row["dal_id"] == "7"
+    assert row["dzimums"] == "V"
+    assert row["RaceTime"] == "1:02:03"
+
+
+@pytest.mark.parametrize("dal_id", [None, "", "abc", True, 1.5])
+def test_bad_dal_id_is_rejected(dal_id):
+    with pytest.raises(RowError):
+        RESULTS_STARTLIST.decode_row({"dal_id": dal_id, "full_name": "Anna"})
+
+
+def test_non_text_name_is_rejected():
+    with pytest.raises(RowError):
+        RESULTS_POSMS.decode_row({"dal_id": 1, "Name": ["Anna"]})
+
+
+class _Quarantine:
+    def __init__(self):
+        self.rows = []
+
+    def add(self, module, context, reason, row):
+        self.rows.append((module, reason, row))
+
+
+def test_decode_quarantines_bad_rows_and_keeps_the_rest():
+    quarantine = _Quarantine()
+    rows = RESULTS_POSMS.decode([{"dal_id": 1}, {"Name": "no id"}, "junk"], quarantine=quarantine)
+    assert rows == [{"dal_id": 1}]
+    assert len(quarantine.rows) == 2
+
+
+def test_non_list_response_is_quarantined():
+    quarantine = _Quarantine()
+    assert RESULTS_POSMS.decode({"error": "denied"}, quarantine=quarantine) == []
+    assert quarantine.rows[0][1] == "response is not a list"
+
+
+@pytest.mark.parametrize("value, text", [(None, ""), ("", ""), (123, "123"), ("Anna", "Anna")])
+def test_as_text(value, text):
+    assert as_text(value) == text
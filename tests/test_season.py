@@ -0,0 +1,45 @@
+import json
+import os
+
+from api.season import SeasonAPI
+
+POSMI = ["1", "2", "3"]
+
+
+def _season(posms, cache_dir=None):
+    # Bypass __init__: it creates the project output dir; only these attributes are used
+    api = SeasonAPI.__new__(SeasonAPI)
+    api.posmi = list(POSMI)
+    api.posms = posms
+    api.cache_dir = cache_dir
+    return api
+
+
+def test_finished_posmi_are_the_stages_before_the_current_one():
+    assert _season("1").finished_posmi() == []
+    assert _season("3").finished_posmi() == ["1", "2"]
+
+
+def test_no_stage_is_finished_without_a_known_current_posms():
+    assert _season("").finished_posmi() == []
+    assert _season("9").finished_posmi() == []
+
+
+def test_only_finished_stages_are_cached(tmp_path):
+    api = _season("2", str(tmp_path))
+    rows = [{"dal_id": 1, "Name": "Anna", "dzimums": "S", "RaceTime": "0:10:00"}]
+    api._fetch_stage = lambda posms, distance: rows
+
+    assert api._cached_stage("1", "5") == rows
+    assert api._cached_stage("2", "5") == rows  # still running
+    assert os.listdir(tmp_path) == ["1_5.json"]
+    with open(tmp_path / "1_5.json", encoding="utf-8") as f:
+        assert json.load(f) == rows
+
+
+def test_cached_stage_is_read_from_disk(tmp_path):
+    rows = [{"dal_id": 1}]
+    (tmp_path / "1_5.json").write_text(json.dumps(rows), encoding="utf-8")
+    api = _season("2", str(tmp_path))
+    api._fetch_stage = lambda posms, distance: []
+    assert api._cached_stage("1", "5") == rows
@@ -0,0 +1,63 @@
+import threading
+import time
+
+from api.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "result"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", fetch)))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=lambda: results.append(flight.do("k", fetch)))
+    follower.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert results == ["result", "result"]
+    assert len(calls) == 1
+    assert flight.stats()["coalesced"] == 1
+
+
+def test_result_is_reused_within_the_window_only():
+    flight = SingleFlight(window=0.1)
+    counter = iter(range(10))
+    assert flight.do("k", lambda: next(counter)) == 0
+    assert flight.do("k", lambda: next(counter)) == 0
+    time.sleep(0.15)
+    assert flight.do("k", lambda: next(counter)) == 1
+
+
+def test_prefetched_result_serves_the_first_interactive_call_once():
+    flight = SingleFlight(window=0)
+    counter = iter(range(10))
+    assert flight.do("k", lambda: next(counter), prefetch=True) == 0
+    assert flight.do("k", lambda: next(counter)) == 0
+    assert flight.do("k", lambda: next(counter)) == 1
+    assert flight.stats()["prefetch_hits"] == 1
+
+
+def test_errors_are_not_cached():
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError("boom")
+
+    for _ in range(2):
+        try:
+            flight.do("k", fail)
+        except ValueError:
+            pass
+    assert flight.stats()["executed"] == 2